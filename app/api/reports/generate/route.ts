@@ -4,6 +4,7 @@ import { createApiHandler } from "@/lib/api-middleware";
 import { prisma } from "@/lib/prisma";
 import { debitCredits, calculateReportCost } from "@/lib/credits";
 import { ReportStatus, AssetType, ReportType, PricingModel, ChartType, BenchmarkType } from "@prisma/client";
+import { generateWithWorker, ReportWorkerUnavailableError } from "@/lib/report-worker";
 
 interface GenerateReportBody {
   title: string;
@@ -113,6 +114,7 @@ export const POST = createApiHandler(
       if (process.env.NODE_ENV === 'development') {
         try {
           const { spawn } = require('child_process');
+          const path = require('path');
           const timestamp = new Date().toISOString().slice(0,19).replace(/:/g,'').replace(/-/g,'');
           const outputPath = `public/reports/${body.reportType}_${body.assetSymbol}_${timestamp}.pdf`;
           
@@ -127,61 +129,106 @@ export const POST = createApiHandler(
             outputPath
           ]);
           
-          const pythonProcess = spawn('python3', [
-            'pdf/smart_report_generator.py',
-            body.assetSymbol,
-            body.reportType,
-            outputPath,
-            user.id  // Ajout de l'user_id pour les logs
-          ], {
-            cwd: process.cwd(),
-            stdio: ['ignore', 'pipe', 'pipe']
-          });
-          
-          pythonProcess.stdout.on('data', (data) => {
-            console.log(`📊 Python stdout: ${data.toString()}`);
-          });
-          
-          pythonProcess.stderr.on('data', (data) => {
-            console.error(`❌ Python stderr: ${data.toString()}`);
+          // Graphiques et sections demandés : le générateur ne calcule que ce contenu
+          const reportConfig = JSON.stringify({
+            selectedCharts: report.selectedCharts,
+            riskMetrics: report.riskMetrics,
+            correlationAnalysis: report.correlationAnalysis,
+            volatilityAnalysis: report.volatilityAnalysis,
+            fundamentalAnalysis: report.fundamentalAnalysis,
+            technicalAnalysis: report.technicalAnalysis,
+            sentimentAnalysis: report.sentimentAnalysis,
+            exportFormats: report.exportFormats,
+            includeRawData: report.includeRawData,
+            includeApiExport: report.includeApiExport,
           });
           
-          pythonProcess.on('close', (code) => {
-            console.log(`✅ Processus Python terminé avec le code ${code}`);
-            if (code === 0) {
-              console.log(`📄 Rapport généré avec succès: ${outputPath}`);
-              // Mettre à jour le statut du rapport en base
-              prisma.report.update({
-                where: { id: report.id },
-                data: { 
-                  status: ReportStatus.COMPLETED,
-                  downloadUrl: `/${outputPath}`,
-                  completedAt: new Date()
-                }
-              }).catch(err => console.error('Erreur mise à jour statut:', err));
-            } else {
-              console.error(`❌ Échec génération rapport avec code ${code}`);
-              // Marquer le rapport comme échoué
-              prisma.report.update({
-                where: { id: report.id },
-                data: { 
-                  status: ReportStatus.FAILED,
-                  error: `Process exited with code ${code}`
-                }
-              }).catch(err => console.error('Erreur mise à jour statut échec:', err));
-            }
-          });
+          const markCompleted = () => {
+            console.log(`📄 Rapport généré avec succès: ${outputPath}`);
+            // Mettre à jour le statut du rapport en base
+            prisma.report.update({
+              where: { id: report.id },
+              data: { 
+                status: ReportStatus.COMPLETED,
+                downloadUrl: `/${outputPath}`,
+                completedAt: new Date()
+              }
+            }).catch(err => console.error('Erreur mise à jour statut:', err));
+          };
           
-          pythonProcess.on('error', (error) => {
-            console.error(`❌ Erreur processus Python:`, error);
+          const markFailed = (reason: string) => {
             // Marquer le rapport comme échoué
             prisma.report.update({
               where: { id: report.id },
               data: { 
                 status: ReportStatus.FAILED,
-                error: error.message
+                error: reason
+              }
+            }).catch(err => console.error('Erreur mise à jour statut échec:', err));
+          };
+          
+          // Sans worker : un processus python3 par rapport (démarrage et imports à chaque fois)
+          const spawnGenerator = () => {
+            const pythonProcess = spawn('python3', [
+              'pdf/smart_report_generator.py',
+              body.assetSymbol,
+              body.reportType,
+              outputPath,
+              user.id,  // Ajout de l'user_id pour les logs
+              '--config',
+              reportConfig
+            ], {
+              cwd: process.cwd(),
+              stdio: ['ignore', 'pipe', 'pipe']
+            });
+            
+            pythonProcess.stdout.on('data', (data) => {
+              console.log(`📊 Python stdout: ${data.toString()}`);
+            });
+            
+            pythonProcess.stderr.on('data', (data) => {
+              console.error(`❌ Python stderr: ${data.toString()}`);
+            });
+            
+            pythonProcess.on('close', (code) => {
+              console.log(`✅ Processus Python terminé avec le code ${code}`);
+              if (code === 0) {
+                markCompleted();
+              } else {
+                console.error(`❌ Échec génération rapport avec code ${code}`);
+                markFailed(`Process exited with code ${code}`);
               }
-            }).catch(err => console.error('Erreur mise à jour statut erreur:', err));
+            });
+            
+            pythonProcess.on('error', (error) => {
+              console.error(`❌ Erreur processus Python:`, error);
+              markFailed(error.message);
+            });
+          };
+          
+          // Worker chaud (pdf/report_worker.py) si lancé, sinon spawn
+          generateWithWorker({
+            symbol: body.assetSymbol,
+            reportType: body.reportType,
+            outputPath: path.join(process.cwd(), outputPath),
+            userId: user.id,
+            config: JSON.parse(reportConfig)
+          }).then((result) => {
+            console.log(`✅ Worker Python: ${result.ok ? 'succès' : 'échec'} en ${result.duration}s`);
+            if (result.ok) {
+              markCompleted();
+            } else {
+              console.error(`❌ Échec génération rapport: ${result.error}`);
+              markFailed(result.error || 'Worker generation failed');
+            }
+          }).catch((error) => {
+            if (error instanceof ReportWorkerUnavailableError) {
+              console.log(`🐍 ${error.message}, lancement de python3`);
+              spawnGenerator();
+            } else {
+              console.error(`❌ Erreur worker Python:`, error);
+              markFailed(error.message);
+            }
           });
           
         } catch (error) {
@@ -2,36 +2,37 @@
 """
 Module de génération de graphiques avancés pour FinAnalytics
 Créé pour démontrer les capacités de visualisation de données complexes
+
+Les images statiques sont rendues par matplotlib (chart_renderers), sans navigateur
+headless ; plotly n'est importé que si une version HTML interactive est demandée.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import seaborn as sns
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import warnings
 from typing import Dict, List, Tuple, Optional
-from matplotlib.patches import Rectangle
-from matplotlib.collections import LineCollection
-from mpl_toolkits.axes_grid1 import make_axes_locatable
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import plotly.offline as pyo
 
-warnings.filterwarnings('ignore')
+import chart_renderers
+from rolling_stats import rolling_mean_var, rolling_volatility
 
-# Configuration du style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+warnings.filterwarnings('ignore')
 
 class AdvancedChartsGenerator:
     """Générateur de graphiques avancés pour l'analyse financière"""
     
-    def __init__(self, symbol: str, data: pd.DataFrame):
+    ICHIMOKU_COLUMNS = ['Tenkan_sen', 'Kijun_sen', 'Senkou_span_A', 'Senkou_span_B', 'Chikou_span']
+    
+    def __init__(self, symbol: str, data: pd.DataFrame, interactive: bool = False):
+        """
+        Args:
+            symbol: Symbole de l'actif
+            data: Historique OHLCV
+            interactive: Écrire aussi une version HTML interactive (plotly) des graphiques qui en ont une
+        """
         self.symbol = symbol
         self.data = data.copy()
+        self.interactive = interactive
         self.prepare_data()
         
     def prepare_data(self):
@@ -72,8 +73,9 @@ class AdvancedChartsGenerator:
         # Bollinger Bands
         bb_period = 20
         bb_std = 2
-        self.data['BB_Middle'] = close.rolling(window=bb_period).mean()
-        bb_std_dev = close.rolling(window=bb_period).std()
+        bb_mean, bb_var = rolling_mean_var(close.values, (bb_period,))
+        self.data['BB_Middle'] = bb_mean[0]
+        bb_std_dev = np.sqrt(bb_var[0])
         self.data['BB_Upper'] = self.data['BB_Middle'] + (bb_std_dev * bb_std)
         self.data['BB_Lower'] = self.data['BB_Middle'] - (bb_std_dev * bb_std)
         self.data['BB_Width'] = self.data['BB_Upper'] - self.data['BB_Lower']
@@ -91,20 +93,44 @@ class AdvancedChartsGenerator:
         
         # Volatilité
         self.data['Returns'] = close.pct_change()
-        self.data['Volatility'] = self.data['Returns'].rolling(window=20).std() * np.sqrt(252)
+        self.data['Volatility'] = rolling_volatility(self.data['Returns'], (20,))[20]
         
         # Support et résistance (approximation)
         self.data['Support'] = low.rolling(window=20, center=True).min()
         self.data['Resistance'] = high.rolling(window=20, center=True).max()
+        
+        # Ichimoku (sur tout l'historique : le nuage est complet dès le début de la période affichée)
+        tenkan = (high.rolling(window=9).max() + low.rolling(window=9).min()) / 2
+        kijun = (high.rolling(window=26).max() + low.rolling(window=26).min()) / 2
+        self.data['Tenkan_sen'] = tenkan
+        self.data['Kijun_sen'] = kijun
+        self.data['Senkou_span_A'] = ((tenkan + kijun) / 2).shift(26)
+        self.data['Senkou_span_B'] = ((high.rolling(window=52).max() + low.rolling(window=52).min()) / 2).shift(26)
+        self.data['Chikou_span'] = close.shift(-26)
 
-    def create_advanced_candlestick_chart(self, output_path: str, period_days: int = 90):
+    def filter_period(self, period_days: int) -> pd.DataFrame:
+        """Dernières period_days journées calendaires de données (tranche en lecture seule, sans copie)"""
+        start_date = self.data.index[-1] - timedelta(days=period_days)
+        return self.data.iloc[self.data.index.searchsorted(start_date):]
+
+    def create_advanced_candlestick_chart(self, output_path: str, period_days: int = 90,
+                                          interactive: Optional[bool] = None):
         """Crée un graphique en chandelier avancé avec indicateurs"""
-        # Filtrer les données pour la période spécifiée
-        end_date = self.data.index[-1]
-        start_date = end_date - timedelta(days=period_days)
-        filtered_data = self.data[self.data.index >= start_date].copy()
-        
-        # Configuration de la figure avec subplots
+        filtered_data = self.filter_period(period_days)
+        chart_renderers.advanced_candlestick(output_path, filtered_data, self.symbol)
+
+        if self.interactive if interactive is None else interactive:
+            self.create_interactive_candlestick_chart(output_path.replace('.png', '_interactive.html'), period_days)
+
+        return output_path
+
+    def create_interactive_candlestick_chart(self, output_path: str, period_days: int = 90):
+        """Version HTML interactive (plotly) du graphique en chandelier avancé"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        filtered_data = self.filter_period(period_days)
+
         fig = make_subplots(
             rows=4, cols=1,
             shared_xaxes=True,
@@ -117,152 +143,51 @@ class AdvancedChartsGenerator:
                 'Volume'
             ]
         )
-        
-        # 1. Graphique principal - Chandeliers avec Bollinger Bands
-        fig.add_trace(
-            go.Candlestick(
-                x=filtered_data.index,
-                open=filtered_data['Open'],
-                high=filtered_data['High'],
-                low=filtered_data['Low'],
-                close=filtered_data['Close'],
-                name='Price',
-                increasing_line_color='#00ff88',
-                decreasing_line_color='#ff4444'
-            ),
-            row=1, col=1
-        )
-        
-        # Bollinger Bands
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['BB_Upper'],
-                mode='lines',
-                name='BB Upper',
-                line=dict(color='rgba(173, 204, 255, 0.8)', width=1),
-                fill=None
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['BB_Lower'],
-                mode='lines',
-                name='BB Lower',
-                line=dict(color='rgba(173, 204, 255, 0.8)', width=1),
-                fill='tonexty',
-                fillcolor='rgba(173, 204, 255, 0.1)'
-            ),
-            row=1, col=1
-        )
-        
-        # Moyennes mobiles
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['SMA_20'],
-                mode='lines',
-                name='SMA 20',
-                line=dict(color='orange', width=2)
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['SMA_50'],
-                mode='lines',
-                name='SMA 50',
-                line=dict(color='blue', width=2)
-            ),
-            row=1, col=1
-        )
-        
+
+        # 1. Chandeliers avec Bollinger Bands et moyennes mobiles
+        fig.add_trace(go.Candlestick(
+            x=filtered_data.index,
+            open=filtered_data['Open'],
+            high=filtered_data['High'],
+            low=filtered_data['Low'],
+            close=filtered_data['Close'],
+            name='Price',
+            increasing_line_color='#00ff88',
+            decreasing_line_color='#ff4444'
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['BB_Upper'], mode='lines', name='BB Upper',
+                                 line=dict(color='rgba(173, 204, 255, 0.8)', width=1), fill=None), row=1, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['BB_Lower'], mode='lines', name='BB Lower',
+                                 line=dict(color='rgba(173, 204, 255, 0.8)', width=1),
+                                 fill='tonexty', fillcolor='rgba(173, 204, 255, 0.1)'), row=1, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['SMA_20'], mode='lines', name='SMA 20',
+                                 line=dict(color='orange', width=2)), row=1, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['SMA_50'], mode='lines', name='SMA 50',
+                                 line=dict(color='blue', width=2)), row=1, col=1)
+
         # 2. MACD
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['MACD'],
-                mode='lines',
-                name='MACD',
-                line=dict(color='blue', width=2)
-            ),
-            row=2, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['MACD_signal'],
-                mode='lines',
-                name='Signal',
-                line=dict(color='red', width=2)
-            ),
-            row=2, col=1
-        )
-        
-        # Histogramme MACD
-        colors = ['green' if x >= 0 else 'red' for x in filtered_data['MACD_histogram']]
-        fig.add_trace(
-            go.Bar(
-                x=filtered_data.index,
-                y=filtered_data['MACD_histogram'],
-                name='MACD Histogram',
-                marker_color=colors,
-                opacity=0.6
-            ),
-            row=2, col=1
-        )
-        
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['MACD'], mode='lines', name='MACD',
+                                 line=dict(color='blue', width=2)), row=2, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['MACD_signal'], mode='lines', name='Signal',
+                                 line=dict(color='red', width=2)), row=2, col=1)
+        fig.add_trace(go.Bar(x=filtered_data.index, y=filtered_data['MACD_histogram'], name='MACD Histogram',
+                             marker_color=np.where(filtered_data['MACD_histogram'] >= 0, 'green', 'red'),
+                             opacity=0.6), row=2, col=1)
+
         # 3. RSI
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['RSI'],
-                mode='lines',
-                name='RSI',
-                line=dict(color='purple', width=2)
-            ),
-            row=3, col=1
-        )
-        
-        # Lignes de référence RSI
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['RSI'], mode='lines', name='RSI',
+                                 line=dict(color='purple', width=2)), row=3, col=1)
         fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.7, row=3, col=1)
         fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.7, row=3, col=1)
         fig.add_hline(y=50, line_dash="dash", line_color="gray", opacity=0.5, row=3, col=1)
-        
+
         # 4. Volume
-        volume_colors = ['green' if filtered_data['Close'].iloc[i] >= filtered_data['Open'].iloc[i] else 'red' 
-                        for i in range(len(filtered_data))]
-        
-        fig.add_trace(
-            go.Bar(
-                x=filtered_data.index,
-                y=filtered_data['Volume'],
-                name='Volume',
-                marker_color=volume_colors,
-                opacity=0.7
-            ),
-            row=4, col=1
-        )
-        
-        # Volume moyenne
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['Volume_SMA'],
-                mode='lines',
-                name='Volume Average',
-                line=dict(color='orange', width=2)
-            ),
-            row=4, col=1
-        )
-        
-        # Configuration de la mise en page
+        fig.add_trace(go.Bar(x=filtered_data.index, y=filtered_data['Volume'], name='Volume',
+                             marker_color=np.where(filtered_data['Close'] >= filtered_data['Open'], 'green', 'red'),
+                             opacity=0.7), row=4, col=1)
+        fig.add_trace(go.Scatter(x=filtered_data.index, y=filtered_data['Volume_SMA'], mode='lines',
+                                 name='Volume Average', line=dict(color='orange', width=2)), row=4, col=1)
+
         fig.update_layout(
             title=f'Analyse Technique Complète - {self.symbol}',
             xaxis_title='Date',
@@ -271,16 +196,11 @@ class AdvancedChartsGenerator:
             template='plotly_white',
             font=dict(size=12),
             paper_bgcolor='white',
-            plot_bgcolor='white'
+            plot_bgcolor='white',
+            xaxis4_rangeslider_visible=False
         )
-        
-        # Masquer les barres de navigation inutiles
-        fig.update_layout(xaxis4_rangeslider_visible=False)
-        
-        # Sauvegarder
-        fig.write_html(output_path.replace('.png', '_interactive.html'))
-        fig.write_image(output_path, width=1400, height=1200, scale=2)
-        
+
+        fig.write_html(output_path)
         return output_path
 
     def create_correlation_heatmap(self, comparison_data: Dict[str, pd.DataFrame], output_path: str):
@@ -288,165 +208,60 @@ class AdvancedChartsGenerator:
         # Préparer les données de corrélation
         returns_data = {}
         returns_data[self.symbol] = self.data['Returns'].dropna()
-        
+
         for symbol, data in comparison_data.items():
             if 'Close' in data.columns:
                 returns_data[symbol] = data['Close'].pct_change().dropna()
-        
-        # Créer un DataFrame avec tous les rendements
-        returns_df = pd.DataFrame(returns_data)
-        returns_df = returns_df.dropna()
-        
-        # Calculer la matrice de corrélation
-        correlation_matrix = returns_df.corr()
-        
-        # Créer la heatmap avec plotly
-        fig = go.Figure(data=go.Heatmap(
-            z=correlation_matrix.values,
-            x=correlation_matrix.columns,
-            y=correlation_matrix.columns,
-            colorscale='RdBu',
-            zmid=0,
-            text=correlation_matrix.round(3).values,
-            texttemplate='%{text}',
-            textfont={"size": 12},
-            hoverongaps=False
-        ))
-        
-        fig.update_layout(
-            title=f'Matrice de Corrélation - {self.symbol} vs Indices/Actifs',
-            width=800,
-            height=800,
-            template='plotly_white',
-            paper_bgcolor='white',
-            plot_bgcolor='white'
-        )
-        
-        fig.write_image(output_path, width=800, height=800, scale=2)
+
+        # Matrice de corrélation des rendements communs
+        correlation_matrix = pd.DataFrame(returns_data).dropna().corr()
+
+        chart_renderers.correlation_heatmap(output_path, correlation_matrix,
+                                            title=f'Matrice de Corrélation - {self.symbol} vs Indices/Actifs')
         return output_path
 
     def create_volatility_surface(self, output_path: str):
         """Crée une surface de volatilité 3D"""
-        # Calculer la volatilité sur différentes fenêtres
+        # Volatilité sur toutes les fenêtres en une seule passe de sommes cumulées
         windows = [5, 10, 20, 30, 60, 90, 120]
-        volatilities = []
-        
-        for window in windows:
-            vol = self.data['Returns'].rolling(window=window).std() * np.sqrt(252)
-            volatilities.append(vol.dropna())
-        
-        # Créer les données pour la surface
-        dates = volatilities[0].index
-        x = np.arange(len(dates))
-        y = windows
-        z = np.array([vol.values for vol in volatilities])
-        
-        # Créer la surface 3D
-        fig = go.Figure(data=[go.Surface(
-            x=x,
-            y=y,
-            z=z,
-            colorscale='Viridis',
-            name='Volatility Surface'
-        )])
-        
-        fig.update_layout(
-            title=f'Surface de Volatilité - {self.symbol}',
-            scene=dict(
-                xaxis_title='Temps',
-                yaxis_title='Fenêtre (jours)',
-                zaxis_title='Volatilité (%)',
-                camera=dict(eye=dict(x=1.5, y=1.5, z=1.5))
-            ),
-            width=1000,
-            height=800,
-            template='plotly_white',
-            paper_bgcolor='white',
-            plot_bgcolor='white'
-        )
-        
-        fig.write_image(output_path, width=1000, height=800, scale=2)
+        volatilities = rolling_volatility(self.data['Returns'], windows).dropna()
+
+        chart_renderers.volatility_surface(output_path, volatilities, self.symbol)
         return output_path
 
     def create_risk_return_scatter(self, comparison_data: Dict[str, pd.DataFrame], output_path: str):
         """Crée un scatter plot risque/rendement"""
-        risk_return_data = []
-        
-        # Calcul pour l'actif principal
-        returns = self.data['Returns'].dropna()
-        annual_return = returns.mean() * 252
-        annual_volatility = returns.std() * np.sqrt(252)
-        sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
-        
-        risk_return_data.append({
-            'Symbol': self.symbol,
-            'Annual_Return': annual_return * 100,
-            'Annual_Volatility': annual_volatility * 100,
-            'Sharpe_Ratio': sharpe_ratio,
-            'Type': 'Target'
-        })
-        
-        # Calcul pour les actifs de comparaison
+        series = {self.symbol: self.data['Returns'].dropna()}
         for symbol, data in comparison_data.items():
             if 'Close' in data.columns:
-                returns = data['Close'].pct_change().dropna()
-                annual_return = returns.mean() * 252
-                annual_volatility = returns.std() * np.sqrt(252)
-                sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
-                
-                risk_return_data.append({
-                    'Symbol': symbol,
-                    'Annual_Return': annual_return * 100,
-                    'Annual_Volatility': annual_volatility * 100,
-                    'Sharpe_Ratio': sharpe_ratio,
-                    'Type': 'Benchmark'
-                })
-        
-        df = pd.DataFrame(risk_return_data)
-        
-        # Créer le scatter plot
-        fig = px.scatter(
-            df,
-            x='Annual_Volatility',
-            y='Annual_Return',
-            color='Type',
-            size='Sharpe_Ratio',
-            hover_data=['Symbol', 'Sharpe_Ratio'],
-            text='Symbol',
-            title=f'Profil Risque/Rendement - {self.symbol} vs Benchmarks',
-            labels={
-                'Annual_Volatility': 'Volatilité Annuelle (%)',
-                'Annual_Return': 'Rendement Annuel (%)'
-            }
-        )
-        
-        fig.update_traces(textposition='top center')
-        fig.update_layout(
-            width=1000,
-            height=700,
-            template='plotly_white',
-            showlegend=True,
-            paper_bgcolor='white',
-            plot_bgcolor='white'
-        )
-        
-        # Ajouter des lignes de référence
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-        
-        fig.write_image(output_path, width=1000, height=700, scale=2)
+                series[symbol] = data['Close'].pct_change().dropna()
+
+        risk_return_data = []
+        for symbol, returns in series.items():
+            annual_return = returns.mean() * 252
+            annual_volatility = returns.std() * np.sqrt(252)
+            sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
+
+            risk_return_data.append({
+                'Symbol': symbol,
+                'Annual_Return': annual_return * 100,
+                'Annual_Volatility': annual_volatility * 100,
+                'Sharpe_Ratio': sharpe_ratio,
+                'Type': 'Target' if symbol == self.symbol else 'Benchmark'
+            })
+
+        profile = pd.DataFrame(risk_return_data).set_index('Symbol')
+        chart_renderers.risk_return_scatter(output_path, profile, self.symbol)
         return output_path
 
     def create_fibonacci_retracement(self, output_path: str, period_days: int = 90):
         """Crée un graphique avec retracements de Fibonacci"""
-        # Filtrer les données
-        end_date = self.data.index[-1]
-        start_date = end_date - timedelta(days=period_days)
-        filtered_data = self.data[self.data.index >= start_date].copy()
-        
+        filtered_data = self.filter_period(period_days)
+
         # Trouver les points hauts et bas
         high_price = filtered_data['High'].max()
         low_price = filtered_data['Low'].min()
-        
+
         # Calculer les niveaux de Fibonacci
         diff = high_price - low_price
         levels = {
@@ -457,146 +272,22 @@ class AdvancedChartsGenerator:
             '61.8%': high_price - 0.618 * diff,
             '100.0%': low_price
         }
-        
-        # Créer le graphique
-        fig = go.Figure()
-        
-        # Ajouter les chandeliers
-        fig.add_trace(go.Candlestick(
-            x=filtered_data.index,
-            open=filtered_data['Open'],
-            high=filtered_data['High'],
-            low=filtered_data['Low'],
-            close=filtered_data['Close'],
-            name='Price'
-        ))
-        
-        # Ajouter les niveaux de Fibonacci
-        colors = ['red', 'orange', 'yellow', 'green', 'blue', 'purple']
-        for i, (level, price) in enumerate(levels.items()):
-            fig.add_hline(
-                y=price,
-                line_dash="dash",
-                line_color=colors[i % len(colors)],
-                annotation_text=f"Fib {level}: ${price:.2f}",
-                annotation_position="right"
-            )
-        
-        fig.update_layout(
-            title=f'Retracements de Fibonacci - {self.symbol}',
-            yaxis_title='Prix ($)',
-            xaxis_title='Date',
-            width=1200,
-            height=800,
-            template='plotly_white',
-            paper_bgcolor='white',
-            plot_bgcolor='white'
-        )
-        
-        fig.write_image(output_path, width=1200, height=800, scale=2)
+
+        chart_renderers.fibonacci_retracement(output_path, filtered_data[['Open', 'High', 'Low', 'Close']],
+                                              levels, self.symbol)
         return output_path
 
     def create_ichimoku_cloud(self, output_path: str, period_days: int = 120):
-        """Crée un graphique avec le nuage d'Ichimoku"""
-        # Filtrer les données
-        end_date = self.data.index[-1]
-        start_date = end_date - timedelta(days=period_days)
-        filtered_data = self.data[self.data.index >= start_date].copy()
-        
-        # Calculer les composants Ichimoku
-        high_9 = filtered_data['High'].rolling(window=9).max()
-        low_9 = filtered_data['Low'].rolling(window=9).min()
-        filtered_data['Tenkan_sen'] = (high_9 + low_9) / 2
-        
-        high_26 = filtered_data['High'].rolling(window=26).max()
-        low_26 = filtered_data['Low'].rolling(window=26).min()
-        filtered_data['Kijun_sen'] = (high_26 + low_26) / 2
-        
-        filtered_data['Senkou_span_A'] = ((filtered_data['Tenkan_sen'] + filtered_data['Kijun_sen']) / 2).shift(26)
-        
-        high_52 = filtered_data['High'].rolling(window=52).max()
-        low_52 = filtered_data['Low'].rolling(window=52).min()
-        filtered_data['Senkou_span_B'] = ((high_52 + low_52) / 2).shift(26)
-        
-        filtered_data['Chikou_span'] = filtered_data['Close'].shift(-26)
-        
-        # Créer le graphique
-        fig = go.Figure()
-        
-        # Prix
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Close'],
-            mode='lines',
-            name='Prix',
-            line=dict(color='black', width=2)
-        ))
-        
-        # Tenkan-sen (ligne de conversion)
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Tenkan_sen'],
-            mode='lines',
-            name='Tenkan-sen',
-            line=dict(color='red', width=1)
-        ))
-        
-        # Kijun-sen (ligne de base)
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Kijun_sen'],
-            mode='lines',
-            name='Kijun-sen',
-            line=dict(color='blue', width=1)
-        ))
-        
-        # Senkou Span A et B (nuage)
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Senkou_span_A'],
-            mode='lines',
-            name='Senkou Span A',
-            line=dict(color='green', width=1),
-            fill=None
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Senkou_span_B'],
-            mode='lines',
-            name='Senkou Span B',
-            line=dict(color='red', width=1),
-            fill='tonexty',
-            fillcolor='rgba(0,255,0,0.1)'
-        ))
-        
-        # Chikou Span
-        fig.add_trace(go.Scatter(
-            x=filtered_data.index,
-            y=filtered_data['Chikou_span'],
-            mode='lines',
-            name='Chikou Span',
-            line=dict(color='purple', width=1)
-        ))
-        
-        fig.update_layout(
-            title=f'Nuage d\'Ichimoku - {self.symbol}',
-            yaxis_title='Prix ($)',
-            xaxis_title='Date',
-            width=1400,
-            height=800,
-            template='plotly_white',
-            paper_bgcolor='white',
-            plot_bgcolor='white'
-        )
-        
-        fig.write_image(output_path, width=1400, height=800, scale=2)
+        """Crée un graphique avec le nuage d'Ichimoku (composants précalculés)"""
+        ichimoku = self.filter_period(period_days)[['Close'] + self.ICHIMOKU_COLUMNS]
+        chart_renderers.ichimoku_cloud(output_path, ichimoku, self.symbol)
         return output_path
 
-def generate_all_advanced_charts(symbol: str, data: pd.DataFrame, output_dir: str) -> List[str]:
-    """Génère tous les graphiques avancés pour un symbole"""
+def generate_all_advanced_charts(symbol: str, data: pd.DataFrame, output_dir: str,
+                                 interactive: bool = False) -> List[str]:
+    """Génère tous les graphiques avancés pour un symbole (HTML interactif seulement si demandé)"""
     
-    generator = AdvancedChartsGenerator(symbol, data)
+    generator = AdvancedChartsGenerator(symbol, data, interactive=interactive)
     generated_files = []
     
     try:
@@ -6,58 +6,29 @@ Générateur de rapports BASELINE - Analyse fondamentale complète
 20-25 pages d'analyse approfondie
 """
 
-import os
 import sys
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import Paragraph, Spacer, Table
 
 from report_base import BaseReportGenerator
+from report_styles import PARAGRAPH_STYLES, BLUE, analysis_type_style, request_style, toc_title_style, data_table_style
+import chart_renderers
 
 class BaselineReportGenerator(BaseReportGenerator):
     """Générateur de rapports BASELINE - Analyse fondamentale complète"""
     
-    def __init__(self, symbol, output_path):
-        super().__init__(symbol, output_path)
+    def __init__(self, symbol, output_path, config=None):
+        super().__init__(symbol, output_path, config)
         self.report_type = "BASELINE"
     
     def add_analysis_type_badge(self):
         """Badge spécifique au rapport BASELINE"""
-        # Label
-        label_style = ParagraphStyle(
-            'TypeLabel',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=8,
-            textColor=colors.HexColor('#374151'),
-            fontName='Helvetica-Bold'
-        )
-        
-        # Style pour le type d'analyse - Bleu pour BASELINE
-        analysis_type_style = ParagraphStyle(
-            'AnalysisType',
-            parent=self.styles['Normal'],
-            fontSize=20,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            borderWidth=3,
-            borderColor=colors.HexColor('#1d4ed8'),
-            borderPadding=18,
-            backColor=colors.HexColor('#1d4ed8'),
-            fontName='Helvetica-Bold'
-        )
-        
-        self.story.append(Paragraph("TYPE D'ANALYSE DEMANDÉ", label_style))
-        self.story.append(Paragraph("RAPPORT BASELINE", analysis_type_style))
+        # Label et type d'analyse - Bleu pour BASELINE
+        self.story.append(Paragraph("TYPE D'ANALYSE DEMANDÉ", PARAGRAPH_STYLES['TypeLabel']))
+        self.story.append(Paragraph("RAPPORT BASELINE", analysis_type_style(BLUE)))
         
         # Description détaillée
         info = self.data.get('info', {})
@@ -73,21 +44,7 @@ class BaselineReportGenerator(BaseReportGenerator):
         • 20-25 pages d'analyse professionnelle approfondie
         """
         
-        request_style = ParagraphStyle(
-            'RequestSummary',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_CENTER,
-            spaceAfter=25,
-            borderWidth=2,
-            borderColor=colors.HexColor('#1d4ed8'),
-            borderPadding=12,
-            backColor=colors.HexColor('#dbeafe'),
-            leftIndent=10,
-            rightIndent=10
-        )
-        
-        self.story.append(Paragraph(description_text, request_style))
+        self.story.append(Paragraph(description_text, request_style(BLUE, '#dbeafe')))
         self.story.append(Spacer(1, 60))
     
     def generate_report(self):
@@ -99,17 +56,21 @@ class BaselineReportGenerator(BaseReportGenerator):
             if not self.fetch_data():
                 return False
             
-            # Structure du rapport BASELINE
+            # Structure du rapport BASELINE (sections selon la configuration)
             self.add_cover_page()
             self.add_table_of_contents()
             self.add_executive_summary()
             self.add_company_overview()
-            self.add_financial_analysis()
+            if self.wants_section('fundamentalAnalysis'):
+                self.add_financial_analysis()
             self.add_performance_analysis()
-            self.add_valuation_analysis()
-            self.add_technical_overview()
+            if self.wants_section('fundamentalAnalysis'):
+                self.add_valuation_analysis()
+            if self.wants_section('technicalAnalysis'):
+                self.add_technical_overview()
             self.add_sector_analysis()
-            self.add_risk_analysis()
+            if self.wants_section('riskMetrics'):
+                self.add_risk_analysis()
             self.add_recommendations()
             self.add_final_page()
             
@@ -125,46 +86,18 @@ class BaselineReportGenerator(BaseReportGenerator):
     
     def add_table_of_contents(self):
         """Table des matières spécifique au BASELINE"""
-        toc_title_style = ParagraphStyle(
-            'TOCTitle',
-            parent=self.styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1d4ed8'),
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold'
-        )
-        
-        self.story.append(Paragraph("TABLE DES MATIÈRES", toc_title_style))
-        
-        sections = [
-            "1. Résumé Exécutif",
-            "2. Vue d'Ensemble de l'Entreprise", 
-            "3. Analyse Financière Détaillée",
-            "4. Analyse de Performance",
-            "5. Analyse de Valorisation",
-            "6. Aperçu Technique",
-            "7. Analyse Sectorielle",
-            "8. Évaluation des Risques",
-            "9. Recommandations d'Investissement",
-            "10. Conclusion et Contact"
-        ]
-        
-        toc_style = ParagraphStyle(
-            'TOCEntry',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=8,
-            leftIndent=20
-        )
-        
-        for i, section in enumerate(sections, 3):
-            dots = '.' * (60 - len(section))
-            self.story.append(Paragraph(f"{section} {dots} {i}", toc_style))
-        
-        self.story.append(Spacer(1, 40))
-        self.story.append(Paragraph("Page", toc_style))
-        self.story.append(Spacer(1, 40))
+        self.story.append(Paragraph("TABLE DES MATIÈRES", toc_title_style(BLUE)))
+        
+        def contents_entries(entries):
+            """Sections présentes et leur page dans le document assemblé"""
+            story = []
+            for section, page in entries:
+                dots = '.' * (60 - len(section))
+                story.append(Paragraph(f"{section} {dots} {page}", PARAGRAPH_STYLES['TOCEntry']))
+            story.append(Spacer(1, 40))
+            return story
+        
+        self.add_contents(contents_entries)
     
     def add_executive_summary(self):
         """Résumé exécutif détaillé"""
@@ -266,17 +199,12 @@ class BaselineReportGenerator(BaseReportGenerator):
              'Capacité à honorer les dettes court terme']
         ]
         
+        self.record_table('key_metrics', metrics_data)
         table = Table(metrics_data, colWidths=[150, 100, 200])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1d4ed8')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')])
-        ]))
+        table.setStyle(data_table_style('#1d4ed8', '#f8fafc', 9, 'LEFT'))
+        table.setStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ])
         
         self.story.append(table)
         self.story.append(Spacer(1, 20))
@@ -398,7 +326,8 @@ class BaselineReportGenerator(BaseReportGenerator):
         self.add_text(performance_text)
         
         # Graphique de performance
-        self.create_performance_chart()
+        if self.wants_chart('PRICE_EVOLUTION'):
+            self.create_performance_chart()
         
         # Analyse des volumes
         self.add_subsection_title("Analyse des Volumes")
@@ -426,7 +355,8 @@ class BaselineReportGenerator(BaseReportGenerator):
         self.add_text(volume_analysis)
         
         # Graphique des volumes
-        self.create_volume_chart()
+        if self.wants_chart('VOLUME_ANALYSIS'):
+            self.create_volume_chart()
     
     def add_valuation_analysis(self):
         """Analyse de valorisation complète"""
@@ -511,7 +441,8 @@ class BaselineReportGenerator(BaseReportGenerator):
         self.add_text(technical_text)
         
         # Graphique des moyennes mobiles
-        self.create_moving_averages_chart()
+        if self.wants_chart('TECHNICAL_INDICATORS'):
+            self.create_moving_averages_chart()
     
     def add_sector_analysis(self):
         """Analyse sectorielle"""
@@ -688,24 +619,8 @@ class BaselineReportGenerator(BaseReportGenerator):
                 'ROA': info.get('returnOnAssets', 0) * 100
             }
             
-            plt.figure(figsize=(10, 6))
-            bars = plt.bar(metrics.keys(), metrics.values(), color=['#1d4ed8', '#3b82f6', '#60a5fa', '#93c5fd'])
-            
-            plt.title(f'Métriques Financières Clés - {self.symbol}', fontsize=14, fontweight='bold')
-            plt.ylabel('Pourcentage (%)')
-            plt.xticks(rotation=45)
-            
-            # Ajouter les valeurs sur les barres
-            for bar, value in zip(bars, metrics.values()):
-                plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, 
-                        f'{value:.1f}%', ha='center', va='bottom')
-            
-            plt.tight_layout()
-            chart_path = os.path.join(self.charts_dir, 'financial_metrics.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path)
+            self.render_chart('financial_metrics', chart_renderers.financial_metrics,
+                              metrics=metrics, symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique métriques financières: {e}")
@@ -717,32 +632,8 @@ class BaselineReportGenerator(BaseReportGenerator):
             if hist is None or hist.empty:
                 return
             
-            plt.figure(figsize=(12, 8))
-            
-            # Prix et volume
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), 
-                                         gridspec_kw={'height_ratios': [3, 1]})
-            
-            # Prix
-            ax1.plot(hist.index, hist['Close'], linewidth=2, color='#1d4ed8', label='Prix de clôture')
-            ax1.fill_between(hist.index, hist['Low'], hist['High'], alpha=0.3, color='#93c5fd')
-            ax1.set_title(f'Performance Historique - {self.symbol}', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('Prix ($)')
-            ax1.legend()
-            ax1.grid(True, alpha=0.3)
-            
-            # Volume
-            ax2.bar(hist.index, hist['Volume'], alpha=0.7, color='#6b7280')
-            ax2.set_title('Volume des Transactions')
-            ax2.set_ylabel('Volume')
-            ax2.set_xlabel('Date')
-            
-            plt.tight_layout()
-            chart_path = os.path.join(self.charts_dir, 'performance_history.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path, height=6*inch)
+            self.render_chart('performance_history', chart_renderers.price_volume_history, height=6*inch,
+                              hist=hist[['Close', 'Low', 'High', 'Volume']], symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique performance: {e}")
@@ -754,26 +645,8 @@ class BaselineReportGenerator(BaseReportGenerator):
             if hist is None or hist.empty:
                 return
             
-            plt.figure(figsize=(12, 6))
-            
-            # Volume avec moyenne mobile
-            hist['Volume_MA20'] = hist['Volume'].rolling(window=20).mean()
-            
-            plt.bar(hist.index, hist['Volume'], alpha=0.6, color='#6b7280', label='Volume quotidien')
-            plt.plot(hist.index, hist['Volume_MA20'], color='#dc2626', linewidth=2, label='Moyenne mobile 20j')
-            
-            plt.title(f'Analyse des Volumes - {self.symbol}', fontsize=14, fontweight='bold')
-            plt.ylabel('Volume')
-            plt.xlabel('Date')
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            chart_path = os.path.join(self.charts_dir, 'volume_analysis.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path)
+            self.render_chart('volume_analysis', chart_renderers.volume_analysis,
+                              volume=hist['Volume'], symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique volumes: {e}")
@@ -785,26 +658,8 @@ class BaselineReportGenerator(BaseReportGenerator):
             if hist is None or hist.empty:
                 return
             
-            plt.figure(figsize=(12, 8))
-            
-            # Prix et moyennes mobiles
-            plt.plot(hist.index, hist['Close'], label='Prix de clôture', linewidth=2, color='#1d4ed8')
-            plt.plot(hist.index, hist['MA20'], label='MA 20 jours', alpha=0.8, color='#f59e0b')
-            plt.plot(hist.index, hist['MA50'], label='MA 50 jours', alpha=0.8, color='#10b981')
-            plt.plot(hist.index, hist['MA200'], label='MA 200 jours', alpha=0.8, color='#dc2626')
-            
-            plt.title(f'Analyse des Moyennes Mobiles - {self.symbol}', fontsize=14, fontweight='bold')
-            plt.ylabel('Prix ($)')
-            plt.xlabel('Date')
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            chart_path = os.path.join(self.charts_dir, 'moving_averages.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path)
+            self.render_chart('moving_averages', chart_renderers.moving_averages,
+                              prices=hist[['Close', 'MA20', 'MA50', 'MA200']], symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique moyennes mobiles: {e}")
@@ -6,61 +6,38 @@ Générateur de rapports BENCHMARK - Analyse comparative
 15-20 pages d'analyse comparative avec indices et concurrents
 """
 
-import os
 import sys
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import yfinance as yf
 from datetime import datetime, timedelta
-from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import Paragraph, Spacer, Table
 
 from report_base import BaseReportGenerator
+from market_data import market_data
+from report_styles import PARAGRAPH_STYLES, GREEN, analysis_type_style, request_style, toc_title_style, data_table_style
+import chart_renderers
+from risk_engine import RiskEngine, build_returns_frame
+from rolling_stats import rolling_regression
 
 class BenchmarkReportGenerator(BaseReportGenerator):
     """Générateur de rapports BENCHMARK - Analyse comparative"""
     
-    def __init__(self, symbol, output_path):
-        super().__init__(symbol, output_path)
+    # Fenêtres des sensibilités roulantes (3, 6 et 12 mois)
+    ROLLING_WINDOWS = (63, 126, 252)
+    
+    def __init__(self, symbol, output_path, config=None):
+        super().__init__(symbol, output_path, config)
         self.report_type = "BENCHMARK"
         self.benchmarks = []
         self.benchmark_data = {}
+        self.risk_engine = None
+        self.rolling_regression = None
     
     def add_analysis_type_badge(self):
         """Badge spécifique au rapport BENCHMARK"""
-        # Label
-        label_style = ParagraphStyle(
-            'TypeLabel',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=8,
-            textColor=colors.HexColor('#374151'),
-            fontName='Helvetica-Bold'
-        )
-        
-        # Style pour le type d'analyse - Vert pour BENCHMARK
-        analysis_type_style = ParagraphStyle(
-            'AnalysisType',
-            parent=self.styles['Normal'],
-            fontSize=20,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            borderWidth=3,
-            borderColor=colors.HexColor('#059669'),
-            borderPadding=18,
-            backColor=colors.HexColor('#059669'),
-            fontName='Helvetica-Bold'
-        )
-        
-        self.story.append(Paragraph("TYPE D'ANALYSE DEMANDÉ", label_style))
-        self.story.append(Paragraph("ANALYSE COMPARATIVE", analysis_type_style))
+        # Label et type d'analyse - Vert pour BENCHMARK
+        self.story.append(Paragraph("TYPE D'ANALYSE DEMANDÉ", PARAGRAPH_STYLES['TypeLabel']))
+        self.story.append(Paragraph("ANALYSE COMPARATIVE", analysis_type_style(GREEN)))
         
         # Description détaillée
         info = self.data.get('info', {})
@@ -76,21 +53,7 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         • 15-20 pages d'étude comparative approfondie
         """
         
-        request_style = ParagraphStyle(
-            'RequestSummary',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_CENTER,
-            spaceAfter=25,
-            borderWidth=2,
-            borderColor=colors.HexColor('#059669'),
-            borderPadding=12,
-            backColor=colors.HexColor('#d1fae5'),
-            leftIndent=10,
-            rightIndent=10
-        )
-        
-        self.story.append(Paragraph(description_text, request_style))
+        self.story.append(Paragraph(description_text, request_style(GREEN, '#d1fae5')))
         self.story.append(Spacer(1, 60))
     
     def fetch_benchmark_data(self):
@@ -117,18 +80,15 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             if sector in sector_benchmarks:
                 self.benchmarks.extend(sector_benchmarks[sector])
             
-            # Récupérer les données
-            period = "2y"
-            for benchmark in self.benchmarks:
+            # Récupérer les données (cache quotidien : un seul téléchargement groupé par jour)
+            histories = market_data.download(self.benchmarks, "2y")
+            for benchmark, hist in histories.items():
                 try:
-                    ticker = yf.Ticker(benchmark)
-                    hist = ticker.history(period=period)
-                    if not hist.empty:
-                        self.benchmark_data[benchmark] = {
-                            'history': hist,
-                            'info': ticker.info
-                        }
-                        self.logger.info(f"📊 Données récupérées pour {benchmark}")
+                    self.benchmark_data[benchmark] = {
+                        'history': hist,
+                        'info': market_data.info(benchmark)
+                    }
+                    self.logger.info(f"📊 Données récupérées pour {benchmark}")
                 except Exception as e:
                     self.logger.warning(f"Impossible de récupérer {benchmark}: {e}")
             
@@ -150,15 +110,17 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             if not self.fetch_benchmark_data():
                 self.logger.warning("Aucun benchmark disponible, génération avec données limitées")
             
-            # Structure du rapport BENCHMARK
+            # Structure du rapport BENCHMARK (sections selon la configuration)
             self.add_cover_page()
             self.add_table_of_contents()
             self.add_executive_summary()
             self.add_benchmark_overview()
             self.add_performance_comparison()
             self.add_correlation_analysis()
-            self.add_risk_metrics_comparison()
-            self.add_relative_valuation()
+            if self.wants_section('riskMetrics'):
+                self.add_risk_metrics_comparison()
+            if self.wants_section('fundamentalAnalysis'):
+                self.add_relative_valuation()
             self.add_sector_positioning()
             self.add_tracking_analysis()
             self.add_recommendations()
@@ -176,44 +138,18 @@ class BenchmarkReportGenerator(BaseReportGenerator):
     
     def add_table_of_contents(self):
         """Table des matières spécifique au BENCHMARK"""
-        toc_title_style = ParagraphStyle(
-            'TOCTitle',
-            parent=self.styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#059669'),
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold'
-        )
-        
-        self.story.append(Paragraph("TABLE DES MATIÈRES", toc_title_style))
-        
-        sections = [
-            "1. Résumé Exécutif",
-            "2. Vue d'Ensemble des Benchmarks",
-            "3. Comparaison de Performance",
-            "4. Analyse de Corrélation",
-            "5. Métriques de Risque Comparatives",
-            "6. Valorisation Relative",
-            "7. Positionnement Sectoriel",
-            "8. Analyse de Tracking",
-            "9. Recommandations Comparatives",
-            "10. Conclusion et Contact"
-        ]
-        
-        toc_style = ParagraphStyle(
-            'TOCEntry',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=8,
-            leftIndent=20
-        )
-        
-        for i, section in enumerate(sections, 3):
-            dots = '.' * (60 - len(section))
-            self.story.append(Paragraph(f"{section} {dots} {i}", toc_style))
-        
-        self.story.append(Spacer(1, 40))
+        self.story.append(Paragraph("TABLE DES MATIÈRES", toc_title_style(GREEN)))
+        
+        def contents_entries(entries):
+            """Sections présentes et leur page dans le document assemblé"""
+            story = []
+            for section, page in entries:
+                dots = '.' * (60 - len(section))
+                story.append(Paragraph(f"{section} {dots} {page}", PARAGRAPH_STYLES['TOCEntry']))
+            story.append(Spacer(1, 40))
+            return story
+        
+        self.add_contents(contents_entries)
     
     def add_executive_summary(self):
         """Résumé exécutif comparatif"""
@@ -326,7 +262,8 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         self.add_subsection_title("Performance Multi-Périodes")
         
         # Créer le graphique de performance comparative
-        self.create_performance_comparison_chart()
+        if self.wants_chart('PRICE_EVOLUTION'):
+            self.create_performance_comparison_chart()
         
         # Calculer les performances sur différentes périodes
         self.calculate_period_performance()
@@ -355,7 +292,8 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         self.add_subsection_title("Matrice de Corrélation")
         
         # Créer la matrice de corrélation
-        self.create_correlation_matrix()
+        if self.wants_chart('CORRELATION_MATRIX'):
+            self.create_correlation_matrix()
         
         correlation_text = """
         <b>Interprétation des Corrélations</b>
@@ -375,6 +313,11 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         
         # Calculer et afficher les bêtas
         self.calculate_beta_metrics()
+        
+        self.add_subsection_title("Bêta et Corrélation Roulants")
+        if self.wants_chart('RISK_METRICS', 'CORRELATION_MATRIX'):
+            self.create_rolling_beta_chart()
+        self.create_rolling_beta_table()
     
     def add_risk_metrics_comparison(self):
         """Comparaison des métriques de risque"""
@@ -383,7 +326,8 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         self.add_subsection_title("Volatilité et Drawdowns")
         
         # Créer le graphique de comparaison des risques
-        self.create_risk_comparison_chart()
+        if self.wants_chart('RISK_METRICS'):
+            self.create_risk_comparison_chart()
         
         risk_text = """
         <b>Analyse Comparative des Risques</b>
@@ -394,7 +338,7 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         <b>Métriques de Risque Analysées</b>
         
         • Volatilité annualisée
-        • VaR (Value at Risk) à 95%
+        • VaR (Value at Risk) et Expected Shortfall à 95% et 99%
         • Drawdown maximum
         • Ratio de Sharpe
         • Ratio de Sortino
@@ -404,6 +348,21 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         
         # Créer le tableau comparatif des risques
         self.create_risk_metrics_table()
+        
+        self.add_subsection_title("VaR et Expected Shortfall")
+        
+        var_text = """
+        <b>Méthodologie</b>
+        
+        Les pertes potentielles sont estimées selon trois approches complémentaires : 
+        la simulation historique, l'approximation de Cornish-Fisher (qui corrige la loi normale 
+        de l'asymétrie et de l'épaisseur des queues) et la simulation historique filtrée (FHS), 
+        qui remet les chocs passés à l'échelle de la volatilité EWMA actuelle. 
+        Les valeurs sont exprimées en pertes positives.
+        """
+        
+        self.add_text(var_text)
+        self.create_var_es_table()
     
     def add_relative_valuation(self):
         """Analyse de valorisation relative"""
@@ -492,7 +451,8 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         self.add_text(tracking_text)
         
         # Créer le graphique de performance relative roulante
-        self.create_rolling_performance_chart()
+        if self.wants_chart('PRICE_EVOLUTION'):
+            self.create_rolling_performance_chart()
     
     def add_recommendations(self):
         """Recommandations basées sur l'analyse comparative"""
@@ -572,46 +532,20 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             if hist is None or hist.empty:
                 return
             
-            plt.figure(figsize=(14, 10))
-            
-            # Normaliser toutes les séries à 100 au début
-            normalized_data = {}
-            
-            # Stock principal
-            stock_normalized = (hist['Close'] / hist['Close'].iloc[0]) * 100
-            normalized_data[self.symbol] = stock_normalized
-            
-            # Benchmarks
-            colors_list = ['#1d4ed8', '#dc2626', '#059669', '#d97706', '#7c3aed', '#0891b2']
-            
-            plt.plot(stock_normalized.index, stock_normalized.values, 
-                    linewidth=3, label=self.symbol, color=colors_list[0])
+            # Normaliser toutes les séries à 100 au début (actif principal en premier)
+            normalized_data = {self.symbol: (hist['Close'] / hist['Close'].iloc[0]) * 100}
             
-            color_idx = 1
             for benchmark, data in self.benchmark_data.items():
                 if 'history' in data and not data['history'].empty:
                     bench_hist = data['history']
                     # Aligner les dates
                     common_dates = hist.index.intersection(bench_hist.index)
                     if len(common_dates) > 50:  # Au moins 50 points de données
-                        bench_normalized = (bench_hist.loc[common_dates, 'Close'] / bench_hist.loc[common_dates, 'Close'].iloc[0]) * 100
-                        plt.plot(bench_normalized.index, bench_normalized.values, 
-                                linewidth=2, label=benchmark, alpha=0.8, 
-                                color=colors_list[color_idx % len(colors_list)])
-                        color_idx += 1
+                        bench_close = bench_hist.loc[common_dates, 'Close']
+                        normalized_data[benchmark] = (bench_close / bench_close.iloc[0]) * 100
             
-            plt.title(f'Performance Comparative Normalisée - {self.symbol}', fontsize=16, fontweight='bold')
-            plt.ylabel('Performance Normalisée (Base 100)')
-            plt.xlabel('Date')
-            plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            
-            chart_path = os.path.join(self.charts_dir, 'performance_comparison.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path, height=6*inch)
+            self.render_chart('performance_comparison', chart_renderers.performance_comparison, height=6*inch,
+                              normalized=normalized_data, symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique comparaison performance: {e}")
@@ -637,21 +571,7 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             # Calculer la matrice de corrélation
             corr_matrix = returns_data.corr()
             
-            # Créer le heatmap
-            plt.figure(figsize=(10, 8))
-            mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-            
-            sns.heatmap(corr_matrix, mask=mask, annot=True, cmap='RdYlBu_r', center=0,
-                       square=True, linewidths=0.5, cbar_kws={"shrink": .8})
-            
-            plt.title('Matrice de Corrélation des Rendements', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            
-            chart_path = os.path.join(self.charts_dir, 'correlation_matrix.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path)
+            self.render_chart('correlation_matrix', chart_renderers.correlation_heatmap, corr_matrix=corr_matrix)
             
         except Exception as e:
             self.logger.error(f"Erreur création matrice corrélation: {e}")
@@ -663,61 +583,105 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             if hist is None or hist.empty:
                 return
             
-            # Calculer les métriques de risque
-            risk_metrics = {}
-            
-            # Stock principal
-            stock_returns = hist['Close'].pct_change().dropna()
-            stock_vol = stock_returns.std() * (252**0.5) * 100
-            stock_var = stock_returns.quantile(0.05) * 100
-            stock_drawdown = ((hist['Close'] / hist['Close'].expanding().max()) - 1).min() * 100
-            
-            risk_metrics[self.symbol] = {
-                'Volatilité (%)': stock_vol,
-                'VaR 95% (%)': stock_var,
-                'Max Drawdown (%)': stock_drawdown
-            }
+            engine = self.get_risk_engine()
+            if engine is None:
+                return
             
-            # Benchmarks
-            for benchmark, data in self.benchmark_data.items():
-                if 'history' in data and not data['history'].empty:
-                    bench_hist = data['history']
-                    common_dates = hist.index.intersection(bench_hist.index)
-                    if len(common_dates) > 100:
-                        bench_returns = bench_hist.loc[common_dates, 'Close'].pct_change().dropna()
-                        bench_vol = bench_returns.std() * (252**0.5) * 100
-                        bench_var = bench_returns.quantile(0.05) * 100
-                        bench_drawdown = ((bench_hist.loc[common_dates, 'Close'] / bench_hist.loc[common_dates, 'Close'].expanding().max()) - 1).min() * 100
-                        
-                        risk_metrics[benchmark] = {
-                            'Volatilité (%)': bench_vol,
-                            'VaR 95% (%)': bench_var,
-                            'Max Drawdown (%)': bench_drawdown
-                        }
-            
-            # Créer le graphique
-            risk_df = pd.DataFrame(risk_metrics).T
+            # VaR historique 95% de tous les actifs en un seul calcul vectorisé
+            var_95, _ = engine.historical(0.95)
+            volatilities = engine.returns.std() * (252**0.5) * 100
+            prices = engine.returns.add(1).cumprod()
+            drawdowns = ((prices / prices.cummax()) - 1).min() * 100
             
-            fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+            risk_metrics = {}
+            for i, asset in enumerate(engine.assets):
+                risk_metrics[asset] = {
+                    'Volatilité (%)': volatilities[asset],
+                    'VaR 95% (%)': -var_95[i] * 100,
+                    'Max Drawdown (%)': drawdowns[asset]
+                }
             
-            for i, metric in enumerate(['Volatilité (%)', 'VaR 95% (%)', 'Max Drawdown (%)']):
-                axes[i].bar(risk_df.index, risk_df[metric], alpha=0.7)
-                axes[i].set_title(metric)
-                axes[i].tick_params(axis='x', rotation=45)
-                if metric != 'Volatilité (%)':
-                    axes[i].axhline(y=0, color='black', linestyle='-', alpha=0.3)
+            risk_df = pd.DataFrame(risk_metrics).T
+            self.render_chart('risk_comparison', chart_renderers.risk_comparison, height=4*inch, risk_df=risk_df)
             
-            plt.suptitle('Comparaison des Métriques de Risque', fontsize=16, fontweight='bold')
-            plt.tight_layout()
+        except Exception as e:
+            self.logger.error(f"Erreur création graphique comparaison risques: {e}")
+    
+    def get_risk_engine(self):
+        """Construit (une fois) le moteur de risque sur l'action et ses benchmarks"""
+        if self.risk_engine is not None:
+            return self.risk_engine
+        
+        hist = self.data.get('history')
+        if hist is None or hist.empty:
+            return None
+        
+        closes = {self.symbol: hist['Close']}
+        for benchmark, data in self.benchmark_data.items():
+            if 'history' in data and not data['history'].empty:
+                bench_hist = data['history']
+                common_dates = hist.index.intersection(bench_hist.index)
+                if len(common_dates) > 100:
+                    closes[benchmark] = bench_hist.loc[common_dates, 'Close']
+        
+        self.risk_engine = RiskEngine(build_returns_frame(closes))
+        return self.risk_engine
+    
+    def create_var_es_table(self):
+        """Crée le tableau VaR/ES multi-méthodes pour l'action et ses benchmarks"""
+        try:
+            engine = self.get_risk_engine()
+            if engine is None:
+                return
             
-            chart_path = os.path.join(self.charts_dir, 'risk_comparison.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            summary = engine.summary()
+            daily = summary[summary['horizon'] == 1].set_index(['asset', 'method', 'confidence'])
+            
+            header = ['Actif', 'VaR 95% Hist.', 'VaR 95% CF', 'VaR 95% FHS', 'ES 95% Hist.', 'VaR 99% Hist.', 'ES 99% Hist.']
+            rows = []
+            for asset in engine.assets:
+                rows.append([
+                    asset,
+                    f"{daily.loc[(asset, 'historical', 0.95), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 'cornish_fisher', 0.95), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 'fhs', 0.95), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 'historical', 0.95), 'es']*100:.2f}%",
+                    f"{daily.loc[(asset, 'historical', 0.99), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 'historical', 0.99), 'es']*100:.2f}%"
+                ])
+            
+            self.record_table('var_comparison', [header] + rows)
+            var_table = Table([header] + rows, colWidths=[70, 62, 62, 62, 62, 62, 62])
+            var_table.setStyle(data_table_style('#dc2626', '#fef2f2', 8))
+            
+            self.story.append(var_table)
+            self.story.append(Spacer(1, 20))
             
-            self.add_chart(chart_path, height=4*inch)
+            # Horizons multiples et intervalles bootstrap pour l'action
+            intervals = engine.bootstrap_confidence_intervals()
+            stock = summary[(summary['asset'] == self.symbol) & (summary['method'] == 'historical')]
+            
+            horizon_data = [['Horizon', 'Confiance', 'VaR', 'ES', 'IC 90% VaR 1j']]
+            for _, row in stock.iterrows():
+                interval = intervals[row['confidence']].loc[self.symbol]
+                ci_text = f"[{interval['lower']*100:.2f}% ; {interval['upper']*100:.2f}%]" if row['horizon'] == 1 else '-'
+                horizon_data.append([
+                    f"{int(row['horizon'])}j",
+                    f"{row['confidence']*100:.0f}%",
+                    f"{row['var']*100:.2f}%",
+                    f"{row['es']*100:.2f}%",
+                    ci_text
+                ])
+            
+            self.record_table('var_horizons', horizon_data)
+            horizon_table = Table(horizon_data, colWidths=[60, 70, 70, 70, 150])
+            horizon_table.setStyle(data_table_style('#7c3aed', '#faf5ff'))
+            
+            self.story.append(horizon_table)
+            self.story.append(Spacer(1, 20))
             
         except Exception as e:
-            self.logger.error(f"Erreur création graphique comparaison risques: {e}")
+            self.logger.error(f"Erreur création tableau VaR/ES: {e}")
     
     def create_rolling_performance_chart(self):
         """Crée un graphique de performance relative roulante"""
@@ -741,26 +705,8 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             rolling_perf = (stock_returns.rolling(window).apply(lambda x: (1+x).prod()-1) - 
                            sp500_returns.rolling(window).apply(lambda x: (1+x).prod()-1)) * 100
             
-            plt.figure(figsize=(12, 6))
-            plt.plot(rolling_perf.index, rolling_perf.values, linewidth=2, color='#1d4ed8')
-            plt.axhline(y=0, color='black', linestyle='--', alpha=0.5)
-            plt.fill_between(rolling_perf.index, rolling_perf.values, 0, 
-                           where=(rolling_perf.values > 0), alpha=0.3, color='green', label='Sur-performance')
-            plt.fill_between(rolling_perf.index, rolling_perf.values, 0, 
-                           where=(rolling_perf.values < 0), alpha=0.3, color='red', label='Sous-performance')
-            
-            plt.title(f'Performance Relative Roulante 3M vs S&P 500 - {self.symbol}', fontsize=14, fontweight='bold')
-            plt.ylabel('Écart de Performance (%)')
-            plt.xlabel('Date')
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            
-            chart_path = os.path.join(self.charts_dir, 'rolling_performance.png')
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(chart_path)
+            self.render_chart('rolling_performance', chart_renderers.relative_performance,
+                              rolling_perf=rolling_perf, symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique performance roulante: {e}")
@@ -800,31 +746,17 @@ class BenchmarkReportGenerator(BaseReportGenerator):
             
             # Créer les tableaux
             if performance_data:
+                self.record_table('performance', [['Période', f'Performance {self.symbol}']] + performance_data)
                 perf_table = Table([['Période', f'Performance {self.symbol}']] + performance_data)
-                perf_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')])
-                ]))
+                perf_table.setStyle(data_table_style('#059669', '#f0fdf4', 10))
                 
                 self.story.append(perf_table)
                 self.story.append(Spacer(1, 20))
             
             if benchmark_data:
+                self.record_table('benchmark_performance', [['Benchmark', 'Performance 1Y']] + benchmark_data)
                 bench_table = Table([['Benchmark', 'Performance 1Y']] + benchmark_data)
-                bench_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1d4ed8')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#eff6ff')])
-                ]))
+                bench_table.setStyle(data_table_style('#1d4ed8', '#eff6ff', 10))
                 
                 self.story.append(bench_table)
                 self.story.append(Spacer(1, 20))
@@ -835,45 +767,27 @@ class BenchmarkReportGenerator(BaseReportGenerator):
     def calculate_beta_metrics(self):
         """Calcule et affiche les métriques de bêta"""
         try:
-            hist = self.data.get('history')
-            if hist is None or hist.empty:
+            engine = self.get_risk_engine()
+            if engine is None:
                 return
             
-            beta_data = []
-            stock_returns = hist['Close'].pct_change().dropna()
+            # Bêtas et corrélations plein échantillon en une seule matrice de covariance
+            returns = engine.returns.dropna()
+            covariance = returns.cov()
+            correlation = returns.corr()
             
-            for benchmark, data in self.benchmark_data.items():
-                if 'history' in data and not data['history'].empty:
-                    bench_hist = data['history']
-                    common_dates = hist.index.intersection(bench_hist.index)
-                    if len(common_dates) > 100:
-                        bench_returns = bench_hist.loc[common_dates, 'Close'].pct_change().dropna()
-                        
-                        # Aligner les rendements
-                        aligned_stock = stock_returns.loc[common_dates]
-                        aligned_bench = bench_returns.loc[common_dates]
-                        
-                        # Calculer bêta
-                        covariance = np.cov(aligned_stock, aligned_bench)[0][1]
-                        bench_variance = np.var(aligned_bench)
-                        beta = covariance / bench_variance if bench_variance != 0 else 0
-                        
-                        # Calculer corrélation
-                        correlation = np.corrcoef(aligned_stock, aligned_bench)[0][1]
-                        
-                        beta_data.append([benchmark, f"{beta:.2f}", f"{correlation:.2f}"])
+            beta_data = []
+            for benchmark in engine.assets:
+                if benchmark == self.symbol:
+                    continue
+                bench_variance = covariance.loc[benchmark, benchmark]
+                beta = covariance.loc[self.symbol, benchmark] / bench_variance if bench_variance != 0 else 0
+                beta_data.append([benchmark, f"{beta:.2f}", f"{correlation.loc[self.symbol, benchmark]:.2f}"])
             
             if beta_data:
+                self.record_table('betas', [['Benchmark', 'Bêta', 'Corrélation']] + beta_data)
                 beta_table = Table([['Benchmark', 'Bêta', 'Corrélation']] + beta_data)
-                beta_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#7c3aed')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')])
-                ]))
+                beta_table.setStyle(data_table_style('#7c3aed', '#faf5ff', 10))
                 
                 self.story.append(beta_table)
                 self.story.append(Spacer(1, 20))
@@ -892,6 +806,80 @@ class BenchmarkReportGenerator(BaseReportGenerator):
         except Exception as e:
             self.logger.error(f"Erreur calcul métriques bêta: {e}")
     
+    def get_rolling_regression(self):
+        """Calcule (une fois) bêta, corrélation et alpha roulants contre tous les benchmarks"""
+        if self.rolling_regression is not None:
+            return self.rolling_regression
+        
+        engine = self.get_risk_engine()
+        if engine is None or len(engine.assets) < 2:
+            return None
+        
+        returns = engine.returns
+        self.rolling_regression = rolling_regression(
+            returns[self.symbol], returns.drop(columns=[self.symbol]), self.ROLLING_WINDOWS
+        )
+        return self.rolling_regression
+    
+    def create_rolling_beta_chart(self):
+        """Crée le graphique de sensibilité dans le temps (bêta et corrélation 6 mois)"""
+        try:
+            regression = self.get_rolling_regression()
+            if regression is None:
+                return
+            
+            window = 126
+            beta = regression[window]['beta'].dropna(how='all')
+            correlation = regression[window]['correlation'].dropna(how='all')
+            if beta.empty:
+                return
+            
+            self.render_chart('rolling_beta', chart_renderers.rolling_sensitivity,
+                              beta=beta, correlation=correlation, symbol=self.symbol)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur création graphique bêta roulant: {e}")
+    
+    def create_rolling_beta_table(self):
+        """Crée le tableau des dernières valeurs de bêta, corrélation et alpha par fenêtre"""
+        try:
+            regression = self.get_rolling_regression()
+            if regression is None:
+                return
+            
+            header = ['Benchmark']
+            for window in self.ROLLING_WINDOWS:
+                header.extend([f'Bêta {window}j', f'Corr. {window}j'])
+            header.append(f'Alpha {self.ROLLING_WINDOWS[-1]}j')
+            
+            latest = {window: {metric: frame.ffill().iloc[-1] for metric, frame in metrics.items()}
+                      for window, metrics in regression.items()}
+            
+            rows = []
+            for benchmark in regression[self.ROLLING_WINDOWS[0]]['beta'].columns:
+                row = [benchmark]
+                for window in self.ROLLING_WINDOWS:
+                    row.append(f"{latest[window]['beta'][benchmark]:.2f}")
+                    row.append(f"{latest[window]['correlation'][benchmark]:.2f}")
+                row.append(f"{latest[self.ROLLING_WINDOWS[-1]]['alpha'][benchmark]*100:+.1f}%")
+                rows.append(row)
+            
+            self.record_table('rolling_betas', [header] + rows)
+            rolling_table = Table([header] + rows)
+            rolling_table.setStyle(data_table_style('#7c3aed', '#faf5ff', 8))
+            
+            self.story.append(rolling_table)
+            self.story.append(Spacer(1, 20))
+            
+            self.add_text("""
+            Les sensibilités roulantes révèlent l'évolution du profil de risque : un bêta qui 
+            s'écarte durablement de sa moyenne signale un changement de régime. L'alpha est le 
+            rendement annualisé non expliqué par le benchmark sur la fenêtre la plus longue.
+            """)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur tableau bêta roulant: {e}")
+    
     def create_tracking_metrics_table(self):
         """Crée le tableau des métriques de tracking"""
         try:
@@ -904,16 +892,9 @@ class BenchmarkReportGenerator(BaseReportGenerator):
                 ['Down Capture', '105%', 'Capture des baisses du benchmark']
             ]
             
+            self.record_table('tracking', tracking_data)
             tracking_table = Table(tracking_data, colWidths=[150, 100, 200])
-            tracking_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0891b2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecfeff')])
-            ]))
+            tracking_table.setStyle(data_table_style('#0891b2', '#ecfeff', 9, 'LEFT'))
             
             self.story.append(tracking_table)
             self.story.append(Spacer(1, 20))
@@ -940,16 +921,9 @@ class BenchmarkReportGenerator(BaseReportGenerator):
                 ['Kurtosis', f"{stock_returns.kurtosis():.2f}", 'Épaisseur des queues']
             ]
             
+            self.record_table('relative_risk', risk_data)
             risk_table = Table(risk_data, colWidths=[150, 100, 200])
-            risk_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dc2626')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fef2f2')])
-            ]))
+            risk_table.setStyle(data_table_style('#dc2626', '#fef2f2', 9, 'LEFT'))
             
             self.story.append(risk_table)
             self.story.append(Spacer(1, 20))
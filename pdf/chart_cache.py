@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache de rendu des graphiques FinAnalytics
+Graphiques indexés par empreinte de contenu (données, type, style, taille), partagés
+entre rapports, utilisateurs et processus, avec éviction LRU par taille
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Ancré sur pdf/ (et non sur le répertoire courant du processus)
+TEMP_CHARTS_DIR = Path(__file__).resolve().parent / "temp_charts"
+CACHE_DIR = TEMP_CHARTS_DIR / "cache"
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+MAX_CACHE_ENTRIES = 5000
+
+# Le cache est partagé entre processus : le total tenu en mémoire est recalé sur le disque
+# (parcours complet) au plus tard toutes les RESCAN_INTERVAL écritures
+RESCAN_INTERVAL = 200
+
+# Une éviction ramène le cache à cette fraction des limites : les écritures suivantes
+# ne déclenchent pas chacune un nouveau parcours
+EVICT_TARGET = 0.9
+
+
+def _update_digest(digest, value):
+    """Alimente l'empreinte avec une valeur (DataFrame, Series, ndarray, conteneurs, scalaires)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(type(value).__name__.encode())
+        names = value.columns if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr(list(names)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Index):
+        digest.update(pd.util.hash_pandas_object(value).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _update_digest(digest, item)
+        digest.update(b']')
+    else:
+        digest.update(repr(value).encode())
+
+
+def chart_key(chart_type: str, inputs: dict, style: str = '', size=None) -> str:
+    """Empreinte SHA-256 d'un graphique : type, données d'entrée, style et taille"""
+    digest = hashlib.sha256()
+    _update_digest(digest, (chart_type, style, size))
+    _update_digest(digest, inputs)
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Cache disque de graphiques rendus, éviction des moins récemment utilisés"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES,
+                 max_entries: int = MAX_CACHE_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # Taille et nombre d'entrées estimés, tenus à jour à chaque écriture (None : à mesurer)
+        self._total = None
+        self._count = 0
+        self._puts_since_scan = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str, extension: str = '.png') -> Path:
+        return self.cache_dir / key[:2] / f"{key}{extension}"
+
+    def get(self, key: str, extension: str = '.png') -> Optional[bytes]:
+        """Renvoie le contenu en cache (et le marque comme récemment utilisé) ou None"""
+        path = self.path_for(key, extension)
+        try:
+            os.utime(path)
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes, extension: str = '.png') -> Optional[Path]:
+        """Enregistre un rendu dans le cache (écriture atomique) puis applique l'éviction si nécessaire"""
+        path = self.path_for(key, extension)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = None
+            # Nom temporaire unique par appel (plusieurs threads d'un même processus écrivent)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire le graphique en cache {path}: {e}")
+            return None
+
+        with self._lock:
+            if self._total is not None:
+                self._total += len(data) - (replaced or 0)
+                self._count += replaced is None
+            self._puts_since_scan += 1
+            over_limit = (self._total is None or self._total > self.max_bytes
+                          or self._count > self.max_entries or self._puts_since_scan >= RESCAN_INTERVAL)
+        if over_limit:
+            self.evict()
+        return path
+
+    def evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà des limites de taille
+
+        Parcours complet du cache : appelé par put seulement quand le total estimé dépasse
+        une limite, au premier appel ou toutes les RESCAN_INTERVAL écritures.
+        """
+        try:
+            entries = []
+            for path in self.cache_dir.glob("*/*"):
+                if path.name.startswith('.'):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes and len(entries) <= self.max_entries:
+            self._record_scan(total, len(entries))
+            return
+
+        entries.sort()
+        count = len(entries)
+        max_bytes, max_entries = self.max_bytes * EVICT_TARGET, self.max_entries * EVICT_TARGET
+        for _, size, path in entries:
+            if total <= max_bytes and count <= max_entries:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            count -= 1
+        self._record_scan(total, count)
+
+    def _record_scan(self, total: int, count: int):
+        with self._lock:
+            self._total = total
+            self._count = count
+            self._puts_since_scan = 0
+
+    def clear(self):
+        """Vide entièrement le cache"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._record_scan(0, 0)
+
+
+chart_cache = ChartCache()
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fonctions de rendu des graphiques FinAnalytics
+Fonctions pures : (cible de sortie, données préparées) -> image, sans état du générateur,
+ce qui permet de les mettre en cache par empreinte de contenu
+"""
+
+import io
+import numpy as np
+import pandas as pd
+
+from plotting import CHART_DPI, create_figure, save_figure
+from image_pipeline import optimize_raster
+from downsampling import (point_budget, bar_budget, bar_width, downsample_lines,
+                          bucket_bars, bucket_ohlc)
+
+# À incrémenter à chaque modification visuelle d'un rendu (invalide le cache)
+RENDERER_VERSION = 4
+
+# Tracés denses conservés en raster même en mode vectoriel
+RASTER_RENDERERS = {'correlation_heatmap', 'volatility_surface'}
+
+# Tracés en dégradés continus encodés en JPEG quand ils sont rastérisés (PNG palette sinon)
+JPEG_RENDERERS = {'volatility_surface'}
+
+
+def chart_format(renderer, vector: bool) -> str:
+    """Format de sortie d'un rendu : 'pdf' (vectoriel), 'png' (palette) ou 'jpeg'"""
+    if vector and renderer.__name__ not in RASTER_RENDERERS:
+        return 'pdf'
+    return 'jpeg' if renderer.__name__ in JPEG_RENDERERS else 'png'
+
+
+class ChartBuffer(io.BytesIO):
+    """Tampon mémoire de rendu portant son format de sortie"""
+
+    def __init__(self, fmt):
+        super().__init__()
+        self.format = fmt
+
+
+def render_job(renderer, inputs, fmt, display=None) -> bytes:
+    """
+    Rend un graphique en mémoire (exécutable dans un processus du pool) et renvoie ses octets
+
+    Args:
+        display: (largeur, hauteur, dpi) d'affichage ; les rendus raster y sont rééchantillonnés
+    """
+    buffer = ChartBuffer('pdf' if fmt == 'pdf' else 'png')
+    renderer(buffer, **inputs)
+    data = buffer.getvalue()
+    if fmt != 'pdf' and display is not None:
+        data = optimize_raster(data, *display, encoding=fmt)
+    return data
+
+
+def financial_metrics(target, metrics, symbol):
+    """Barres des marges et rentabilités (en %)"""
+    fig, ax = create_figure('bars')
+    bars = ax.bar(list(metrics.keys()), list(metrics.values()), color=['#1d4ed8', '#3b82f6', '#60a5fa', '#93c5fd'])
+
+    ax.set_title(f'Métriques Financières Clés - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Pourcentage (%)')
+    ax.tick_params(axis='x', rotation=45)
+
+    # Ajouter les valeurs sur les barres
+    for bar, value in zip(bars, metrics.values()):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
+                f'{value:.1f}%', ha='center', va='bottom')
+
+    save_figure(fig, target)
+
+
+def price_volume_history(target, hist, symbol):
+    """Prix de clôture avec range haut/bas et volumes"""
+    fig, (ax1, ax2) = create_figure('price_volume')
+
+    # Prix (courbe LTTB, range haut/bas agrégé en enveloppe min/max)
+    close = downsample_lines(hist['Close'], point_budget(ax1))
+    low = bucket_bars(hist['Low'], point_budget(ax1), how='min')
+    high = bucket_bars(hist['High'], point_budget(ax1), how='max')
+    ax1.plot(close.index, close.values, linewidth=2, color='#1d4ed8', label='Prix de clôture')
+    ax1.fill_between(low.index, low.values, high.values, alpha=0.3, color='#93c5fd')
+    ax1.set_title(f'Performance Historique - {symbol}', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Prix ($)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # Volume
+    volume = bucket_bars(hist['Volume'], bar_budget(ax2))
+    ax2.bar(volume.index, volume.values, width=bar_width(volume.index), alpha=0.7, color='#6b7280')
+    ax2.set_title('Volume des Transactions')
+    ax2.set_ylabel('Volume')
+    ax2.set_xlabel('Date')
+
+    save_figure(fig, target)
+
+
+def volume_analysis(target, volume, symbol):
+    """Volumes quotidiens et moyenne mobile 20 jours"""
+    fig, ax = create_figure('wide')
+
+    # Moyenne calculée sur l'historique complet avant sous-échantillonnage
+    average = downsample_lines(volume.rolling(window=20).mean(), point_budget(ax))
+    bars = bucket_bars(volume, bar_budget(ax))
+    ax.bar(bars.index, bars.values, width=bar_width(bars.index), alpha=0.6, color='#6b7280', label='Volume quotidien')
+    ax.plot(average.index, average.values, color='#dc2626', linewidth=2, label='Moyenne mobile 20j')
+
+    ax.set_title(f'Analyse des Volumes - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Volume')
+    ax.set_xlabel('Date')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def moving_averages(target, prices, symbol):
+    """Prix de clôture et moyennes mobiles 20/50/200 jours"""
+    fig, ax = create_figure('tall')
+    prices = downsample_lines(prices, point_budget(ax))
+
+    ax.plot(prices.index, prices['Close'], label='Prix de clôture', linewidth=2, color='#1d4ed8')
+    ax.plot(prices.index, prices['MA20'], label='MA 20 jours', alpha=0.8, color='#f59e0b')
+    ax.plot(prices.index, prices['MA50'], label='MA 50 jours', alpha=0.8, color='#10b981')
+    ax.plot(prices.index, prices['MA200'], label='MA 200 jours', alpha=0.8, color='#dc2626')
+
+    ax.set_title(f'Analyse des Moyennes Mobiles - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Prix ($)')
+    ax.set_xlabel('Date')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def technical_analysis(target, prices, symbol):
+    """Prix et moyennes mobiles récents (style seaborn)"""
+    fig, ax = create_figure('tall', style='seaborn')
+    prices = downsample_lines(prices, point_budget(ax))
+
+    ax.plot(prices.index, prices['Close'], label='Prix', linewidth=2, color='#1f77b4')
+    ax.plot(prices.index, prices['MA20'], label='MA20', linewidth=1.5, color='#ff7f0e', alpha=0.8)
+    ax.plot(prices.index, prices['MA50'], label='MA50', linewidth=1.5, color='#2ca02c', alpha=0.8)
+    ax.plot(prices.index, prices['MA200'], label='MA200', linewidth=1.5, color='#d62728', alpha=0.8)
+
+    ax.set_title(f'Analyse Technique - {symbol}', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Prix ($)', fontsize=12)
+    ax.legend(loc='upper left')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def performance_comparison(target, normalized, symbol):
+    """Performances normalisées base 100 (premier élément = actif principal)"""
+    fig, ax = create_figure('large')
+
+    colors_list = ['#1d4ed8', '#dc2626', '#059669', '#d97706', '#7c3aed', '#0891b2']
+    for i, (name, series) in enumerate(normalized.items()):
+        series = downsample_lines(series, point_budget(ax))
+        if i == 0:
+            ax.plot(series.index, series.values, linewidth=3, label=name, color=colors_list[0])
+        else:
+            ax.plot(series.index, series.values, linewidth=2, label=name, alpha=0.8,
+                    color=colors_list[i % len(colors_list)])
+
+    ax.set_title(f'Performance Comparative Normalisée - {symbol}', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Performance Normalisée (Base 100)')
+    ax.set_xlabel('Date')
+    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def correlation_heatmap(target, corr_matrix, title='Matrice de Corrélation des Rendements'):
+    """Heatmap triangulaire d'une matrice de corrélation"""
+    # seaborn (et scipy.stats) coûte ~1,5 s à l'import : chargé seulement pour ce graphique
+    import seaborn as sns
+
+    fig, ax = create_figure('square')
+    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+
+    sns.heatmap(corr_matrix, mask=mask, annot=True, cmap='RdYlBu_r', center=0,
+                square=True, linewidths=0.5, cbar_kws={"shrink": .8}, ax=ax)
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    save_figure(fig, target)
+
+
+def risk_comparison(target, risk_df):
+    """Barres comparatives volatilité / VaR / drawdown par actif"""
+    fig, axes = create_figure('triple')
+
+    for i, metric in enumerate(['Volatilité (%)', 'VaR 95% (%)', 'Max Drawdown (%)']):
+        axes[i].bar(risk_df.index, risk_df[metric], alpha=0.7)
+        axes[i].set_title(metric)
+        axes[i].tick_params(axis='x', rotation=45)
+        if metric != 'Volatilité (%)':
+            axes[i].axhline(y=0, color='black', linestyle='-', alpha=0.3)
+
+    fig.suptitle('Comparaison des Métriques de Risque', fontsize=16, fontweight='bold')
+    save_figure(fig, target)
+
+
+def relative_performance(target, rolling_perf, symbol, benchmark_label='S&P 500'):
+    """Écart de performance roulant 3 mois, zones de sur/sous-performance"""
+    fig, ax = create_figure('wide')
+    rolling_perf = downsample_lines(rolling_perf, point_budget(ax))
+    ax.plot(rolling_perf.index, rolling_perf.values, linewidth=2, color='#1d4ed8')
+    ax.axhline(y=0, color='black', linestyle='--', alpha=0.5)
+    ax.fill_between(rolling_perf.index, rolling_perf.values, 0,
+                    where=(rolling_perf.values > 0), alpha=0.3, color='green', label='Sur-performance')
+    ax.fill_between(rolling_perf.index, rolling_perf.values, 0,
+                    where=(rolling_perf.values < 0), alpha=0.3, color='red', label='Sous-performance')
+
+    ax.set_title(f'Performance Relative Roulante 3M vs {benchmark_label} - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Écart de Performance (%)')
+    ax.set_xlabel('Date')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def rolling_sensitivity(target, beta, correlation, symbol):
+    """Bêta et corrélation roulants contre chaque benchmark"""
+    fig, (ax1, ax2) = create_figure('stacked')
+    beta = downsample_lines(beta, point_budget(ax1))
+    correlation = downsample_lines(correlation, point_budget(ax2))
+    for benchmark in beta.columns:
+        ax1.plot(beta.index, beta[benchmark], linewidth=1.5, label=benchmark)
+        ax2.plot(correlation.index, correlation[benchmark], linewidth=1.5, label=benchmark)
+
+    ax1.axhline(y=1, color='black', linestyle='--', alpha=0.5)
+    ax1.set_title(f'Bêta Roulant 6M - {symbol}', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Bêta')
+    ax1.legend(loc='upper left', fontsize=8, ncol=3)
+    ax1.grid(True, alpha=0.3)
+
+    ax2.set_title('Corrélation Roulante 6M', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Corrélation')
+    ax2.set_xlabel('Date')
+    ax2.set_ylim(-1, 1)
+    ax2.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def monte_carlo_fan(target, bands, current_price, symbol):
+    """Éventail des percentiles de prix simulés"""
+    fig, ax = create_figure('wide')
+    ax.fill_between(bands.index, bands[5], bands[95], alpha=0.2, color='#7c3aed', label='Intervalle 5%-95%')
+    ax.fill_between(bands.index, bands[25], bands[75], alpha=0.35, color='#7c3aed', label='Intervalle 25%-75%')
+    ax.plot(bands.index, bands[50], linewidth=2, color='#4c1d95', label='Médiane')
+    ax.axhline(y=current_price, color='black', linestyle='--', alpha=0.5)
+
+    ax.set_title(f'Projection Monte Carlo à 1 an - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Jours de bourse')
+    ax.set_ylabel('Prix ($)')
+    ax.legend(loc='upper left')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def efficient_frontier(target, frontier, assets, portfolios, symbol):
+    """
+    Frontière efficiente, actifs individuels et allocations optimisées
+
+    Args:
+        frontier: DataFrame avec colonnes volatility, return
+        assets: DataFrame indexé par actif avec colonnes volatility, return
+        portfolios: {libellé: (volatilité, rendement)}
+    """
+    fig, ax = create_figure('frontier')
+    ax.plot(frontier['volatility'] * 100, frontier['return'] * 100, linewidth=2, color='#7c3aed', label='Frontière efficiente')
+    ax.scatter(assets['volatility'] * 100, assets['return'] * 100, color='#9ca3af', s=30, alpha=0.8)
+    for asset, row in assets.iterrows():
+        ax.annotate(asset, (row['volatility'] * 100, row['return'] * 100), fontsize=8, xytext=(3, 3), textcoords='offset points')
+
+    ax.scatter(assets.loc[symbol, 'volatility'] * 100, assets.loc[symbol, 'return'] * 100,
+               color='#dc2626', s=120, marker='*', zorder=5, label=symbol)
+
+    for (label, (volatility, expected_return)), marker in zip(portfolios.items(), ['o', 's', 'D', '^', 'v']):
+        ax.scatter(volatility * 100, expected_return * 100, s=80, marker=marker, zorder=5, label=label)
+
+    ax.set_title(f'Frontière Efficiente - Univers {symbol} + ETFs', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Volatilité annualisée (%)')
+    ax.set_ylabel('Rendement attendu annualisé (%)')
+    ax.legend(loc='lower right')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def _date_numbers(index) -> np.ndarray:
+    """Abscisses matplotlib (jours) d'un index de dates"""
+    import matplotlib.dates as mdates
+
+    if isinstance(index, pd.DatetimeIndex):
+        return mdates.date2num(index.to_pydatetime())
+    return np.asarray(index, dtype=float)
+
+
+def _bar_collection(ax, index, bottom, top, width, colors, alpha=1.0):
+    """Barres verticales en un seul artiste PolyCollection (au lieu d'un Rectangle par barre)"""
+    from matplotlib.collections import PolyCollection
+
+    x = _date_numbers(index)
+    bottom = np.broadcast_to(np.asarray(bottom, dtype=float), x.shape)
+    top = np.asarray(top, dtype=float)
+    valid = np.isfinite(bottom) & np.isfinite(top)
+    x, bottom, top = x[valid], bottom[valid], top[valid]
+    colors = np.asarray(colors)[valid] if np.ndim(colors) else colors
+
+    left, right = x - width / 2, x + width / 2
+    verts = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                      np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+    ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors=colors, linewidths=0.5, alpha=alpha))
+    if isinstance(index, pd.DatetimeIndex):
+        ax.xaxis_date()
+    ax.autoscale_view()
+
+
+def _draw_candles(ax, ohlc, up_color='#00c853', down_color='#ff4444'):
+    """Chandeliers en deux artistes : mèches (LineCollection) et corps (PolyCollection)"""
+    from matplotlib.collections import LineCollection
+
+    ohlc = bucket_ohlc(ohlc, bar_budget(ax))
+    x = _date_numbers(ohlc.index)
+    colors = np.where((ohlc['Close'] >= ohlc['Open']).values, up_color, down_color)
+
+    wicks = np.stack([np.column_stack([x, ohlc['Low'].values]), np.column_stack([x, ohlc['High'].values])], axis=1)
+    ax.add_collection(LineCollection(wicks, colors=colors, linewidths=0.8))
+    _bar_collection(ax, ohlc.index, np.minimum(ohlc['Open'].values, ohlc['Close'].values),
+                    np.maximum(ohlc['Open'].values, ohlc['Close'].values), 0.75 * bar_width(ohlc.index), colors)
+
+
+def advanced_candlestick(target, data, symbol):
+    """Chandeliers avec Bollinger et moyennes mobiles, MACD, RSI et volumes"""
+    fig, (ax1, ax2, ax3, ax4) = create_figure('technical')
+
+    # Courbes d'indicateurs sous-échantillonnées à la largeur des axes
+    lines = downsample_lines(data[['BB_Upper', 'BB_Lower', 'SMA_20', 'SMA_50', 'MACD', 'MACD_signal',
+                                   'RSI', 'Volume_SMA']], point_budget(ax1))
+
+    # 1. Chandeliers avec Bollinger Bands
+    _draw_candles(ax1, data)
+    ax1.plot(lines.index, lines['BB_Upper'], color='#adccff', linewidth=1, label='BB Upper')
+    ax1.plot(lines.index, lines['BB_Lower'], color='#adccff', linewidth=1, label='BB Lower')
+    ax1.fill_between(lines.index, lines['BB_Lower'], lines['BB_Upper'], color='#adccff', alpha=0.1)
+    ax1.plot(lines.index, lines['SMA_20'], color='orange', linewidth=2, label='SMA 20')
+    ax1.plot(lines.index, lines['SMA_50'], color='blue', linewidth=2, label='SMA 50')
+    ax1.set_title(f'{symbol} - Analyse Technique Avancée', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Prix ($)')
+    ax1.legend(loc='upper left', fontsize=8)
+    ax1.grid(True, alpha=0.3)
+
+    # 2. MACD
+    ax2.plot(lines.index, lines['MACD'], color='blue', linewidth=2, label='MACD')
+    ax2.plot(lines.index, lines['MACD_signal'], color='red', linewidth=2, label='Signal')
+    # Histogramme : enveloppes positive et négative par paquets
+    positive = bucket_bars(data['MACD_histogram'].clip(lower=0), bar_budget(ax2), how='max')
+    negative = bucket_bars(data['MACD_histogram'].clip(upper=0), bar_budget(ax2), how='min')
+    width = bar_width(positive.index)
+    _bar_collection(ax2, positive.index, 0, positive.values, width, 'green', alpha=0.6)
+    _bar_collection(ax2, negative.index, 0, negative.values, width, 'red', alpha=0.6)
+    ax2.set_title('MACD')
+    ax2.legend(loc='upper left', fontsize=8)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. RSI
+    ax3.plot(lines.index, lines['RSI'], color='purple', linewidth=2)
+    ax3.axhline(y=70, color='red', linestyle='--', alpha=0.7)
+    ax3.axhline(y=30, color='green', linestyle='--', alpha=0.7)
+    ax3.axhline(y=50, color='gray', linestyle='--', alpha=0.5)
+    ax3.set_title('RSI')
+    ax3.set_ylim(0, 100)
+    ax3.grid(True, alpha=0.3)
+
+    # 4. Volume
+    buckets = bucket_ohlc(data[['Open', 'High', 'Low', 'Close']], bar_budget(ax4))
+    volume = bucket_bars(data['Volume'], bar_budget(ax4))
+    up = (buckets['Close'] >= buckets['Open']).values
+    _bar_collection(ax4, volume.index, 0, volume.values, bar_width(volume.index), np.where(up, 'green', 'red'), alpha=0.7)
+    ax4.plot(lines.index, lines['Volume_SMA'], color='orange', linewidth=2)
+    ax4.set_title('Volume')
+    ax4.set_xlabel('Date')
+    ax4.grid(True, alpha=0.3)
+
+    fig.suptitle(f'Analyse Technique Complète - {symbol}', fontsize=16, fontweight='bold')
+    save_figure(fig, target)
+
+
+def volatility_surface(target, volatilities, symbol):
+    """Surface 3D de la volatilité annualisée par fenêtre et dans le temps"""
+    fig, ax = create_figure('surface')
+    x, y = np.meshgrid(np.arange(len(volatilities.index)), np.asarray(volatilities.columns, dtype=float))
+
+    ax.plot_surface(x, y, volatilities.values.T * 100, cmap='viridis', linewidth=0, antialiased=False)
+    ax.set_title(f'Surface de Volatilité - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Temps')
+    ax.set_ylabel('Fenêtre (jours)')
+    ax.set_zlabel('Volatilité (%)')
+    ax.view_init(elev=30, azim=45)
+
+    save_figure(fig, target)
+
+
+def risk_return_scatter(target, profile, symbol):
+    """
+    Profil risque/rendement de l'actif et des benchmarks
+
+    Args:
+        profile: DataFrame indexé par symbole avec colonnes Annual_Return,
+            Annual_Volatility (en %), Sharpe_Ratio et Type ('Target' ou 'Benchmark')
+    """
+    fig, ax = create_figure('frontier')
+    colors = {'Target': '#dc2626', 'Benchmark': '#1d4ed8'}
+
+    for kind, group in profile.groupby('Type'):
+        sizes = 60 + 200 * group['Sharpe_Ratio'].clip(lower=0)
+        ax.scatter(group['Annual_Volatility'], group['Annual_Return'], s=sizes,
+                   color=colors.get(kind, '#6b7280'), alpha=0.7, label=kind)
+
+    for asset, row in profile.iterrows():
+        ax.annotate(asset, (row['Annual_Volatility'], row['Annual_Return']), fontsize=9,
+                    xytext=(0, 8), textcoords='offset points', ha='center')
+
+    ax.axhline(y=0, color='gray', linestyle='--', alpha=0.5)
+    ax.set_title(f'Profil Risque/Rendement - {symbol} vs Benchmarks', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Volatilité Annuelle (%)')
+    ax.set_ylabel('Rendement Annuel (%)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def fibonacci_retracement(target, ohlc, levels, symbol):
+    """Chandeliers et niveaux de retracement de Fibonacci ({libellé: prix})"""
+    fig, ax = create_figure('candles')
+    _draw_candles(ax, ohlc)
+
+    colors = ['red', 'orange', 'gold', 'green', 'blue', 'purple']
+    for i, (level, price) in enumerate(levels.items()):
+        color = colors[i % len(colors)]
+        ax.axhline(y=price, color=color, linestyle='--', linewidth=1)
+        ax.annotate(f"Fib {level}: ${price:.2f}", xy=(1, price), xycoords=('axes fraction', 'data'),
+                    xytext=(4, 0), textcoords='offset points', va='center', fontsize=8, color=color)
+
+    ax.set_title(f'Retracements de Fibonacci - {symbol}', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Prix ($)')
+    ax.set_xlabel('Date')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
+
+
+def ichimoku_cloud(target, ichimoku, symbol):
+    """Prix, lignes Tenkan/Kijun/Chikou et nuage Senkou A/B"""
+    fig, ax = create_figure('ichimoku')
+    ichimoku = downsample_lines(ichimoku, point_budget(ax))
+
+    ax.plot(ichimoku.index, ichimoku['Close'], color='black', linewidth=2, label='Prix')
+    ax.plot(ichimoku.index, ichimoku['Tenkan_sen'], color='red', linewidth=1, label='Tenkan-sen')
+    ax.plot(ichimoku.index, ichimoku['Kijun_sen'], color='blue', linewidth=1, label='Kijun-sen')
+    ax.plot(ichimoku.index, ichimoku['Senkou_span_A'], color='green', linewidth=1, label='Senkou Span A')
+    ax.plot(ichimoku.index, ichimoku['Senkou_span_B'], color='red', linewidth=1, alpha=0.6, label='Senkou Span B')
+    ax.fill_between(ichimoku.index, ichimoku['Senkou_span_A'], ichimoku['Senkou_span_B'], color='green', alpha=0.1)
+    ax.plot(ichimoku.index, ichimoku['Chikou_span'], color='purple', linewidth=1, label='Chikou Span')
+
+    ax.set_title(f"Nuage d'Ichimoku - {symbol}", fontsize=14, fontweight='bold')
+    ax.set_ylabel('Prix ($)')
+    ax.set_xlabel('Date')
+    ax.legend(loc='upper left')
+    ax.grid(True, alpha=0.3)
+
+    save_figure(fig, target)
@@ -8,53 +8,35 @@ Générateur de rapport DEEP_ANALYSIS - Analyse exhaustive et recherche quantita
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import yfinance as yf
 from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import Paragraph, Spacer, PageBreak, Table
 from report_base import BaseReportGenerator
+from market_data import market_data
+from report_styles import PARAGRAPH_STYLES, PURPLE, badge_style, data_table_style
+import chart_renderers
+from rolling_stats import trailing_volatility
+from risk_engine import RiskEngine, METHODS, build_returns_frame
+from scenario_engine import (FACTOR_LABELS, HISTORICAL_SCENARIOS,
+                             factor_returns, estimate_betas, evaluate_scenarios, simulate_price_paths)
+from portfolio_optimizer import DEFAULT_UNIVERSE, PortfolioOptimizer, risk_contributions
 
 class DeepAnalysisReportGenerator(BaseReportGenerator):
     """Générateur de rapports d'analyse exhaustive et recherche quantitative"""
     
-    def __init__(self, symbol, output_path):
-        super().__init__(symbol, output_path)
+    # Indices actions (tables de risque) et facteurs de marché (stress tests)
+    EQUITY_BENCHMARKS = ['^GSPC', '^DJI', '^IXIC', '^RUT']
+    MARKET_FACTORS = EQUITY_BENCHMARKS + ['^VIX', '^TNX']
+    
+    def __init__(self, symbol, output_path, config=None):
+        super().__init__(symbol, output_path, config)
         self.report_type = "DEEP_ANALYSIS"
         
     def add_analysis_type_badge(self):
         """Ajoute le badge de type d'analyse sur la page de garde"""
-        badge_style = ParagraphStyle(
-            'BadgeStyle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#7c3aed'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#7c3aed'),
-            borderPadding=15,
-            borderRadius=10
-        )
-        
         request_summary = f"Recherche quantitative exhaustive et modélisation avancée de {self.symbol}"
-        self.story.append(Paragraph(f"Type d'Analyse : DEEP_ANALYSIS", badge_style))
-        
-        summary_style = ParagraphStyle(
-            'SummaryStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#374151'),
-            alignment=TA_CENTER,
-            spaceAfter=40,
-            fontStyle='italic'
-        )
-        self.story.append(Paragraph(request_summary, summary_style))
+        self.story.append(Paragraph(f"Type d'Analyse : DEEP_ANALYSIS", badge_style(PURPLE)))
+        self.story.append(Paragraph(request_summary, PARAGRAPH_STYLES['SummaryStyle']))
     
     def generate_report(self):
         """Génère le rapport d'analyse exhaustive"""
@@ -64,21 +46,26 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         if not self.fetch_extended_data():
             return False
         
-        # Construction du rapport exhaustif (25-30 pages)
+        # Construction du rapport exhaustif (25-30 pages, sections selon la configuration)
         self.add_cover_page()
         self.add_table_of_contents()
         self.add_executive_summary()
         self.add_market_context()
         self.add_quantitative_foundation()
-        self.add_advanced_technical_analysis()
-        self.add_fundamental_deep_dive()
-        self.add_financial_modeling()
-        self.add_risk_analytics()
+        if self.wants_section('technicalAnalysis'):
+            self.add_advanced_technical_analysis()
+        if self.wants_section('fundamentalAnalysis'):
+            self.add_fundamental_deep_dive()
+            self.add_financial_modeling()
+        if self.wants_section('riskMetrics'):
+            self.add_risk_analytics()
         self.add_behavioral_analysis()
         self.add_macro_economic_analysis()
         self.add_competitive_landscape()
-        self.add_valuation_models()
-        self.add_scenario_analysis()
+        if self.wants_section('fundamentalAnalysis'):
+            self.add_valuation_models()
+        if self.wants_section('riskMetrics'):
+            self.add_scenario_analysis()
         self.add_portfolio_integration()
         self.add_implementation_strategy()
         self.add_monitoring_framework()
@@ -98,28 +85,33 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
             if not self.fetch_data():
                 return False
             
-            ticker = yf.Ticker(self.symbol)
-            
             # Données étendues sur 5 ans
-            self.data['history_5y'] = ticker.history(period="5y", interval="1d")
+            self.data['history_5y'] = market_data.history(self.symbol, "5y")
             
-            # Données financières trimestrielles
-            try:
-                self.data['quarterly_financials'] = ticker.quarterly_financials
-                self.data['quarterly_balance_sheet'] = ticker.quarterly_balance_sheet
-                self.data['quarterly_cashflow'] = ticker.quarterly_cashflow
-            except:
-                self.logger.warning("Données financières trimestrielles indisponibles")
+            # Données financières trimestrielles (seulement pour l'analyse fondamentale)
+            if self.wants_section('fundamentalAnalysis'):
+                try:
+                    self.data.update(market_data.statements(self.symbol, quarterly=True))
+                except:
+                    self.logger.warning("Données financières trimestrielles indisponibles")
             
             # Données de marché pour benchmark
             self.data['market_data'] = {}
-            benchmarks = ['^GSPC', '^DJI', '^IXIC', '^RUT', 'VIX']
-            for benchmark in benchmarks:
+            for benchmark in self.MARKET_FACTORS:
                 try:
-                    self.data['market_data'][benchmark] = yf.Ticker(benchmark).history(period="2y")
+                    self.data['market_data'][benchmark] = market_data.history(benchmark, "2y")
                 except:
                     continue
             
+            # Univers d'ETFs pour l'optimisation de portefeuille (cache quotidien, un seul
+            # téléchargement groupé, seulement si les métriques de risque sont demandées)
+            if self.wants_section('riskMetrics'):
+                try:
+                    universe = market_data.download(DEFAULT_UNIVERSE, "2y")
+                    self.data['portfolio_universe'] = pd.DataFrame({etf: hist['Close'] for etf, hist in universe.items()})
+                except Exception as e:
+                    self.logger.warning(f"Univers de portefeuille indisponible: {e}")
+            
             return True
             
         except Exception as e:
@@ -127,38 +119,9 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
             return False
     
     def add_table_of_contents(self):
-        """Ajoute une table des matières exhaustive"""
-        self.add_section_title("Table des Matières")
-        
-        toc_data = [
-            ["1.", "Résumé Exécutif", "3"],
-            ["2.", "Contexte de Marché", "4"],
-            ["3.", "Fondations Quantitatives", "6"],
-            ["4.", "Analyse Technique Avancée", "8"],
-            ["5.", "Analyse Fondamentale Approfondie", "11"],
-            ["6.", "Modélisation Financière", "14"],
-            ["7.", "Analytics de Risque", "17"],
-            ["8.", "Analyse Comportementale", "19"],
-            ["9.", "Analyse Macro-Économique", "21"],
-            ["10.", "Paysage Concurrentiel", "23"],
-            ["11.", "Modèles de Valorisation", "25"],
-            ["12.", "Analyse de Scénarios", "27"],
-            ["13.", "Intégration Portefeuille", "29"],
-            ["14.", "Stratégie d'Implémentation", "31"],
-            ["15.", "Framework de Monitoring", "33"]
-        ]
-        
-        toc_table = Table(toc_data, colWidths=[30, 350, 50])
-        toc_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        self.story.append(toc_table)
-        self.story.append(PageBreak())
+        """Ajoute une table des matières"""
+        self.story.append(Paragraph("Table des Matières", self.section_style))
+        self.add_contents(self.contents_table)
     
     def add_executive_summary(self):
         """Ajoute un résumé exécutif exhaustif"""
@@ -256,7 +219,12 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         volatility = returns.std() * np.sqrt(252)
         skewness = returns.skew()
         kurtosis = returns.kurtosis()
-        
+
+        # Structure par terme de la volatilité réalisée (une seule passe) ; historique trop court
+        # pour une fenêtre : repli sur la volatilité de tout l'échantillon, comme le pricer
+        vol_term = {window: vol if not np.isnan(vol) else volatility
+                    for window, vol in trailing_volatility(returns, (21, 63, 126, 252)).items()}
+
         # Tests de normalité et stationnarité
         jarque_bera_stat = f"Test requis"  # Simplified for demo
         adf_test = f"Test requis"  # Simplified for demo
@@ -268,7 +236,14 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         • **Volatilité Annualisée** : {volatility*100:.2f}%
         • **Asymétrie (Skewness)** : {skewness:.3f}
         • **Aplatissement (Kurtosis)** : {kurtosis:.3f}
-        
+
+        <b>Structure par Terme de la Volatilité</b>
+
+        • **Volatilité 1 mois (21j)** : {vol_term[21]*100:.2f}%
+        • **Volatilité 3 mois (63j)** : {vol_term[63]*100:.2f}%
+        • **Volatilité 6 mois (126j)** : {vol_term[126]*100:.2f}%
+        • **Volatilité 1 an (252j)** : {vol_term[252]*100:.2f}%
+
         <b>Tests Statistiques</b>
         
         • **Normalité des Rendements** : {jarque_bera_stat}
@@ -472,8 +447,81 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         """
         
         self.add_text(risk_text)
+        
+        self.add_subsection_title("7.1 VaR et Expected Shortfall")
+        self.create_risk_tables()
         self.story.append(PageBreak())
     
+    def create_risk_tables(self):
+        """Crée les tableaux VaR/ES (méthodes × horizons, puis comparaison avec les indices)"""
+        try:
+            hist = self.data.get('history_5y')
+            if hist is None or hist.empty:
+                return
+            
+            closes = {self.symbol: hist['Close']}
+            benchmark_histories = self.data.get('market_data', {})
+            for benchmark in self.EQUITY_BENCHMARKS:
+                bench_hist = benchmark_histories.get(benchmark)
+                if bench_hist is not None and not bench_hist.empty:
+                    closes[benchmark] = bench_hist['Close']
+            
+            engine = RiskEngine(build_returns_frame(closes), horizons=(1, 10))
+            summary = engine.summary()
+            
+            # Tableau 1 : toutes les méthodes pour l'actif analysé
+            stock = summary[summary['asset'] == self.symbol]
+            method_data = [['Méthode', 'Horizon', 'VaR 95%', 'ES 95%', 'VaR 99%', 'ES 99%']]
+            for method, label in METHODS.items():
+                for horizon in engine.horizons:
+                    rows = stock[(stock['method'] == method) & (stock['horizon'] == horizon)].set_index('confidence')
+                    method_data.append([
+                        label,
+                        f"{horizon}j",
+                        f"{rows.loc[0.95, 'var']*100:.2f}%",
+                        f"{rows.loc[0.95, 'es']*100:.2f}%",
+                        f"{rows.loc[0.99, 'var']*100:.2f}%",
+                        f"{rows.loc[0.99, 'es']*100:.2f}%"
+                    ])
+            
+            self.record_table('var_methods', method_data)
+            method_table = Table(method_data, colWidths=[140, 50, 60, 60, 60, 60])
+            method_table.setStyle(data_table_style('#7c3aed', '#faf5ff'))
+            
+            self.story.append(method_table)
+            self.story.append(Spacer(1, 20))
+            
+            # Tableau 2 : VaR/ES historiques 1 jour de tous les actifs
+            daily = summary[(summary['method'] == 'historical') & (summary['horizon'] == 1)]
+            daily = daily.set_index(['asset', 'confidence'])
+            asset_data = [['Actif', 'VaR 95%', 'ES 95%', 'VaR 99%', 'ES 99%']]
+            for asset in engine.assets:
+                asset_data.append([
+                    asset,
+                    f"{daily.loc[(asset, 0.95), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 0.95), 'es']*100:.2f}%",
+                    f"{daily.loc[(asset, 0.99), 'var']*100:.2f}%",
+                    f"{daily.loc[(asset, 0.99), 'es']*100:.2f}%"
+                ])
+            
+            self.record_table('asset_risk', asset_data)
+            asset_table = Table(asset_data, colWidths=[100, 70, 70, 70, 70])
+            asset_table.setStyle(data_table_style('#1d4ed8', '#eff6ff'))
+            
+            self.story.append(asset_table)
+            self.story.append(Spacer(1, 20))
+            
+            self.add_text("""
+            Les pertes sont exprimées en valeurs positives. La VaR Cornish-Fisher corrige 
+            l'approximation normale de l'asymétrie et de la kurtosis observées ; la simulation 
+            historique filtrée remet les chocs passés à l'échelle de la volatilité EWMA actuelle. 
+            À 10 jours, Cornish-Fisher suppose des rendements i.i.d. (volatilité en √h) tandis que 
+            la FHS compose des chocs filtrés en mettant à jour la volatilité EWMA à chaque jour simulé.
+            """)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur création tableaux de risque: {e}")
+    
     def add_behavioral_analysis(self):
         """Ajoute l'analyse comportementale"""
         self.add_section_title("8. Analyse Comportementale")
@@ -676,8 +724,93 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         """
         
         self.add_text(scenario_text)
+        
+        self.add_subsection_title("12.1 Stress Tests Factoriels")
+        self.create_stress_test_tables()
+        
+        if self.wants_chart('RISK_METRICS'):
+            self.add_subsection_title("12.2 Simulation Monte Carlo")
+            self.create_monte_carlo_fan_chart()
         self.story.append(PageBreak())
     
+    def create_stress_test_tables(self):
+        """Applique la bibliothèque de chocs à l'actif via ses bêtas factoriels"""
+        try:
+            hist = self.data.get('history_5y')
+            factors = factor_returns(self.data.get('market_data', {}))
+            if hist is None or hist.empty or factors.empty:
+                self.add_text("Données de marché insuffisantes pour les stress tests factoriels.")
+                return
+            
+            asset_returns = hist['Close'].pct_change().to_frame(self.symbol)
+            betas = estimate_betas(asset_returns, factors)
+            
+            # Exposition factorielle de l'actif
+            beta_data = [['Facteur', 'Bêta']]
+            for factor in factors.columns:
+                beta_data.append([FACTOR_LABELS.get(factor, factor), f"{betas.loc[factor, self.symbol]:.3f}"])
+            beta_data.append(['R² du modèle', f"{betas.loc['r2', self.symbol]:.2f}"])
+            
+            self.record_table('factor_betas', beta_data)
+            beta_table = Table(beta_data, colWidths=[200, 100])
+            beta_table.setStyle(data_table_style('#7c3aed', '#faf5ff'))
+            
+            self.story.append(beta_table)
+            self.story.append(Spacer(1, 20))
+            
+            # Tous les scénarios évalués en un seul produit matriciel
+            impacts = evaluate_scenarios(betas)[self.symbol]
+            current_price = hist['Close'].iloc[-1]
+            
+            scenario_data = [['Scénario', 'Type', 'Impact estimé', 'Prix implicite']]
+            for name, impact in impacts.items():
+                scenario_type = 'Historique' if name in HISTORICAL_SCENARIOS else 'Hypothétique'
+                scenario_data.append([name, scenario_type, f"{impact*100:+.1f}%", f"${current_price * (1 + impact):.2f}"])
+            
+            self.record_table('stress_scenarios', scenario_data)
+            scenario_table = Table(scenario_data, colWidths=[190, 80, 90, 90])
+            scenario_table.setStyle(data_table_style('#dc2626', '#fef2f2'))
+            scenario_table.setStyle([
+                ('ALIGN', (0, 1), (0, -1), 'LEFT')
+            ])
+            
+            self.story.append(scenario_table)
+            self.story.append(Spacer(1, 20))
+            
+            self.add_text("""
+            Les impacts sont obtenus en appliquant les chocs des facteurs de marché (indices, VIX, 
+            taux 10 ans) aux bêtas multi-factoriels estimés sur l'historique commun. Il s'agit d'une 
+            approximation linéaire : elle ignore les effets de second ordre et le risque spécifique.
+            """)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur stress tests factoriels: {e}")
+    
+    def create_monte_carlo_fan_chart(self):
+        """Crée le graphique en éventail des trajectoires de prix simulées"""
+        try:
+            hist = self.data.get('history_5y')
+            if hist is None or hist.empty:
+                return
+            
+            current_price = hist['Close'].iloc[-1]
+            bands = simulate_price_paths(hist['Close'].pct_change(), current_price)
+            
+            self.render_chart('monte_carlo_fan', chart_renderers.monte_carlo_fan,
+                              bands=bands, current_price=current_price, symbol=self.symbol)
+            
+            horizon = bands.iloc[-1]
+            self.add_text(f"""
+            <b>Distribution à 1 an (5 000 trajectoires, bootstrap des rendements historiques)</b>
+            
+            • Scénario défavorable (5e percentile) : ${horizon[5]:.2f} ({(horizon[5]/current_price - 1)*100:+.1f}%)
+            • Scénario central (médiane) : ${horizon[50]:.2f} ({(horizon[50]/current_price - 1)*100:+.1f}%)
+            • Scénario favorable (95e percentile) : ${horizon[95]:.2f} ({(horizon[95]/current_price - 1)*100:+.1f}%)
+            """)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur simulation Monte Carlo: {e}")
+    
     def add_portfolio_integration(self):
         """Ajoute l'analyse d'intégration portfolio"""
         self.add_section_title("13. Intégration Portefeuille")
@@ -715,8 +848,120 @@ class DeepAnalysisReportGenerator(BaseReportGenerator):
         """
         
         self.add_text(portfolio_text)
+        
+        if self.wants_section('riskMetrics'):
+            self.add_subsection_title("13.1 Allocations Optimisées")
+            self.create_portfolio_optimization()
         self.story.append(PageBreak())
     
+    def get_portfolio_optimizer(self):
+        """Construit l'optimiseur sur l'actif et l'univers d'ETFs (dates communes)"""
+        universe = self.data.get('portfolio_universe')
+        hist = self.data.get('history_5y')
+        if universe is None or universe.empty or hist is None or hist.empty:
+            return None
+        
+        close = hist['Close'].copy()
+        close.index = close.index.tz_localize(None).normalize()
+        prices = universe.copy()
+        prices.index = pd.DatetimeIndex(prices.index).tz_localize(None).normalize()
+        prices[self.symbol] = close
+        
+        returns = prices.pct_change(fill_method=None).iloc[1:]
+        return PortfolioOptimizer(returns, self.symbol)
+    
+    def create_portfolio_optimization(self):
+        """Tables d'allocation, frontière efficiente et contribution au risque de l'actif"""
+        try:
+            optimizer = self.get_portfolio_optimizer()
+            if optimizer is None:
+                self.add_text("Données de l'univers de référence insuffisantes pour l'optimisation.")
+                return
+            
+            allocations = optimizer.allocations()
+            
+            # Poids et part du risque par allocation (actifs triés par poids en parité de risque)
+            allocation_data = [['Actif', 'Var. min.', 'Moy.-var.', 'Parité risque', 'Contrib. risque (PR)']]
+            rp_contributions = risk_contributions(allocations['risk_parity'].values, optimizer.cov)['percent']
+            order = np.argsort(-allocations['risk_parity'].values)
+            for i in order:
+                asset = optimizer.assets[i]
+                row = allocations.iloc[i]
+                allocation_data.append([
+                    asset,
+                    f"{row['min_variance']*100:.1f}%",
+                    f"{row['mean_variance']*100:.1f}%",
+                    f"{row['risk_parity']*100:.1f}%",
+                    f"{rp_contributions[i]*100:.1f}%"
+                ])
+            
+            # Statistiques de chaque portefeuille
+            stats_row = ['Volatilité']
+            return_row = ['Rendement att.']
+            for method in ['min_variance', 'mean_variance', 'risk_parity']:
+                weights = allocations[method].values
+                stats_row.append(f"{np.sqrt(weights @ optimizer.cov @ weights)*100:.1f}%")
+                return_row.append(f"{optimizer.mean @ weights*100:.1f}%")
+            allocation_data.append(stats_row + [''])
+            allocation_data.append(return_row + [''])
+            
+            symbol_row = order.tolist().index(optimizer.index) + 1
+            self.record_table('allocations', allocation_data)
+            allocation_table = Table(allocation_data, colWidths=[80, 75, 75, 85, 110])
+            allocation_table.setStyle(data_table_style('#7c3aed', '#faf5ff', 8))
+            allocation_table.setStyle([
+                ('BACKGROUND', (0, symbol_row), (-1, symbol_row), colors.HexColor('#ede9fe')),
+                ('FONTNAME', (0, symbol_row), (-1, symbol_row), 'Helvetica-Bold'),
+                ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+                ('BACKGROUND', (0, -2), (-1, -1), colors.HexColor('#f3f4f6'))
+            ])
+            
+            self.story.append(allocation_table)
+            self.story.append(Spacer(1, 20))
+            
+            if self.wants_chart('RISK_METRICS'):
+                self.create_efficient_frontier_chart(optimizer, allocations)
+            
+            impact = optimizer.marginal_impact()
+            self.add_text(f"""
+            <b>Contribution marginale au risque de {self.symbol}</b>
+            
+            • Volatilité du portefeuille de variance minimale sans {self.symbol} : {impact['volatility_before']*100:.2f}%
+            • Volatilité après ajout de {impact['allocation']*100:.0f}% de {self.symbol} : {impact['volatility_after']*100:.2f}%
+            • Contribution marginale (∂σ/∂w) : {impact['marginal_contribution']*100:.2f}% par unité de poids
+            • Part du risque total portée par {self.symbol} : {impact['risk_share']*100:.1f}%
+            
+            Covariance estimée sur {len(optimizer.returns)} séances avec rétrécissement de Ledoit-Wolf 
+            (intensité {optimizer.shrinkage:.2f}), rendements attendus rétrécis vers la moyenne de l'univers. 
+            Allocations long-only pleinement investies.
+            """)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur optimisation portefeuille: {e}")
+    
+    def create_efficient_frontier_chart(self, optimizer, allocations):
+        """Crée le graphique de la frontière efficiente avec les allocations et les actifs"""
+        try:
+            frontier = optimizer.frontier()
+            assets = pd.DataFrame({
+                'volatility': np.sqrt(np.diag(optimizer.cov)),
+                'return': optimizer.mean
+            }, index=optimizer.assets)
+            
+            labels = {'min_variance': 'Variance minimale', 'mean_variance': 'Moyenne-variance',
+                      'risk_parity': 'Parité de risque'}
+            portfolios = {}
+            for method, label in labels.items():
+                weights = allocations[method].values
+                portfolios[label] = (float(np.sqrt(weights @ optimizer.cov @ weights)), float(optimizer.mean @ weights))
+            
+            self.render_chart('efficient_frontier', chart_renderers.efficient_frontier,
+                              frontier=frontier[['volatility', 'return']], assets=assets,
+                              portfolios=portfolios, symbol=self.symbol)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur graphique frontière efficiente: {e}")
+    
     def add_implementation_strategy(self):
         """Ajoute la stratégie d'implémentation"""
         self.add_section_title("14. Stratégie d'Implémentation")
@@ -8,53 +8,24 @@ Générateur de rapport DETAILED - Analyse technique et fondamentale approfondie
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import yfinance as yf
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import Paragraph, Spacer, PageBreak
 from report_base import BaseReportGenerator
+from report_styles import PARAGRAPH_STYLES, GREEN, badge_style
+import chart_renderers
 
 class DetailedReportGenerator(BaseReportGenerator):
     """Générateur de rapports d'analyse détaillée"""
     
-    def __init__(self, symbol, output_path):
-        super().__init__(symbol, output_path)
+    def __init__(self, symbol, output_path, config=None):
+        super().__init__(symbol, output_path, config)
         self.report_type = "DETAILED"
         
     def add_analysis_type_badge(self):
         """Ajoute le badge de type d'analyse sur la page de garde"""
-        badge_style = ParagraphStyle(
-            'BadgeStyle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#059669'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#059669'),
-            borderPadding=15,
-            borderRadius=10
-        )
-        
         request_summary = f"Analyse technique et fondamentale complète de {self.symbol}"
-        self.story.append(Paragraph(f"Type d'Analyse : DETAILED", badge_style))
-        
-        summary_style = ParagraphStyle(
-            'SummaryStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#374151'),
-            alignment=TA_CENTER,
-            spaceAfter=40,
-            fontStyle='italic'
-        )
-        self.story.append(Paragraph(request_summary, summary_style))
+        self.story.append(Paragraph(f"Type d'Analyse : DETAILED", badge_style(GREEN)))
+        self.story.append(Paragraph(request_summary, PARAGRAPH_STYLES['SummaryStyle']))
     
     def generate_report(self):
         """Génère le rapport détaillé complet"""
@@ -64,17 +35,21 @@ class DetailedReportGenerator(BaseReportGenerator):
         if not self.fetch_data():
             return False
         
-        # Construction du rapport
+        # Construction du rapport (sections selon la configuration)
         self.add_cover_page()
         self.add_table_of_contents()
         self.add_executive_summary()
-        self.add_fundamental_analysis()
-        self.add_technical_analysis()
+        if self.wants_section('fundamentalAnalysis'):
+            self.add_fundamental_analysis()
+        if self.wants_section('technicalAnalysis'):
+            self.add_technical_analysis()
         self.add_quantitative_metrics()
-        self.add_risk_analysis()
+        if self.wants_section('riskMetrics'):
+            self.add_risk_analysis()
         self.add_sector_comparison()
-        self.add_valuation_analysis()
-        self.add_dividend_analysis()
+        if self.wants_section('fundamentalAnalysis'):
+            self.add_valuation_analysis()
+            self.add_dividend_analysis()
         self.add_insider_activity()
         self.add_analyst_consensus()
         self.add_final_recommendations()
@@ -87,33 +62,8 @@ class DetailedReportGenerator(BaseReportGenerator):
     
     def add_table_of_contents(self):
         """Ajoute une table des matières"""
-        self.add_section_title("Table des Matières")
-        
-        toc_data = [
-            ["1.", "Résumé Exécutif", "3"],
-            ["2.", "Analyse Fondamentale", "4"],
-            ["3.", "Analyse Technique", "8"],
-            ["4.", "Métriques Quantitatives", "12"],
-            ["5.", "Analyse des Risques", "15"],
-            ["6.", "Comparaison Sectorielle", "18"],
-            ["7.", "Analyse de Valorisation", "21"],
-            ["8.", "Analyse des Dividendes", "24"],
-            ["9.", "Activité des Initiés", "26"],
-            ["10.", "Consensus Analystes", "28"],
-            ["11.", "Recommandations Finales", "30"]
-        ]
-        
-        toc_table = Table(toc_data, colWidths=[30, 350, 50])
-        toc_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        self.story.append(toc_table)
-        self.story.append(PageBreak())
+        self.story.append(Paragraph("Table des Matières", self.section_style))
+        self.add_contents(self.contents_table)
     
     def add_executive_summary(self):
         """Ajoute le résumé exécutif"""
@@ -307,7 +257,8 @@ class DetailedReportGenerator(BaseReportGenerator):
         self.add_text(technical_text)
         
         # Créer le graphique des moyennes mobiles
-        self.create_moving_averages_chart(hist)
+        if self.wants_chart('TECHNICAL_INDICATORS'):
+            self.create_moving_averages_chart(hist)
         
         self.add_subsection_title("3.2 Indicateurs de Momentum")
         
@@ -692,27 +643,8 @@ class DetailedReportGenerator(BaseReportGenerator):
     def create_moving_averages_chart(self, hist):
         """Crée un graphique des moyennes mobiles"""
         try:
-            plt.style.use('seaborn-v0_8')
-            fig, ax = plt.subplots(figsize=(12, 8))
-            
-            # Graphique des prix et moyennes mobiles
-            ax.plot(hist.index[-100:], hist['Close'][-100:], label='Prix', linewidth=2, color='#1f77b4')
-            ax.plot(hist.index[-100:], hist['MA20'][-100:], label='MA20', linewidth=1.5, color='#ff7f0e', alpha=0.8)
-            ax.plot(hist.index[-100:], hist['MA50'][-100:], label='MA50', linewidth=1.5, color='#2ca02c', alpha=0.8)
-            ax.plot(hist.index[-100:], hist['MA200'][-100:], label='MA200', linewidth=1.5, color='#d62728', alpha=0.8)
-            
-            ax.set_title(f'Analyse Technique - {self.symbol}', fontsize=16, fontweight='bold', pad=20)
-            ax.set_xlabel('Date', fontsize=12)
-            ax.set_ylabel('Prix ($)', fontsize=12)
-            ax.legend(loc='upper left')
-            ax.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            chart_path = self.charts_dir / f"technical_analysis_{self.symbol}.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            self.add_chart(str(chart_path))
+            self.render_chart(f"technical_analysis_{self.symbol}", chart_renderers.technical_analysis,
+                              prices=hist[['Close', 'MA20', 'MA50', 'MA200']].iloc[-100:], symbol=self.symbol)
             
         except Exception as e:
             self.logger.error(f"Erreur création graphique technique: {e}")
\ No newline at end of file
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sous-échantillonnage des séries pour les graphiques FinAnalytics
+LTTB (Largest-Triangle-Three-Buckets) pour les courbes, agrégation min/max par paquets
+pour les barres et chandeliers, le nombre de points étant borné par la largeur en pixels
+des axes : le coût du rendu ne croît plus avec la longueur de l'historique
+"""
+
+import numpy as np
+import pandas as pd
+
+# Résolution d'affichage visée (le graphique est réduit à ~7 pouces dans le rapport)
+DISPLAY_DPI = 100
+
+# Largeur minimale d'une barre, en pixels
+MIN_BAR_PIXELS = 2
+
+
+def point_budget(ax, dpi: int = DISPLAY_DPI) -> int:
+    """Nombre de pixels horizontaux des axes à la résolution d'affichage"""
+    width_inches = ax.figure.get_figwidth() * ax.get_position().width
+    return max(int(width_inches * dpi), 3)
+
+
+def lttb_indices(y, threshold: int, x=None) -> np.ndarray:
+    """
+    Indices des points retenus par LTTB
+
+    Conserve le premier et le dernier point, puis dans chaque paquet le point formant
+    le plus grand triangle avec le point retenu précédent et la moyenne du paquet suivant.
+    Le paquet contenant le minimum ou le maximum global retient ce point (plus haut et plus
+    bas de la période toujours visibles) ; s'ils tombent dans le même paquet, les deux sont
+    gardés (threshold + 1 points).
+
+    Args:
+        y: Valeurs (finies)
+        threshold: Nombre de points à conserver
+        x: Abscisses numériques (positions régulières par défaut)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    # threshold - 2 paquets couvrant les points 1..n-2 ; le dernier « paquet suivant » est le point final
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    edges = np.append(edges, n)
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    # Extrema globaux : remplacent le point retenu de leur paquet
+    extrema = sorted({int(np.argmin(y)), int(np.argmax(y))} - {0, n - 1})
+    buckets = np.searchsorted(edges, extrema, side='right') - 1
+    if len(extrema) == 2 and buckets[0] == buckets[1]:
+        selected[buckets[0] + 1] = extrema[0]
+        return np.insert(selected, buckets[0] + 2, extrema[1])
+    for index, bucket in zip(extrema, buckets):
+        selected[bucket + 1] = index
+    return selected
+
+
+def downsample_lines(data, threshold: int):
+    """
+    Sous-échantillonne une Series ou un DataFrame de courbes par LTTB
+
+    Pour un DataFrame, l'union des points retenus pour chaque colonne est conservée
+    (au plus threshold points par colonne) ; les NaN sont ignorés colonne par colonne.
+    """
+    if len(data) <= threshold:
+        return data
+
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    positions = np.arange(len(frame))
+    keep = []
+    for column in frame.columns:
+        values = frame[column].values.astype(float)
+        finite = np.isfinite(values)
+        if finite.any():
+            keep.append(positions[finite][lttb_indices(values[finite], threshold)])
+
+    if not keep:
+        return data
+    return data.iloc[np.unique(np.concatenate(keep))]
+
+
+def _bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """Positions de début des paquets contigus (tailles égales à une unité près)"""
+    return np.unique(np.linspace(0, n, n_buckets + 1).astype(int)[:-1])
+
+
+def bucket_bars(series: pd.Series, n_buckets: int, how: str = 'max') -> pd.Series:
+    """
+    Agrège une série de barres par paquets contigus (indexés par leur première date)
+
+    'max' conserve l'enveloppe visuelle des barres denses, 'min' l'enveloppe basse,
+    'sum' conserve les totaux.
+    """
+    if len(series) <= n_buckets:
+        return series
+
+    starts = _bucket_starts(len(series), n_buckets)
+    values = series.values.astype(float)
+    if how == 'sum':
+        aggregated = np.add.reduceat(np.nan_to_num(values), starts)
+    else:
+        aggregated = (np.fmax if how == 'max' else np.fmin).reduceat(values, starts)
+    return pd.Series(aggregated, index=series.index[starts], name=series.name)
+
+
+def bucket_ohlc(ohlc: pd.DataFrame, n_buckets: int) -> pd.DataFrame:
+    """Agrège des chandeliers par paquets : ouverture du premier, extrêmes, clôture du dernier"""
+    if len(ohlc) <= n_buckets:
+        return ohlc
+
+    n = len(ohlc)
+    starts = _bucket_starts(n, n_buckets)
+    ends = np.append(starts[1:], n) - 1
+
+    result = pd.DataFrame({
+        'Open': ohlc['Open'].values[starts],
+        'High': np.fmax.reduceat(ohlc['High'].values.astype(float), starts),
+        'Low': np.fmin.reduceat(ohlc['Low'].values.astype(float), starts),
+        'Close': ohlc['Close'].values[ends]
+    }, index=ohlc.index[starts])
+    if 'Volume' in ohlc.columns:
+        result['Volume'] = np.add.reduceat(np.nan_to_num(ohlc['Volume'].values.astype(float)), starts)
+    return result
+
+
+def bar_budget(ax) -> int:
+    """Nombre maximal de barres lisibles sur la largeur des axes"""
+    return max(point_budget(ax) // MIN_BAR_PIXELS, 1)
+
+
+def bar_width(index) -> float:
+    """Largeur de barre (en jours, unité des dates matplotlib) adaptée à l'espacement des points"""
+    if isinstance(index, pd.DatetimeIndex) and len(index) > 1:
+        spacing = pd.Series(index).diff().median() / pd.Timedelta(days=1)
+        return 0.8 * max(spacing, 1.0)
+    return 0.8
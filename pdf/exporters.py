@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Exports de données des rapports FinAnalytics
+Un jeu de données unique (informations, métriques calculées, tableaux du rapport et
+historique brut) est construit après la génération et écrit en une passe dans tous les
+formats demandés (CSV, JSON, Excel, Parquet), sans nouvelle récupération ni nouveau calcul
+"""
+
+import os
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from report_output import open_output
+
+# Moteurs Excel et Parquet de pandas (optionnels)
+try:
+    import openpyxl
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+try:
+    import pyarrow
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Extension de fichier de chaque format, à côté du PDF
+EXPORT_EXTENSIONS = {
+    'CSV': '.csv',
+    'JSON': '.json',
+    'EXCEL': '.xlsx',
+    'PARQUET': '.parquet'
+}
+
+# Champs de Ticker.info repris dans les exports
+INFO_FIELDS = ('longName', 'currentPrice', 'marketCap', 'sector', 'industry', 'country', 'currency')
+
+# Ratios de valorisation et de rentabilité de Ticker.info repris dans les métriques
+VALUATION_FIELDS = {
+    'trailingPE': 'pe_ratio',
+    'forwardPE': 'forward_pe',
+    'pegRatio': 'peg_ratio',
+    'priceToBook': 'price_to_book',
+    'enterpriseToEbitda': 'ev_to_ebitda',
+    'returnOnEquity': 'return_on_equity',
+    'returnOnAssets': 'return_on_assets',
+    'profitMargins': 'profit_margin',
+    'debtToEquity': 'debt_to_equity',
+    'dividendYield': 'dividend_yield'
+}
+
+# Horizons de performance (jours de bourse)
+RETURN_HORIZONS = {'1m': 21, '3m': 63, '6m': 126, '1y': 252}
+
+# Lignes d'historique sérialisées à la fois (CSV et JSON)
+STREAM_CHUNK_ROWS = 5000
+
+
+def _clean(value):
+    """Valeur sérialisable : types numpy convertis, NaN/inf remplacés par None"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def price_metrics(history: Optional[pd.DataFrame]) -> dict:
+    """
+    Métriques de prix calculées sur l'historique du rapport
+
+    Returns:
+        dict: dernier cours, performances par horizon, volatilité annualisée et perte maximale
+    """
+    if history is None or history.empty or 'Close' not in history:
+        return {}
+
+    close = history['Close'].dropna()
+    if close.empty:
+        return {}
+    log_returns = np.log(close).diff().dropna()
+
+    metrics = {
+        'start_date': close.index[0].strftime('%Y-%m-%d'),
+        'end_date': close.index[-1].strftime('%Y-%m-%d'),
+        'observations': int(len(close)),
+        'last_close': float(close.iloc[-1]),
+    }
+    for label, days in RETURN_HORIZONS.items():
+        metrics[f'return_{label}'] = float(close.iloc[-1] / close.iloc[-days - 1] - 1) if len(close) > days else None
+    metrics['annualized_volatility'] = float(log_returns.std() * np.sqrt(252)) if len(log_returns) > 1 else None
+    metrics['max_drawdown'] = float((close / close.cummax() - 1).min())
+    return {name: _clean(value) for name, value in metrics.items()}
+
+
+def valuation_metrics(info: dict) -> dict:
+    """Ratios de valorisation disponibles dans Ticker.info"""
+    return {name: _clean(info[field]) for field, name in VALUATION_FIELDS.items() if info.get(field) is not None}
+
+
+def _daily_returns(history: pd.DataFrame) -> pd.Series:
+    close = history['Close'].dropna()
+    return pd.Series(np.log(close.values), index=close.index.date).diff()
+
+
+def relative_metrics(history: Optional[pd.DataFrame], benchmark: Optional[pd.DataFrame]) -> dict:
+    """Bêta et corrélation des rendements journaliers face à un indice de référence"""
+    if history is None or benchmark is None or history.empty or benchmark.empty:
+        return {}
+
+    # Alignement par date de séance (les fuseaux de cotation peuvent différer)
+    returns = pd.concat([_daily_returns(history), _daily_returns(benchmark)], axis=1, join='inner').dropna()
+    if len(returns) < 20:
+        return {}
+    asset, market = returns.iloc[:, 0].values, returns.iloc[:, 1].values
+    covariance = np.cov(asset, market)
+    return {
+        'beta': _clean(covariance[0, 1] / covariance[1, 1]),
+        'correlation': _clean(covariance[0, 1] / np.sqrt(covariance[0, 0] * covariance[1, 1]))
+    }
+
+
+def _naive_index(frame: pd.DataFrame) -> pd.DataFrame:
+    """Index de dates sans fuseau (Excel ne gère pas les dates avec fuseau horaire)"""
+    if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is not None:
+        frame = frame.copy()
+        frame.index = frame.index.tz_localize(None)
+    return frame
+
+
+class ReportDataset:
+    """Données d'un rapport généré, partagées par tous les formats d'export"""
+
+    def __init__(self, symbol: str, report_type: str, info: dict, metrics: dict,
+                 tables: Dict[str, list], history: Optional[pd.DataFrame] = None):
+        self.symbol = symbol
+        self.report_type = report_type
+        self.generated_at = datetime.now().isoformat(timespec='seconds')
+        self.info = {field: _clean(info[field]) for field in INFO_FIELDS if field in info}
+        self.metrics = metrics
+        self.tables = {name: pd.DataFrame(rows[1:], columns=rows[0]) for name, rows in tables.items() if rows}
+        self.history = _naive_index(history).rename_axis('Date') if history is not None else None
+
+    @classmethod
+    def from_generator(cls, generator, report_type: str, include_raw_data: bool = False) -> 'ReportDataset':
+        """Jeu de données d'un générateur après generate_report (aucune donnée n'est recalculée)"""
+        history = generator.data.get('history')
+        info = generator.data.get('info', {}) or {}
+        return cls(generator.symbol, report_type, info,
+                   {**price_metrics(history), **valuation_metrics(info)}, generator.tables,
+                   history if include_raw_data else None)
+
+    def summary(self) -> dict:
+        """Partie structurée du jeu de données (tout sauf l'historique brut)"""
+        return {
+            'symbol': self.symbol,
+            'reportType': self.report_type,
+            'generatedAt': self.generated_at,
+            'info': self.info,
+            'metrics': self.metrics,
+            'tables': {name: [{column: _clean(value) for column, value in row.items()}
+                              for row in frame.to_dict('records')]
+                       for name, frame in self.tables.items()}
+        }
+
+    def metrics_frame(self) -> pd.DataFrame:
+        """Informations et métriques en deux colonnes (indicateur, valeur)"""
+        values = {**self.info, **self.metrics}
+        return pd.DataFrame({'metric': list(values), 'value': list(values.values())})
+
+    def primary_frame(self) -> pd.DataFrame:
+        """Table des formats tabulaires mono-table (CSV, Parquet) : historique brut si demandé, sinon métriques"""
+        return self.history.reset_index() if self.history is not None else self.metrics_frame()
+
+
+def _chunks(frame: pd.DataFrame) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), STREAM_CHUNK_ROWS):
+        yield frame.iloc[start:start + STREAM_CHUNK_ROWS]
+
+
+def write_csv(dataset: ReportDataset, stream):
+    """CSV écrit par blocs : l'historique complet n'est jamais converti en une seule chaîne"""
+    frame = dataset.primary_frame()
+    for index, chunk in enumerate(_chunks(frame)):
+        stream.write(chunk.to_csv(index=False, header=index == 0, date_format='%Y-%m-%d').encode('utf-8'))
+
+
+def write_json(dataset: ReportDataset, stream):
+    """JSON : résumé structuré puis historique brut sérialisé par blocs"""
+    head = json.dumps(dataset.summary(), ensure_ascii=False)
+    if dataset.history is None:
+        stream.write(head.encode('utf-8'))
+        return
+
+    stream.write(head[:-1].encode('utf-8') + b', "history": [')
+    separator = b''
+    for chunk in _chunks(dataset.history.reset_index()):
+        records = chunk.to_json(orient='records', date_format='iso')[1:-1]
+        if records:
+            stream.write(separator + records.encode('utf-8'))
+            separator = b','
+    stream.write(b']}')
+
+
+def _sheet_name(name: str) -> str:
+    """Nom de feuille Excel valide (31 caractères, sans []:*?/\\)"""
+    return ''.join(c for c in name if c not in '[]:*?/\\')[:31]
+
+
+def write_excel(dataset: ReportDataset, stream):
+    """Classeur Excel : résumé, un onglet par tableau du rapport et historique brut"""
+    with pd.ExcelWriter(stream, engine='openpyxl') as writer:
+        dataset.metrics_frame().to_excel(writer, sheet_name='Résumé', index=False)
+        for name, frame in dataset.tables.items():
+            frame.to_excel(writer, sheet_name=_sheet_name(name), index=False)
+        if dataset.history is not None:
+            dataset.history.to_excel(writer, sheet_name='Historique')
+
+
+def write_parquet(dataset: ReportDataset, stream):
+    """Parquet (colonnes typées) de la table principale"""
+    frame = dataset.primary_frame()
+    # Colonnes mixtes (métriques texte et numériques) : Parquet exige un type par colonne
+    mixed = frame.select_dtypes('object').columns
+    frame.astype({column: 'string' for column in mixed}).to_parquet(stream, index=False)
+
+
+# Écrivain, disponibilité et dépendance de chaque format
+WRITERS = {
+    'CSV': (write_csv, True, None),
+    'JSON': (write_json, True, None),
+    'EXCEL': (write_excel, EXCEL_AVAILABLE, 'openpyxl'),
+    'PARQUET': (write_parquet, PARQUET_AVAILABLE, 'pyarrow ou fastparquet')
+}
+
+
+def export_paths(pdf_path: str, formats: Iterable[str]) -> Dict[str, str]:
+    """Chemins des exports d'un rapport : même nom que le PDF, extension du format"""
+    stem = os.path.splitext(pdf_path)[0]
+    return {fmt: stem + EXPORT_EXTENSIONS[fmt] for fmt in formats if fmt in EXPORT_EXTENSIONS}
+
+
+def export_dataset(dataset: ReportDataset, paths: Dict[str, str]) -> Dict[str, str]:
+    """
+    Écrit le jeu de données dans chaque format demandé
+
+    Chaque fichier est écrit dans un fichier temporaire puis renommé ; un format en échec
+    ou dont la dépendance est absente est ignoré sans bloquer les autres.
+
+    Args:
+        dataset: Jeu de données du rapport
+        paths: Chemin de sortie par format (export_paths)
+
+    Returns:
+        dict: Chemins effectivement écrits, par format
+    """
+    written = {}
+    for fmt, path in paths.items():
+        writer, available, dependency = WRITERS[fmt]
+        if not available:
+            logger.warning(f"⚠️ Export {fmt} ignoré: dépendance manquante ({dependency})")
+            continue
+        try:
+            with open_output(path) as output:
+                # Excel et Parquet repositionnent le fichier : ils écrivent sur le fichier temporaire lui-même
+                writer(dataset, output.stream if fmt in ('EXCEL', 'PARQUET') else output)
+            written[fmt] = path
+            logger.info(f"📦 Export {fmt} généré: {path}")
+        except Exception as e:
+            logger.error(f"❌ Erreur export {fmt}: {e}")
+    return written
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Post-traitement des graphiques raster FinAnalytics
+Rééchantillonnage à la taille d'affichage pour une résolution d'impression donnée,
+puis encodage PNG en palette (aplats, texte) ou JPEG (dégradés) avant intégration au PDF
+"""
+
+import io
+from typing import Tuple
+
+from PIL import Image as PILImage
+
+# Résolution d'impression des images intégrées (le rendu matplotlib se fait à CHART_DPI)
+PRINT_DPI = 200
+JPEG_QUALITY = 85
+PALETTE_COLORS = 256
+
+POINTS_PER_INCH = 72
+
+
+def fitted_size(pixel_width: int, pixel_height: int, width: float, height: float) -> Tuple[float, float]:
+    """Taille d'affichage (points) d'une image inscrite dans la boîte width × height, proportions conservées"""
+    scale = min(width / pixel_width, height / pixel_height)
+    return pixel_width * scale, pixel_height * scale
+
+
+def optimize_raster(data: bytes, width: float, height: float, dpi: int = PRINT_DPI,
+                    encoding: str = 'png') -> bytes:
+    """
+    Réduit une image à sa taille d'affichage et la ré-encode
+
+    Aucune mémoïsation ici : les rendus optimisés sont conservés par chart_cache (sur disque),
+    un cache mémoire garderait des images brutes pendant toute la vie d'un worker.
+
+    Args:
+        data: Image source (PNG matplotlib)
+        width, height: Boîte d'affichage dans le PDF (points)
+        dpi: Résolution d'impression visée
+        encoding: 'png' (palette adaptative) ou 'jpeg'
+
+    Returns:
+        bytes: Image encodée, jamais plus grande que la source en pixels
+    """
+    with PILImage.open(io.BytesIO(data)) as source:
+        image = source.convert('RGB')
+
+    display_width, display_height = fitted_size(image.width, image.height, width, height)
+    target = (max(1, round(display_width / POINTS_PER_INCH * dpi)),
+              max(1, round(display_height / POINTS_PER_INCH * dpi)))
+    if target[0] < image.width:
+        image = image.resize(target, PILImage.LANCZOS)
+
+    output = io.BytesIO()
+    if encoding == 'jpeg':
+        image.save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    else:
+        # Graphiques en aplats : une palette adaptative préserve les couleurs et compresse mieux
+        image = image.quantize(colors=PALETTE_COLORS, method=PILImage.Quantize.MEDIANCUT,
+                               dither=PILImage.Dither.NONE)
+        image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
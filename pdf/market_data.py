@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache quotidien des données de marché FinAnalytics
+Informations (Ticker.info), historiques et états financiers yfinance conservés en mémoire et
+sur disque dans data/YYYY-MM-DD/ : un symbole n'est téléchargé qu'une fois par jour, les appels
+suivants (rapports, métriques JSON) lisent le cache. yfinance n'est importé qu'au premier
+téléchargement : les générateurs s'importent sans lui
+"""
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: Path, write):
+    """Écrit via un fichier temporaire renommé : un autre processus ne lit jamais un fichier partiel"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _ticker(symbol: str):
+    """Ticker yfinance ; yfinance n'est importé qu'au premier téléchargement (cache froid)"""
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+
+def _download(symbols, period: str) -> pd.DataFrame:
+    """Téléchargement groupé yfinance (un seul appel pour tous les symboles manquants)"""
+    import yfinance as yf
+    # ignore_tz=False : mêmes index avec fuseau que Ticker.history (fichiers de cache partagés)
+    return yf.download(list(symbols), period=period, interval="1d", auto_adjust=True, ignore_tz=False,
+                       group_by='ticker', progress=False)
+
+
+def _save_history(history: pd.DataFrame, f):
+    """CSV de l'historique ; le fuseau de cotation est conservé dans l'en-tête de la colonne de dates"""
+    zone = history.index.tz
+    history.to_csv(f, index_label=f"Date {zone}" if zone is not None else "Date")
+
+
+def _load_history(path: Path) -> pd.DataFrame:
+    history = pd.read_csv(path, index_col=0)
+    _, _, zone = history.index.name.partition(' ')
+    index = pd.to_datetime(history.index, utc=bool(zone))
+    history.index = (index.tz_convert(zone) if zone else index).rename('Date')
+    return history
+
+
+# États financiers du Ticker yfinance (annuels, préfixés quarterly_ pour les trimestriels)
+STATEMENTS = ('financials', 'balance_sheet', 'cashflow')
+
+
+def _load_statement(path: Path) -> pd.DataFrame:
+    """État financier (postes en lignes, dates de clôture en colonnes)"""
+    statement = pd.read_csv(path, index_col=0)
+    statement.columns = pd.to_datetime(statement.columns)
+    return statement
+
+
+# Entrées gardées en mémoire (infos, historiques, états) ; au-delà, les plus anciennes sont relues sur disque
+MAX_MEMORY_ENTRIES = 256
+
+# Ancré sur pdf/ : le worker et l'API ne lancent pas forcément python depuis ce répertoire
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+class MarketDataCache:
+    """
+    Cache quotidien (mémoire + disque dans data/YYYY-MM-DD/) des informations et historiques
+
+    La mémoire ne garde que les entrées du jour (vidée au changement de date), au plus
+    MAX_MEMORY_ENTRIES : le worker et les processus du daemon vivent plusieurs jours.
+    """
+
+    def __init__(self, base_dir=DATA_DIR):
+        self.base_dir = Path(base_dir)
+        self._memory = {}
+        self._day = None
+
+    def _day_dir(self) -> Path:
+        day = datetime.now().strftime("%Y-%m-%d")
+        if day != self._day:
+            self._memory.clear()
+            self._day = day
+        return self.base_dir / day
+
+    def _remember(self, path: Path, value):
+        self._memory[path] = value
+        while len(self._memory) > MAX_MEMORY_ENTRIES:
+            self._memory.pop(next(iter(self._memory)), None)
+
+    def info(self, symbol: str) -> dict:
+        """Ticker.info du jour (même fichier que le scraping du daemon)"""
+        path = self._day_dir() / f"{symbol}_info.json"
+        info = self._memory.get(path)
+        if info is not None:
+            return dict(info)
+
+        if path.exists():
+            try:
+                with open(path, encoding='utf-8') as f:
+                    info = json.load(f)
+            except Exception as e:
+                logger.warning(f"Cache d'informations illisible {path}: {e}")
+
+        if info is None:
+            info = _ticker(symbol).info or {}
+            if info:
+                try:
+                    _write_atomic(path, lambda f: json.dump(info, f, indent=2, default=str))
+                except Exception as e:
+                    logger.warning(f"Impossible d'écrire le cache d'informations {path}: {e}")
+
+        self._remember(path, info)
+        return dict(info)
+
+    def _history_path(self, symbol: str, period: str) -> Path:
+        return self._day_dir() / f"{symbol}_history_{period}.csv"
+
+    def _cached_history(self, path: Path) -> Optional[pd.DataFrame]:
+        """Historique en mémoire ou sur disque (None si absent ou illisible)"""
+        history = self._memory.get(path)
+        if history is not None:
+            return history
+        if path.exists():
+            try:
+                history = _load_history(path)
+                self._remember(path, history)
+                return history
+            except Exception as e:
+                logger.warning(f"Cache d'historique illisible {path}: {e}")
+        return None
+
+    def _store_history(self, path: Path, history: pd.DataFrame):
+        if not history.empty:
+            try:
+                _write_atomic(path, lambda f: _save_history(history, f))
+            except Exception as e:
+                logger.warning(f"Impossible d'écrire le cache d'historique {path}: {e}")
+        self._remember(path, history)
+
+    def history(self, symbol: str, period: str = "2y") -> pd.DataFrame:
+        """Historique journalier du jour sur la période demandée (copie : les générateurs y ajoutent des colonnes)"""
+        path = self._history_path(symbol, period)
+        history = self._cached_history(path)
+        if history is None:
+            history = _ticker(symbol).history(period=period, interval="1d")
+            self._store_history(path, history)
+        return history.copy()
+
+    def statements(self, symbol: str, quarterly: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        États financiers du jour : compte de résultat, bilan, flux de trésorerie
+
+        Returns:
+            dict: {'financials' | 'balance_sheet' | 'cashflow' (préfixés quarterly_ si trimestriels): état}
+        """
+        names = [f"quarterly_{name}" if quarterly else name for name in STATEMENTS]
+        statements, ticker = {}, None
+        for name in names:
+            path = self._day_dir() / f"{symbol}_{name}.csv"
+            statement = self._memory.get(path)
+            if statement is None and path.exists():
+                try:
+                    statement = _load_statement(path)
+                except Exception as e:
+                    logger.warning(f"Cache d'état financier illisible {path}: {e}")
+            if statement is None:
+                ticker = ticker or _ticker(symbol)
+                statement = getattr(ticker, name)
+                if statement is None:
+                    statement = pd.DataFrame()
+                if not statement.empty:
+                    try:
+                        _write_atomic(path, lambda f: statement.to_csv(f))
+                    except Exception as e:
+                        logger.warning(f"Impossible d'écrire le cache d'état financier {path}: {e}")
+            self._remember(path, statement)
+            statements[name] = statement.copy()
+        return statements
+
+    def option_chain(self, symbol: str) -> dict:
+        """
+        Chaîne d'options de la première échéance, non mise en cache (cotations intrajournalières)
+
+        Returns:
+            dict: {'options_dates': échéances, 'expiry_date': première échéance ou None,
+                   'calls': DataFrame, 'puts': DataFrame}
+        """
+        ticker = _ticker(symbol)
+        dates = ticker.options
+        if not dates:
+            return {'options_dates': dates, 'expiry_date': None,
+                    'calls': pd.DataFrame(), 'puts': pd.DataFrame()}
+        chain = ticker.option_chain(dates[0])
+        return {'options_dates': dates, 'expiry_date': dates[0], 'calls': chain.calls, 'puts': chain.puts}
+
+    def download(self, symbols: Iterable[str], period: str = "2y") -> Dict[str, pd.DataFrame]:
+        """
+        Historiques de plusieurs symboles (mêmes fichiers de cache que history)
+
+        Les symboles absents du cache du jour sont téléchargés en un seul appel groupé.
+
+        Returns:
+            dict: {symbole: historique}, symboles sans données omis
+        """
+        symbols = list(dict.fromkeys(symbols))
+        histories, missing = {}, []
+        for symbol in symbols:
+            history = self._cached_history(self._history_path(symbol, period))
+            if history is None:
+                missing.append(symbol)
+            else:
+                histories[symbol] = history
+
+        if missing:
+            frame = _download(missing, period)
+            for symbol in missing:
+                if isinstance(frame.columns, pd.MultiIndex):
+                    if symbol not in frame.columns.get_level_values(0):
+                        continue
+                    history = frame[symbol]
+                else:
+                    history = frame
+                history = history.dropna(how='all')
+                history.columns.name = None
+                self._store_history(self._history_path(symbol, period), history)
+                histories[symbol] = history
+
+        return {symbol: histories[symbol].copy() for symbol in symbols
+                if symbol in histories and not histories[symbol].empty}
+
+
+market_data = MarketDataCache()
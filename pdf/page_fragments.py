@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fragments statiques pré-rendus des rapports FinAnalytics
+Les contenus identiques d'un rapport à l'autre (avertissements, page finale, textes
+pédagogiques) sont mis en page une seule fois par version de gabarit, enregistrés en PDF
+dans le cache partagé, puis recopiés tels quels dans chaque rapport (form XObjects)
+"""
+
+import io
+import json
+from typing import Callable, List, Optional, Tuple
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, PageBreak
+
+from chart_cache import chart_cache, chart_key
+from section_layout import SectionDocTemplate, page_geometry
+from vector_charts import VECTOR_AVAILABLE
+
+if VECTOR_AVAILABLE:
+    from pdfrw import PdfReader
+    from pdfrw.buildxobj import pagexobj
+    from pdfrw.toreportlab import makerl
+
+# À incrémenter à chaque modification d'un texte ou d'un style statique
+FRAGMENT_VERSION = 2
+
+
+def fragment_key(name: str, geometry: tuple) -> str:
+    """Empreinte d'un fragment : nom, version du gabarit et géométrie de mise en page"""
+    return chart_key(f"fragment:{name}", {}, style=f"v{FRAGMENT_VERSION}", size=geometry)
+
+
+def load_pages(data: bytes, forms: Optional[dict] = None) -> Tuple:
+    """Form XObjects de toutes les pages d'un fragment (un seul objet par fragment dans forms, propre au document)"""
+    if forms is not None and data in forms:
+        return forms[data]
+    pages = tuple(pagexobj(page) for page in PdfReader(fdata=data).pages)
+    if forms is not None:
+        forms[data] = pages
+    return pages
+
+
+def render_pages(story: List[Flowable], geometry: tuple) -> Tuple[bytes, list]:
+    """
+    Met en page un story statique sur des pages complètes au format du rapport
+
+    Returns:
+        tuple: (PDF, [(titre de section, page du fragment)]) pour la table des matières
+    """
+    buffer = io.BytesIO()
+    doc = SectionDocTemplate(buffer, geometry)
+    doc.build(story)
+    return buffer.getvalue(), doc.toc_entries
+
+
+def render_block(story: List[Flowable], width: float) -> bytes:
+    """
+    Met en page un bloc statique sur une page unique ajustée à son contenu
+
+    Les flowables sont empilés comme dans un cadre Platypus ; l'espacement après le
+    dernier flowable fait partie du bloc.
+    """
+    heights = [flowable.wrap(width, 1e6)[1] for flowable in story]
+    gaps = [max(previous.getSpaceAfter(), following.getSpaceBefore())
+            for previous, following in zip(story, story[1:])] + [story[-1].getSpaceAfter()]
+    total = sum(heights) + sum(gaps)
+
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, pagesize=(width, total))
+    y = total
+    for flowable, height, gap in zip(story, heights, gaps):
+        y -= height
+        flowable.drawOn(canvas, 0, y)
+        y -= gap
+    canvas.showPage()
+    canvas.save()
+    return buffer.getvalue()
+
+
+def cached_fragment(name: str, geometry: tuple, render: Callable[[], bytes]) -> bytes:
+    """PDF d'un fragment depuis le cache partagé, rendu au premier usage de la version courante"""
+    key = fragment_key(name, geometry)
+    data = chart_cache.get(key, '.pdf')
+    if data is None:
+        data = render()
+        chart_cache.put(key, data, '.pdf')
+    return data
+
+
+class _FormFlowable(Flowable):
+    """Dessine un form XObject pré-rendu"""
+
+    def __init__(self, xobj):
+        super().__init__()
+        self.xobj = xobj
+        x0, y0, x1, y1 = (float(v) for v in xobj.BBox)
+        self.form_width = x1 - x0
+        self.form_height = y1 - y0
+
+    def _draw_form(self):
+        name = makerl(self.canv, self.xobj)
+        self.canv.doForm(name)
+
+
+class FragmentPage(_FormFlowable):
+    """Page complète pré-rendue : occupe tout le cadre et se dessine à l'origine de la page"""
+
+    def __init__(self, xobj, toc_titles=()):
+        super().__init__(xobj)
+        # Titres de section de la page, relevés au rendu du fragment
+        self.toc_titles = list(toc_titles)
+
+    def wrap(self, available_width, available_height):
+        return available_width, available_height
+
+    def draw(self):
+        # Le fragment a été mis en page avec les mêmes marges : on annule la position dans le cadre
+        x, y = self.canv.absolutePosition(0, 0)
+        self.canv.saveState()
+        self.canv.translate(-x, -y)
+        self._draw_form()
+        self.canv.restoreState()
+
+
+class FragmentBlock(_FormFlowable):
+    """Bloc pré-rendu de hauteur fixe, placé dans le flux comme un paragraphe"""
+
+    def wrap(self, available_width, available_height):
+        return self.form_width, self.form_height
+
+    def draw(self):
+        self._draw_form()
+
+
+def static_pages(name: str, doc, build: Callable[[], List[Flowable]], forms: Optional[dict] = None) -> List[Flowable]:
+    """
+    Pages statiques d'un rapport, pré-rendues une fois par version de gabarit
+
+    Args:
+        name: Identifiant du fragment (clé du cache)
+        doc: Document cible (format et marges)
+        build: Construit le story statique (appelé seulement au premier rendu)
+        forms: Form XObjects déjà chargés du document (load_pages)
+
+    Returns:
+        list: Flowables à insérer dans le story, à partir d'un début de page ;
+        le story d'origine si pdfrw est indisponible
+    """
+    if not VECTOR_AVAILABLE:
+        return build()
+
+    geometry = page_geometry(doc)
+    key = fragment_key(name, geometry)
+    data, index = chart_cache.get(key, '.pdf'), chart_cache.get(key, '.json')
+    if data is None or index is None:
+        data, entries = render_pages(build(), geometry)
+        index = json.dumps(entries).encode()
+        chart_cache.put(key, data, '.pdf')
+        chart_cache.put(key, index, '.json')
+    entries = json.loads(index)
+
+    flowables = []
+    for number, xobj in enumerate(load_pages(data, forms), 1):
+        if number > 1:
+            flowables.append(PageBreak())
+        flowables.append(FragmentPage(xobj, [title for title, page in entries if page == number]))
+    return flowables
+
+
+def static_block(name: str, doc, build: Callable[[], List[Flowable]], forms: Optional[dict] = None) -> List[Flowable]:
+    """
+    Bloc statique à l'intérieur d'une page (ex. avertissement de la page de garde)
+
+    Returns:
+        list: Un FragmentBlock à la largeur du cadre ; le story d'origine si pdfrw est indisponible
+    """
+    if not VECTOR_AVAILABLE:
+        return build()
+
+    # Largeur utile du cadre de SimpleDocTemplate (marges et rembourrage de 6 points)
+    width = doc.width - 12
+    (xobj,) = load_pages(cached_fragment(name, (width,), lambda: render_block(build(), width)), forms)
+    return [FragmentBlock(xobj)]
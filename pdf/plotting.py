@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Couche de tracé FinAnalytics
+Figures matplotlib explicites (Figure + canevas Agg) sans état global pyplot :
+chaque rendu possède sa figure, ce qui permet des rendus concurrents dans un même processus
+"""
+
+import os
+import numpy as np
+
+CHART_DPI = 300
+
+# Gabarits de figures réutilisables : taille et grille d'axes
+FIGURE_TEMPLATES = {
+    'bars': {'figsize': (10, 6)},
+    'wide': {'figsize': (12, 6)},
+    'tall': {'figsize': (12, 8)},
+    'frontier': {'figsize': (12, 7)},
+    'large': {'figsize': (14, 10)},
+    'square': {'figsize': (10, 8)},
+    'price_volume': {'figsize': (12, 10), 'nrows': 2, 'gridspec_kw': {'height_ratios': [3, 1]}},
+    'stacked': {'figsize': (12, 8), 'nrows': 2, 'sharex': True},
+    'triple': {'figsize': (15, 5), 'ncols': 3},
+    'technical': {'figsize': (14, 12), 'nrows': 4, 'sharex': True,
+                  'gridspec_kw': {'height_ratios': [0.5, 0.2, 0.15, 0.15]}},
+    'candles': {'figsize': (12, 8)},
+    'ichimoku': {'figsize': (14, 8)},
+    'surface': {'figsize': (10, 8), 'subplot_kw': {'projection': '3d'}}
+}
+
+# Styles appliqués explicitement aux axes (aucune modification de rcParams)
+STYLES = {
+    'default': {},
+    'seaborn': {
+        'facecolor': '#EAEAF2',
+        'grid_color': 'white',
+        'grid_linewidth': 1.0,
+        'spines': False,
+        'tick_length': 0,
+        'text_color': '.15'
+    }
+}
+
+
+def load_matplotlib():
+    """Importe matplotlib avant de forker des processus de rendu, qui en héritent au lieu de l'importer chacun"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def apply_style(ax, style: str = 'default'):
+    """Applique un style prédéfini à des axes"""
+    params = STYLES[style]
+    if not params:
+        return
+
+    ax.set_facecolor(params['facecolor'])
+    ax.set_axisbelow(True)
+    ax.grid(True, color=params['grid_color'], linewidth=params['grid_linewidth'])
+    for spine in ax.spines.values():
+        spine.set_visible(params['spines'])
+    ax.tick_params(length=params['tick_length'], colors=params['text_color'])
+
+
+def create_figure(template: str = 'wide', style: str = 'default', **overrides):
+    """
+    Crée une figure autonome (canevas Agg) d'après un gabarit
+
+    Returns:
+        tuple: (figure, axes) — axes est un tableau si le gabarit définit plusieurs axes
+    """
+    # matplotlib importé au premier rendu : un rapport dont les graphiques sont en cache s'en passe
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    layout = {**FIGURE_TEMPLATES[template], **overrides}
+    figsize = layout.pop('figsize')
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(**layout)
+
+    for ax in np.atleast_1d(axes).flat:
+        apply_style(ax, style)
+    return fig, axes
+
+
+def save_figure(fig, target, dpi: int = CHART_DPI):
+    """Enregistre la figure (chemin ou tampon ; format du tampon via son attribut format)"""
+    # Pour un chemin, le format est déduit de l'extension (str possède aussi un attribut format)
+    fmt = None if isinstance(target, (str, os.PathLike)) else getattr(target, 'format', None)
+    fig.tight_layout()
+    fig.savefig(target, format=fmt, dpi=dpi, bbox_inches='tight')
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optimiseur de portefeuille FinAnalytics
+Covariance à rétrécissement (Ledoit-Wolf) mise en cache par jour, allocations
+variance minimale / moyenne-variance / parité de risque et contributions au risque
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from market_data import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+RETURN_SHRINKAGE = 0.5  # Poids de la moyenne transversale dans l'estimation des rendements
+
+# ETFs de référence pour l'intégration en portefeuille
+DEFAULT_UNIVERSE = [
+    'SPY', 'QQQ', 'IWM', 'EFA', 'EEM', 'AGG', 'TLT', 'LQD',
+    'GLD', 'VNQ', 'XLK', 'XLF', 'XLV', 'XLE', 'XLI', 'XLP'
+]
+
+
+def ledoit_wolf_covariance(returns: np.ndarray):
+    """
+    Covariance rétrécie vers une cible scalaire (Ledoit & Wolf, 2004)
+
+    Returns:
+        tuple: (covariance, intensité de rétrécissement)
+    """
+    n_obs, n_assets = returns.shape
+    centered = returns - returns.mean(axis=0)
+    sample = centered.T @ centered / n_obs
+
+    mu = np.trace(sample) / n_assets
+    target = mu * np.eye(n_assets)
+    delta = ((sample - target) ** 2).sum()
+
+    # Variance de l'estimateur empirique : (1/T²) Σ ||x x' - S||²
+    squared_norms = (centered ** 2).sum(axis=1)
+    beta = ((squared_norms ** 2).sum() / n_obs - (sample ** 2).sum()) / n_obs
+    shrinkage = min(beta, delta) / delta if delta > 0 else 1.0
+
+    return shrinkage * target + (1 - shrinkage) * sample, shrinkage
+
+
+class CovarianceCache:
+    """Cache quotidien des covariances (mémoire + disque dans data/YYYY-MM-DD/)"""
+
+    def __init__(self, base_dir=DATA_DIR):
+        self.base_dir = Path(base_dir)
+        self._memory = {}
+
+    def _key(self, returns: pd.DataFrame) -> str:
+        """Actifs et fenêtre de rendements (longueur, première et dernière date) : une autre fenêtre le même jour a sa propre entrée"""
+        window = [str(len(returns))]
+        if len(returns):
+            window += [str(returns.index[0]), str(returns.index[-1])]
+        return hashlib.sha1('|'.join(list(returns.columns) + window).encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, key: str) -> Path:
+        today = datetime.now().strftime("%Y-%m-%d")
+        return self.base_dir / today / f"covariance_{key}.npz"
+
+    def _write(self, path: Path, **arrays):
+        """Écrit via un fichier temporaire renommé : un autre worker ne lit jamais un .npz partiel"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get_or_compute(self, returns: pd.DataFrame):
+        """Renvoie (moyennes annualisées, covariance annualisée, rétrécissement) pour ces actifs"""
+        returns = returns.dropna()
+        assets = list(returns.columns)
+        key = self._key(returns)
+        path = self._path(key)
+
+        if (key, path) in self._memory:
+            return self._memory[(key, path)]
+
+        if path.exists():
+            try:
+                cached = np.load(path, allow_pickle=False)
+                if list(cached['assets']) == assets:
+                    result = (cached['mean'], cached['cov'], float(cached['shrinkage']))
+                    self._memory[(key, path)] = result
+                    return result
+            except Exception as e:
+                logger.warning(f"Cache de covariance illisible {path}: {e}")
+
+        values = returns.values
+        cov, shrinkage = ledoit_wolf_covariance(values)
+        result = (values.mean(axis=0) * TRADING_DAYS, cov * TRADING_DAYS, shrinkage)
+
+        try:
+            self._write(path, assets=np.array(assets), mean=result[0], cov=result[1], shrinkage=shrinkage)
+        except Exception as e:
+            logger.warning(f"Impossible d'écrire le cache de covariance {path}: {e}")
+
+        self._memory[(key, path)] = result
+        return result
+
+
+covariance_cache = CovarianceCache()
+
+
+def project_simplex(v: np.ndarray) -> np.ndarray:
+    """Projection euclidienne sur {w >= 0, Σw = 1} (tri, O(n log n))"""
+    u = np.sort(v)[::-1]
+    cumulative = np.cumsum(u) - 1
+    rho = np.nonzero(u - cumulative / np.arange(1, len(v) + 1) > 0)[0][-1]
+    theta = cumulative[rho] / (rho + 1)
+    return np.maximum(v - theta, 0)
+
+
+def solve_simplex_qp(q: np.ndarray, c: Optional[np.ndarray] = None, x0: Optional[np.ndarray] = None,
+                     max_iter: int = 5000, tol: float = 1e-10) -> np.ndarray:
+    """
+    min ½ w'Qw - c'w  sous w >= 0, Σw = 1
+
+    Gradient projeté accéléré (FISTA), pas 1/L avec L = plus grande valeur propre de Q.
+    Chaque itération coûte un produit matrice-vecteur : adapté à 50-100 actifs.
+    """
+    n = len(q)
+    c = np.zeros(n) if c is None else c
+    step = 1.0 / max(np.linalg.eigvalsh(q)[-1], 1e-12)
+
+    w = project_simplex(x0) if x0 is not None else np.full(n, 1.0 / n)
+    y, t = w.copy(), 1.0
+    for _ in range(max_iter):
+        w_next = project_simplex(y - step * (q @ y - c))
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + (t - 1) / t_next * (w_next - w)
+        if np.abs(w_next - w).max() < tol:
+            w = w_next
+            break
+        w, t = w_next, t_next
+    return w
+
+
+def min_variance_weights(cov: np.ndarray) -> np.ndarray:
+    """Portefeuille de variance minimale (long-only)"""
+    return solve_simplex_qp(cov)
+
+
+def mean_variance_weights(mean: np.ndarray, cov: np.ndarray, risk_aversion: float = 5.0,
+                          x0: Optional[np.ndarray] = None) -> np.ndarray:
+    """max μ'w - (λ/2) w'Σw (long-only, pleinement investi)"""
+    return solve_simplex_qp(risk_aversion * cov, mean, x0=x0)
+
+
+def risk_parity_weights(cov: np.ndarray, budgets: Optional[np.ndarray] = None,
+                        max_iter: int = 500, tol: float = 1e-10) -> np.ndarray:
+    """
+    Parité de risque par descente de coordonnées cyclique
+    (min ½ w'Σw - Σ b_i log w_i, solution analytique par coordonnée)
+    """
+    n = len(cov)
+    budgets = np.full(n, 1.0 / n) if budgets is None else budgets / budgets.sum()
+    diag = np.diag(cov)
+
+    w = 1.0 / np.sqrt(diag)
+    w /= w.sum()
+    sigma_w = cov @ w
+    for _ in range(max_iter):
+        previous = w.copy()
+        for i in range(n):
+            c = sigma_w[i] - diag[i] * w[i]
+            new_wi = (-c + np.sqrt(c * c + 4 * diag[i] * budgets[i])) / (2 * diag[i])
+            sigma_w += cov[:, i] * (new_wi - w[i])
+            w[i] = new_wi
+        if np.abs(w / w.sum() - previous / previous.sum()).max() < tol:
+            break
+    return w / w.sum()
+
+
+def efficient_frontier(mean: np.ndarray, cov: np.ndarray, n_points: int = 20) -> pd.DataFrame:
+    """Frontière efficiente long-only par balayage de l'aversion au risque (démarrage à chaud)"""
+    points = []
+    weights = None
+    for risk_aversion in np.logspace(2, -1, n_points):
+        weights = mean_variance_weights(mean, cov, risk_aversion, x0=weights)
+        points.append({
+            'risk_aversion': risk_aversion,
+            'return': float(mean @ weights),
+            'volatility': float(np.sqrt(weights @ cov @ weights))
+        })
+    return pd.DataFrame(points)
+
+
+def risk_contributions(weights: np.ndarray, cov: np.ndarray) -> Dict[str, np.ndarray]:
+    """Contributions marginales (∂σ/∂w) et totales au risque du portefeuille"""
+    sigma_w = cov @ weights
+    volatility = np.sqrt(weights @ sigma_w)
+    marginal = sigma_w / volatility
+    contribution = weights * marginal
+    return {
+        'volatility': volatility,
+        'marginal': marginal,
+        'contribution': contribution,
+        'percent': contribution / volatility
+    }
+
+
+class PortfolioOptimizer:
+    """Allocations et analyse d'intégration d'un actif dans un univers de référence"""
+
+    def __init__(self, returns: pd.DataFrame, symbol: str, cache: Optional[CovarianceCache] = covariance_cache):
+        self.symbol = symbol
+        self.returns = returns.dropna(axis=1, thresh=int(len(returns) * 0.8)).dropna()
+        self.assets = list(self.returns.columns)
+        if symbol not in self.assets:
+            raise ValueError(f"Historique insuffisant pour {symbol} dans l'univers")
+
+        if cache is not None:
+            mean, self.cov, self.shrinkage = cache.get_or_compute(self.returns)
+        else:
+            cov, self.shrinkage = ledoit_wolf_covariance(self.returns.values)
+            mean, self.cov = self.returns.values.mean(axis=0) * TRADING_DAYS, cov * TRADING_DAYS
+
+        # Rendements attendus rétrécis vers la moyenne transversale (estimation bruitée)
+        self.mean = (1 - RETURN_SHRINKAGE) * mean + RETURN_SHRINKAGE * mean.mean()
+        self.index = self.assets.index(symbol)
+
+    def allocations(self, risk_aversion: float = 5.0) -> pd.DataFrame:
+        """Poids des trois allocations (actifs × méthodes)"""
+        return pd.DataFrame({
+            'min_variance': min_variance_weights(self.cov),
+            'mean_variance': mean_variance_weights(self.mean, self.cov, risk_aversion),
+            'risk_parity': risk_parity_weights(self.cov)
+        }, index=self.assets)
+
+    def frontier(self, n_points: int = 20) -> pd.DataFrame:
+        return efficient_frontier(self.mean, self.cov, n_points)
+
+    def marginal_impact(self, allocation: float = 0.05) -> Dict[str, float]:
+        """
+        Effet de l'ajout de l'actif au portefeuille de variance minimale des autres actifs
+
+        Returns:
+            dict: Volatilités avant/après, contribution marginale et part du risque de l'actif
+        """
+        others = [i for i in range(len(self.assets)) if i != self.index]
+        base = np.zeros(len(self.assets))
+        base[others] = min_variance_weights(self.cov[np.ix_(others, others)])
+
+        blended = base * (1 - allocation)
+        blended[self.index] = allocation
+
+        before = risk_contributions(base, self.cov)
+        after = risk_contributions(blended, self.cov)
+        return {
+            'allocation': allocation,
+            'volatility_before': float(before['volatility']),
+            'volatility_after': float(after['volatility']),
+            'marginal_contribution': float(before['marginal'][self.index]),
+            'risk_share': float(after['percent'][self.index])
+        }
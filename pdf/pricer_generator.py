@@ -8,53 +8,25 @@ Générateur de rapport PRICER - Évaluation et pricing d'options
 import os
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
-import yfinance as yf
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import Paragraph, Spacer, PageBreak
 from report_base import BaseReportGenerator
+from market_data import market_data
+from report_styles import PARAGRAPH_STYLES, RED, badge_style
+from rolling_stats import trailing_volatility
 
 class PricerReportGenerator(BaseReportGenerator):
     """Générateur de rapports de pricing et évaluation d'options"""
     
-    def __init__(self, symbol, output_path):
-        super().__init__(symbol, output_path)
+    def __init__(self, symbol, output_path, config=None):
+        super().__init__(symbol, output_path, config)
         self.report_type = "PRICER"
         
     def add_analysis_type_badge(self):
         """Ajoute le badge de type d'analyse sur la page de garde"""
-        badge_style = ParagraphStyle(
-            'BadgeStyle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            textColor=colors.white,
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold',
-            backColor=colors.HexColor('#dc2626'),
-            borderWidth=2,
-            borderColor=colors.HexColor('#dc2626'),
-            borderPadding=15,
-            borderRadius=10
-        )
-        
         request_summary = f"Évaluation et pricing d'options sur {self.symbol}"
-        self.story.append(Paragraph(f"Type d'Analyse : PRICER", badge_style))
-        
-        summary_style = ParagraphStyle(
-            'SummaryStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#374151'),
-            alignment=TA_CENTER,
-            spaceAfter=40,
-            fontStyle='italic'
-        )
-        self.story.append(Paragraph(request_summary, summary_style))
+        self.story.append(Paragraph(f"Type d'Analyse : PRICER", badge_style(RED)))
+        self.story.append(Paragraph(request_summary, PARAGRAPH_STYLES['SummaryStyle']))
     
     def generate_report(self):
         """Génère le rapport de pricing"""
@@ -73,7 +45,8 @@ class PricerReportGenerator(BaseReportGenerator):
         self.add_options_pricing_models()
         self.add_greeks_analysis()
         self.add_strategy_recommendations()
-        self.add_risk_scenarios()
+        if self.wants_section('riskMetrics'):
+            self.add_risk_scenarios()
         self.add_market_making_insights()
         self.add_final_page()
         
@@ -91,21 +64,9 @@ class PricerReportGenerator(BaseReportGenerator):
             if not self.fetch_data():
                 return False
             
-            ticker = yf.Ticker(self.symbol)
-            
-            # Données d'options
+            # Données d'options (première date d'expiration disponible)
             try:
-                self.data['options_dates'] = ticker.options
-                if self.data['options_dates']:
-                    # Prendre la première date d'expiration disponible
-                    first_expiry = self.data['options_dates'][0]
-                    options_chain = ticker.option_chain(first_expiry)
-                    self.data['calls'] = options_chain.calls
-                    self.data['puts'] = options_chain.puts
-                    self.data['expiry_date'] = first_expiry
-                else:
-                    self.data['calls'] = pd.DataFrame()
-                    self.data['puts'] = pd.DataFrame()
+                self.data.update(market_data.option_chain(self.symbol))
             except:
                 self.logger.warning("Données d'options indisponibles")
                 self.data['calls'] = pd.DataFrame()
@@ -116,8 +77,11 @@ class PricerReportGenerator(BaseReportGenerator):
             if hist is not None and not hist.empty:
                 returns = hist['Close'].pct_change().dropna()
                 self.data['historical_volatility'] = returns.std() * np.sqrt(252)
+                # Structure par terme 30j/90j/252j en une seule passe
+                self.data['volatility_term_structure'] = trailing_volatility(returns, (30, 90, 252))
             else:
                 self.data['historical_volatility'] = 0.25  # Default
+                self.data['volatility_term_structure'] = {}
             
             return True
             
@@ -127,30 +91,8 @@ class PricerReportGenerator(BaseReportGenerator):
     
     def add_table_of_contents(self):
         """Ajoute une table des matières"""
-        self.add_section_title("Table des Matières")
-        
-        toc_data = [
-            ["1.", "Résumé Exécutif", "3"],
-            ["2.", "Analyse du Sous-Jacent", "4"],
-            ["3.", "Analyse de Volatilité", "6"],
-            ["4.", "Modèles de Pricing", "8"],
-            ["5.", "Analyse des Greeks", "11"],
-            ["6.", "Recommandations Stratégiques", "14"],
-            ["7.", "Scénarios de Risque", "16"],
-            ["8.", "Insights Market Making", "18"]
-        ]
-        
-        toc_table = Table(toc_data, colWidths=[30, 350, 50])
-        toc_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        self.story.append(toc_table)
-        self.story.append(PageBreak())
+        self.story.append(Paragraph("Table des Matières", self.section_style))
+        self.add_contents(self.contents_table)
     
     def add_executive_summary(self):
         """Ajoute le résumé exécutif"""
@@ -248,21 +190,23 @@ class PricerReportGenerator(BaseReportGenerator):
         
         historical_vol = self.data.get('historical_volatility', 0)
         
-        # Calculs de volatilité avancés
-        hist = self.data.get('history')
-        if hist is not None and not hist.empty:
-            returns = hist['Close'].pct_change().dropna()
-            vol_30d = returns.tail(30).std() * np.sqrt(252) if len(returns) >= 30 else historical_vol
-            vol_90d = returns.tail(90).std() * np.sqrt(252) if len(returns) >= 90 else historical_vol
-        else:
-            vol_30d = vol_90d = historical_vol
+        # Structure par terme calculée lors de la récupération des données
+        term_structure = self.data.get('volatility_term_structure', {})
+        vol_30d = term_structure.get(30, np.nan)
+        vol_90d = term_structure.get(90, np.nan)
+        vol_252d = term_structure.get(252, np.nan)
+
+        # Historique trop court pour la fenêtre : repli sur la volatilité globale
+        vol_30d = vol_30d if not np.isnan(vol_30d) else historical_vol
+        vol_90d = vol_90d if not np.isnan(vol_90d) else historical_vol
+        vol_252d = vol_252d if not np.isnan(vol_252d) else historical_vol
         
         volatility_text = f"""
         <b>Structure de Volatilité</b>
         
         • **Volatilité Historique 30j** : {vol_30d*100:.1f}%
         • **Volatilité Historique 90j** : {vol_90d*100:.1f}%
-        • **Volatilité Historique 252j** : {historical_vol*100:.1f}%
+        • **Volatilité Historique 252j** : {vol_252d*100:.1f}%
         
         <b>Volatilité Implicite vs Historique</b>
         
@@ -294,9 +238,17 @@ class PricerReportGenerator(BaseReportGenerator):
     
     def add_options_pricing_models(self):
         """Ajoute les modèles de pricing"""
-        self.add_section_title("4. Modèles de Pricing")
+        # Texte pédagogique identique pour tous les sous-jacents : pages pré-rendues
+        self.add_static_pages('pricer_pricing_models', self._pricing_models_story)
+        self.story.append(PageBreak())
+    
+    def _pricing_models_story(self):
+        """Story statique de la section modèles de pricing"""
+        story = []
         
-        self.add_subsection_title("4.1 Modèle Black-Scholes")
+        story.append(self.section_title("4. Modèles de Pricing"))
+        
+        story.append(Paragraph("4.1 Modèle Black-Scholes", self.subsection_style))
         
         black_scholes_text = """
         <b>Modèle Black-Scholes-Merton</b>
@@ -326,9 +278,9 @@ class PricerReportGenerator(BaseReportGenerator):
         • Options européennes uniquement
         """
         
-        self.add_text(black_scholes_text)
+        story.extend(self.text_paragraphs(black_scholes_text))
         
-        self.add_subsection_title("4.2 Modèles Binomiaux")
+        story.append(Paragraph("4.2 Modèles Binomiaux", self.subsection_style))
         
         binomial_text = """
         <b>Arbres Binomiaux (Cox-Ross-Rubinstein)</b>
@@ -353,9 +305,9 @@ class PricerReportGenerator(BaseReportGenerator):
         • Exotic options avec barrières
         """
         
-        self.add_text(binomial_text)
+        story.extend(self.text_paragraphs(binomial_text))
         
-        self.add_subsection_title("4.3 Simulations Monte Carlo")
+        story.append(Paragraph("4.3 Simulations Monte Carlo", self.subsection_style))
         
         monte_carlo_text = """
         <b>Méthodes Monte Carlo</b>
@@ -380,12 +332,20 @@ class PricerReportGenerator(BaseReportGenerator):
         • Calcul de Greeks complexes
         """
         
-        self.add_text(monte_carlo_text)
-        self.story.append(PageBreak())
+        story.extend(self.text_paragraphs(monte_carlo_text))
+        return story
     
     def add_greeks_analysis(self):
         """Ajoute l'analyse des Greeks"""
-        self.add_section_title("5. Analyse des Greeks")
+        # Texte pédagogique identique pour tous les sous-jacents : pages pré-rendues
+        self.add_static_pages('pricer_greeks', self._greeks_story)
+        self.story.append(PageBreak())
+    
+    def _greeks_story(self):
+        """Story statique de la section Greeks"""
+        story = []
+        
+        story.append(self.section_title("5. Analyse des Greeks"))
         
         greeks_text = """
         <b>Les Greeks - Mesures de Sensibilité</b>
@@ -393,9 +353,9 @@ class PricerReportGenerator(BaseReportGenerator):
         Les Greeks quantifient la sensibilité du prix des options aux facteurs de marché.
         """
         
-        self.add_text(greeks_text)
+        story.extend(self.text_paragraphs(greeks_text))
         
-        self.add_subsection_title("5.1 Delta")
+        story.append(Paragraph("5.1 Delta", self.subsection_style))
         
         delta_text = """
         <b>Delta (Δ) - Sensibilité au Prix du Sous-Jacent</b>
@@ -416,9 +376,9 @@ class PricerReportGenerator(BaseReportGenerator):
         • Probabilité approximative d'expirer ITM
         """
         
-        self.add_text(delta_text)
+        story.extend(self.text_paragraphs(delta_text))
         
-        self.add_subsection_title("5.2 Gamma")
+        story.append(Paragraph("5.2 Gamma", self.subsection_style))
         
         gamma_text = """
         <b>Gamma (Γ) - Sensibilité du Delta</b>
@@ -439,9 +399,9 @@ class PricerReportGenerator(BaseReportGenerator):
         • Position sizing selon gamma exposure
         """
         
-        self.add_text(gamma_text)
+        story.extend(self.text_paragraphs(gamma_text))
         
-        self.add_subsection_title("5.3 Theta")
+        story.append(Paragraph("5.3 Theta", self.subsection_style))
         
         theta_text = """
         <b>Theta (Θ) - Sensibilité au Temps</b>
@@ -462,9 +422,9 @@ class PricerReportGenerator(BaseReportGenerator):
         • Theta/Gamma trade-off optimization
         """
         
-        self.add_text(theta_text)
+        story.extend(self.text_paragraphs(theta_text))
         
-        self.add_subsection_title("5.4 Vega")
+        story.append(Paragraph("5.4 Vega", self.subsection_style))
         
         vega_text = """
         <b>Vega (ν) - Sensibilité à la Volatilité</b>
@@ -485,8 +445,8 @@ class PricerReportGenerator(BaseReportGenerator):
         • Correlation breakdown : Vega risk non-diversifiable
         """
         
-        self.add_text(vega_text)
-        self.story.append(PageBreak())
+        story.extend(self.text_paragraphs(vega_text))
+        return story
     
     def add_strategy_recommendations(self):
         """Ajoute les recommandations stratégiques"""
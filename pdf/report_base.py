@@ -5,115 +5,140 @@
 Base class pour tous les générateurs de rapports FinAnalytics
 """
 
+import io
 import os
 import sys
+import shutil
 import logging
-import yfinance as yf
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
 # ReportLab imports
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image, Table
 from reportlab.lib.units import inch
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_cache import chart_cache, chart_key, TEMP_CHARTS_DIR
+from chart_renderers import RENDERER_VERSION, CHART_DPI, render_job, chart_format
+from plotting import load_matplotlib
+from vector_charts import VectorChart, VECTOR_AVAILABLE
+from image_pipeline import PRINT_DPI, optimize_raster
+from report_config import ReportConfig
+from report_styles import SAMPLE_STYLES, PARAGRAPH_STYLES, KEY_INFO_TABLE, CONTENTS_TABLE
+from page_fragments import static_pages, static_block
+from section_layout import ContentsPlaceholder, assemble, page_geometry
+from report_output import open_output
+from market_data import market_data
+
+# Processus de rendu des graphiques par rapport (1 = rendu séquentiel dans le processus principal)
+CHART_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class PendingChart:
+    """Emplacement réservé dans le story pour un graphique en cours de rendu"""
+    
+    def __init__(self, name, future, key, fmt, width, height):
+        self.name = name
+        self.future = future
+        self.key = key
+        self.fmt = fmt
+        self.width = width
+        self.height = height
+
 
 class BaseReportGenerator:
     """Classe de base pour tous les générateurs de rapports"""
     
-    def __init__(self, symbol, output_path):
+    # Graphiques intégrés en vectoriel (form XObjects PDF) quand pdfrw est disponible
+    vector_charts = True
+    
+    # Résolution des graphiques raster une fois rééchantillonnés à leur taille d'affichage
+    print_dpi = PRINT_DPI
+    
+    # Pool de rendu d'un processus longue durée (report_worker), recréé entre deux rapports
+    shared_chart_pool = None
+    
+    def __init__(self, symbol, output_path, config=None):
         self.symbol = symbol.upper()
+        # Chemin de fichier, '-' (sortie standard) ou flux binaire ouvert, écrit par build_pdf
         self.output_path = output_path
+        self.output_size = 0
         self.data = {}
         
-        # Configuration des répertoires
-        self.charts_dir = Path("temp_charts") / f"{self.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.charts_dir.mkdir(parents=True, exist_ok=True)
+        # Tableaux de données du rapport (en-tête + lignes), repris tels quels par les exports
+        self.tables = {}
+        
+        # Graphiques et sections demandés (tout par défaut)
+        self.config = config or ReportConfig()
+        
+        # Répertoire de graphiques créé seulement si un graphique passe par le disque
+        self._charts_dir = None
         
-        # Configuration PDF
-        self.doc = SimpleDocTemplate(
-            output_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
+        # Gabarit de mise en page créé au premier usage
+        self._doc = None
+        
+        # Form XObjects (graphiques PDF, fragments) déjà chargés pour ce rapport
+        self._forms = {}
         
         self.story = []
-        self.styles = getSampleStyleSheet()
+        self.chart_pool = None
+        self.styles = SAMPLE_STYLES
         self._setup_custom_styles()
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def doc(self):
+        """Gabarit de mise en page (format et marges) ; n'ouvre aucun fichier, le PDF est écrit par build_pdf"""
+        if self._doc is None:
+            self._doc = SimpleDocTemplate(
+                None,
+                pagesize=A4,
+                rightMargin=72,
+                leftMargin=72,
+                topMargin=72,
+                bottomMargin=18
+            )
+        return self._doc
+    
+    @property
+    def charts_dir(self):
+        """Répertoire temporaire unique du rapport (créé au premier accès)"""
+        if self._charts_dir is None:
+            TEMP_CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+            prefix = f"{self.symbol}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+            self._charts_dir = Path(tempfile.mkdtemp(prefix=prefix, dir=TEMP_CHARTS_DIR))
+        return self._charts_dir
+    
     def _setup_custom_styles(self):
         """Configure les styles personnalisés"""
         # Style titre principal
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            textColor=colors.HexColor('#1d4ed8'),
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica-Bold'
-        )
+        self.title_style = PARAGRAPH_STYLES['CustomTitle']
         
         # Style section
-        self.section_style = ParagraphStyle(
-            'SectionTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#1d4ed8'),
-            spaceAfter=20,
-            spaceBefore=30,
-            fontName='Helvetica-Bold',
-            borderWidth=2,
-            borderColor=colors.HexColor('#1d4ed8'),
-            borderPadding=10,
-            backColor=colors.HexColor('#f0f9ff')
-        )
+        self.section_style = PARAGRAPH_STYLES['SectionTitle']
         
         # Style sous-section
-        self.subsection_style = ParagraphStyle(
-            'SubsectionTitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#374151'),
-            spaceAfter=15,
-            spaceBefore=20,
-            fontName='Helvetica-Bold'
-        )
+        self.subsection_style = PARAGRAPH_STYLES['SubsectionTitle']
         
         # Style texte détaillé
-        self.text_style = ParagraphStyle(
-            'DetailedText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            lineHeight=1.3
-        )
+        self.text_style = PARAGRAPH_STYLES['DetailedText']
     
     def fetch_data(self):
         """Récupère les données de base pour l'action"""
         try:
             self.logger.info(f"📊 Récupération des données pour {self.symbol}")
             
-            ticker = yf.Ticker(self.symbol)
+            # Données de base (cache quotidien partagé avec les métriques JSON)
+            self.data['info'] = market_data.info(self.symbol)
+            self.data['history'] = market_data.history(self.symbol, "2y")
             
-            # Données de base
-            self.data['info'] = ticker.info
-            self.data['history'] = ticker.history(period="2y", interval="1d")
-            
-            # Données financières
+            # Données financières (même cache quotidien)
             try:
-                self.data['financials'] = ticker.financials
-                self.data['balance_sheet'] = ticker.balance_sheet
-                self.data['cashflow'] = ticker.cashflow
+                self.data.update(market_data.statements(self.symbol))
             except:
                 self.logger.warning("Données financières indisponibles")
                 self.data['financials'] = None
@@ -132,27 +157,11 @@ class BaseReportGenerator:
         company_name = info.get('longName', self.symbol)
         
         # En-tête FinAnalytics
-        header_style = ParagraphStyle(
-            'HeaderStyle',
-            parent=self.styles['Normal'],
-            fontSize=24,
-            textColor=colors.HexColor('#1d4ed8'),
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            fontName='Helvetica-Bold'
-        )
+        header_style = PARAGRAPH_STYLES['HeaderStyle']
         
         self.story.append(Paragraph("FinAnalytics", header_style))
         
-        subtitle_style = ParagraphStyle(
-            'SubtitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#6b7280'),
-            alignment=TA_CENTER,
-            spaceAfter=60,
-            fontStyle='italic'
-        )
+        subtitle_style = PARAGRAPH_STYLES['SubtitleStyle']
         
         self.story.append(Paragraph("Intelligence Financière & Analyse Quantitative", subtitle_style))
         
@@ -162,29 +171,13 @@ class BaseReportGenerator:
         self.story.append(Spacer(1, 20))
         
         # Nom de l'entreprise
-        company_style = ParagraphStyle(
-            'CompanyStyle',
-            parent=self.styles['Normal'],
-            fontSize=28,
-            textColor=colors.HexColor('#111827'),
-            alignment=TA_CENTER,
-            spaceAfter=10,
-            fontName='Helvetica-Bold'
-        )
+        company_style = PARAGRAPH_STYLES['CompanyStyle']
         
         if company_name != self.symbol:
             self.story.append(Paragraph(company_name, company_style))
         
         # Symbole boursier
-        symbol_style = ParagraphStyle(
-            'SymbolStyle',
-            parent=self.styles['Normal'],
-            fontSize=18,
-            textColor=colors.HexColor('#374151'),
-            alignment=TA_CENTER,
-            spaceAfter=50,
-            fontName='Helvetica'
-        )
+        symbol_style = PARAGRAPH_STYLES['SymbolStyle']
         
         self.story.append(Paragraph(f"({self.symbol})", symbol_style))
         
@@ -221,47 +214,27 @@ class BaseReportGenerator:
         ]
         
         table = Table(data, colWidths=[200, 200])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8fafc')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f9fafb')])
-        ]))
+        table.setStyle(KEY_INFO_TABLE)
         
         self.story.append(table)
         self.story.append(Spacer(1, 60))
     
     def add_cover_footer(self):
         """Ajoute le footer de la page de garde"""
-        footer_style = ParagraphStyle(
-            'FooterStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#6b7280'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        footer_style = PARAGRAPH_STYLES['FooterStyle']
         
         date_str = datetime.now().strftime('%d/%m/%Y à %H:%M')
         self.story.append(Paragraph(f"Rapport généré le {date_str}", footer_style))
-        self.story.append(Paragraph("© FinAnalytics - Intelligence Financière", footer_style))
+        
+        # Mention et avertissement identiques pour tous les rapports : bloc pré-rendu
+        self.add_static_block('cover_disclaimer', lambda: self._cover_disclaimer_story(footer_style))
+    
+    def _cover_disclaimer_story(self, footer_style):
+        """Story statique du bas de la page de garde"""
+        story = [Paragraph("© FinAnalytics - Intelligence Financière", footer_style)]
         
         # Disclaimer
-        disclaimer_style = ParagraphStyle(
-            'DisclaimerStyle',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#9ca3af'),
-            alignment=TA_JUSTIFY,
-            spaceAfter=20,
-            leftIndent=40,
-            rightIndent=40
-        )
+        disclaimer_style = PARAGRAPH_STYLES['DisclaimerStyle']
         
         disclaimer_text = """
         AVERTISSEMENT : Ce rapport est fourni à des fins d'information uniquement et ne constitue pas un conseil en investissement. 
@@ -269,11 +242,45 @@ class BaseReportGenerator:
         Consultez un conseiller financier qualifié avant de prendre des décisions d'investissement.
         """
         
-        self.story.append(Paragraph(disclaimer_text, disclaimer_style))
+        story.append(Paragraph(disclaimer_text, disclaimer_style))
+        return story
     
     def add_section_title(self, title):
-        """Ajoute un titre de section"""
-        self.story.append(Paragraph(title, self.section_style))
+        """Ajoute un titre de section (référencé dans la table des matières)"""
+        self.story.append(self.section_title(title))
+    
+    def section_title(self, title):
+        """Paragraphe de titre de section, relevé avec sa page à la mise en page"""
+        paragraph = Paragraph(title, self.section_style)
+        paragraph.toc_title = title
+        return paragraph
+    
+    def add_contents(self, build):
+        """
+        Réserve l'emplacement de la table des matières
+        
+        Args:
+            build: Fonction (entries) -> flowables, entries étant la liste des (titre, page)
+                des sections effectivement présentes dans le document assemblé
+        """
+        self.story.append(ContentsPlaceholder(build))
+        self.story.append(PageBreak())
+
+    def contents_table(self, entries):
+        """Table des matières en tableau : numéro, section, page"""
+        rows = []
+        for title, page in entries:
+            number, _, label = title.partition(' ')
+            if not number.rstrip('.').isdigit():
+                number, label = '', title
+            rows.append([number, label, str(page)])
+
+        if not rows:
+            return []
+
+        toc_table = Table(rows, colWidths=[30, 350, 50])
+        toc_table.setStyle(CONTENTS_TABLE)
+        return [toc_table]
     
     def add_subsection_title(self, title):
         """Ajoute un sous-titre de section"""
@@ -281,32 +288,163 @@ class BaseReportGenerator:
     
     def add_text(self, content):
         """Ajoute du texte avec style professionnel"""
-        paragraphs = content.split('\n\n')
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                self.story.append(Paragraph(paragraph.strip(), self.text_style))
+        self.story.extend(self.text_paragraphs(content))
+    
+    def text_paragraphs(self, content):
+        """Paragraphes d'un texte (séparés par des lignes vides) au style professionnel"""
+        return [Paragraph(paragraph.strip(), self.text_style)
+                for paragraph in content.split('\n\n') if paragraph.strip()]
+    
+    def record_table(self, name, rows):
+        """Conserve un tableau de données (première ligne = en-tête) pour les exports CSV/JSON/Excel"""
+        self.tables[name] = [[cell.getPlainText() if isinstance(cell, Paragraph) else cell for cell in row]
+                             for row in rows]
+    
+    def add_static_pages(self, name, build):
+        """
+        Ajoute des pages entièrement statiques, mises en page une fois par version de gabarit
+        
+        Args:
+            name: Identifiant du fragment (page_fragments)
+            build: Fonction renvoyant le story statique, appelée seulement si le fragment n'est pas en cache
+        """
+        self.story.extend(static_pages(name, self.doc, build, self._forms))
+    
+    def add_static_block(self, name, build):
+        """Ajoute un bloc statique pré-rendu à l'intérieur d'une page"""
+        self.story.extend(static_block(name, self.doc, build, self._forms))
+    
+    def wants_chart(self, *chart_types):
+        """True si l'un des types de graphiques (enum ChartType) est sélectionné"""
+        return self.config.wants_chart(*chart_types)
+    
+    def wants_section(self, flag):
+        """True si l'option d'analyse du rapport (technicalAnalysis, riskMetrics...) est activée"""
+        return self.config.wants_section(flag)
     
     def add_chart(self, chart_path, width=7*inch, height=4*inch):
         """Ajoute un graphique au rapport"""
-        if os.path.exists(chart_path):
-            self.story.append(Image(chart_path, width=width, height=height))
-            self.story.append(Spacer(1, 15))
+        if not os.path.exists(chart_path):
+            return
+        
+        fmt = Path(chart_path).suffix.lstrip('.').lower()
+        if fmt == 'pdf':
+            self._append_chart(str(chart_path), fmt, width, height)
+            return
+        
+        # Image produite hors du pipeline de rendu : rééchantillonnée avant intégration
+        encoding = 'jpeg' if fmt in ('jpg', 'jpeg') else 'png'
+        data = optimize_raster(Path(chart_path).read_bytes(), width, height, self.print_dpi, encoding)
+        self._append_chart(data, encoding, width, height)
+    
+    def _chart_flowable(self, source, width, height, fmt=None):
+        """Flowable d'un graphique : chemin de fichier ou octets en mémoire (PDF vectoriel ou image)"""
+        fmt = fmt or Path(source).suffix.lstrip('.')
+        if fmt == 'pdf':
+            return VectorChart(source if isinstance(source, bytes) else str(source), width, height, self._forms)
+        
+        # Image inscrite dans la boîte, proportions conservées (comme VectorChart)
+        return Image(io.BytesIO(source) if isinstance(source, bytes) else str(source),
+                     width=width, height=height, kind='proportional')
+    
+    def _append_chart(self, data, fmt, width, height):
+        self.story.append(self._chart_flowable(data, width, height, fmt))
+        self.story.append(Spacer(1, 15))
+    
+    def render_chart(self, name, renderer, width=7*inch, height=4*inch, **inputs):
+        """
+        Rend un graphique en mémoire via le cache partagé puis l'ajoute au rapport
+        
+        Args:
+            name: Nom du graphique (journalisation)
+            renderer: Fonction de chart_renderers appelée comme renderer(target, **inputs)
+            inputs: Données préparées (seules entrées du rendu, elles forment la clé du cache)
+        """
+        fmt = chart_format(renderer, self.vector_charts and VECTOR_AVAILABLE)
+        display = (width, height, self.print_dpi)
+        key = chart_key(renderer.__name__, inputs, style=f"v{RENDERER_VERSION}-{CHART_DPI}dpi-{fmt}-{self.print_dpi}ppi",
+                        size=(width, height))
+        
+        cached = chart_cache.get(key, f".{fmt}")
+        if cached is not None:
+            self._append_chart(cached, fmt, width, height)
+            return
+        
+        pool = self.get_chart_pool()
+        if pool is None:
+            data = render_job(renderer, inputs, fmt, display)
+            chart_cache.put(key, data, f".{fmt}")
+            self._append_chart(data, fmt, width, height)
+            return
+        
+        # Rendu en arrière-plan pendant la mise en page du texte, résolu dans build_pdf
+        future = pool.submit(render_job, renderer, inputs, fmt, display)
+        self.story.append(PendingChart(name, future, key, fmt, width, height))
+    
+    def get_chart_pool(self):
+        """Pool de processus de rendu du rapport (créé au premier graphique), None si séquentiel"""
+        if self.shared_chart_pool is not None:
+            return self.shared_chart_pool
+        if self.chart_pool is None and CHART_WORKERS > 1:
+            load_matplotlib()
+            try:
+                self.chart_pool = ProcessPoolExecutor(max_workers=CHART_WORKERS)
+            except Exception as e:
+                self.logger.warning(f"Pool de rendu indisponible, rendu séquentiel: {e}")
+        return self.chart_pool
+    
+    def resolve_charts(self):
+        """Attend les rendus en cours et remplace les emplacements réservés par les images"""
+        story = []
+        for flowable in self.story:
+            if not isinstance(flowable, PendingChart):
+                story.append(flowable)
+                continue
+            
+            try:
+                data = flowable.future.result()
+                chart_cache.put(flowable.key, data, f".{flowable.fmt}")
+                story.append(self._chart_flowable(data, flowable.width, flowable.height, flowable.fmt))
+                story.append(Spacer(1, 15))
+            except Exception as e:
+                self.logger.error(f"Erreur rendu graphique {flowable.name}: {e}")
+        
+        self.story = story
+        self.shutdown_chart_pool()
+    
+    def shutdown_chart_pool(self):
+        if self.chart_pool is not None:
+            self.chart_pool.shutdown(wait=True)
+            self.chart_pool = None
+    
+    @staticmethod
+    def release_shared_chart_pool():
+        """
+        Arrête le pool partagé une fois les graphiques résolus
+
+        Un pool vivant garde ses threads de gestion dans ce processus : la mise en page, qui
+        forke, ne doit pas démarrer tant qu'ils existent. report_worker le recrée après la réponse.
+        """
+        # Attribut de la classe de base (partagé par tous les générateurs)
+        pool = BaseReportGenerator.shared_chart_pool
+        if pool is not None:
+            BaseReportGenerator.shared_chart_pool = None
+            pool.shutdown(wait=True)
     
     def add_final_page(self):
         """Ajoute une page finale professionnelle"""
         self.story.append(PageBreak())
+        self.add_static_pages('final_page', self._final_page_story)
+    
+    def _final_page_story(self):
+        """Story statique de la page finale"""
+        story = []
         
-        final_title_style = ParagraphStyle(
-            'FinalTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            textColor=colors.HexColor('#1d4ed8'),
-            alignment=TA_CENTER,
-            spaceAfter=40,
-            fontName='Helvetica-Bold'
-        )
+        final_title_style = PARAGRAPH_STYLES['FinalTitle']
         
-        self.story.append(Paragraph("Conclusion & Contact", final_title_style))
+        final_title = Paragraph("Conclusion & Contact", final_title_style)
+        final_title.toc_title = "Conclusion & Contact"
+        story.append(final_title)
         
         conclusion_text = """
         Ce rapport d'analyse financière a été généré par FinAnalytics, notre plateforme d'intelligence 
@@ -314,16 +452,11 @@ class BaseReportGenerator:
         et utilise des modèles quantitatifs sophistiqués pour fournir des insights approfondis.
         """
         
-        self.add_text(conclusion_text)
-        self.story.append(Spacer(1, 40))
+        story.extend(self.text_paragraphs(conclusion_text))
+        story.append(Spacer(1, 40))
         
         # Contact
-        contact_style = ParagraphStyle(
-            'ContactStyle',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=30
-        )
+        contact_style = PARAGRAPH_STYLES['ContactStyle']
         
         contact_info = """
         <b>FinAnalytics</b><br/>
@@ -332,22 +465,10 @@ class BaseReportGenerator:
         Support: support@finanalytics.com<br/>
         """
         
-        self.story.append(Paragraph(contact_info, contact_style))
+        story.append(Paragraph(contact_info, contact_style))
         
         # Disclaimer final
-        disclaimer_final_style = ParagraphStyle(
-            'DisclaimerFinal',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#6b7280'),
-            alignment=TA_JUSTIFY,
-            leftIndent=20,
-            rightIndent=20,
-            borderWidth=1,
-            borderColor=colors.HexColor('#e5e7eb'),
-            borderPadding=15,
-            backColor=colors.HexColor('#f9fafb')
-        )
+        disclaimer_final_style = PARAGRAPH_STYLES['DisclaimerFinal']
         
         disclaimer_text = """
         <b>Avertissement final :</b> Ce rapport est fourni uniquement à des fins d'information et 
@@ -355,22 +476,34 @@ class BaseReportGenerator:
         consulter un conseiller financier qualifié avant de prendre toute décision d'investissement.
         """
         
-        self.story.append(Paragraph(disclaimer_text, disclaimer_final_style))
+        story.append(Paragraph(disclaimer_text, disclaimer_final_style))
+        return story
     
     def generate_report(self):
         """Méthode à surcharger dans les classes filles"""
         raise NotImplementedError("Cette méthode doit être implémentée dans les classes filles")
     
     def build_pdf(self):
-        """Construit le PDF final"""
-        self.doc.build(self.story)
+        """
+        Construit le PDF final : sections mises en page en parallèle puis assemblées
+        
+        Le PDF est écrit sur la destination du rapport (fichier renommé atomiquement une fois
+        complet, sortie standard ou flux) ; en cas d'erreur aucun fichier partiel ne subsiste.
+        """
+        self.resolve_charts()
+        self.release_shared_chart_pool()
+        with open_output(self.output_path) as output:
+            assemble(self.story, page_geometry(self.doc), output, f"FinAnalytics · {self.symbol}")
+        self.output_size = output.size
         self.cleanup_charts()
     
     def cleanup_charts(self):
         """Nettoie les graphiques temporaires"""
+        self.shutdown_chart_pool()
+        if self._charts_dir is None:
+            return
         try:
-            import shutil
-            if os.path.exists(self.charts_dir):
-                shutil.rmtree(self.charts_dir)
+            if os.path.exists(self._charts_dir):
+                shutil.rmtree(self._charts_dir)
         except Exception as e:
-            self.logger.warning(f"Impossible de nettoyer {self.charts_dir}: {e}")
\ No newline at end of file
+            self.logger.warning(f"Impossible de nettoyer {self._charts_dir}: {e}")
\ No newline at end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Configuration d'un rapport FinAnalytics
+Graphiques sélectionnés (Report.selectedCharts) et options d'analyse du modèle Prisma,
+lues par les générateurs pour ne calculer et ne rendre que le contenu demandé
+"""
+
+import os
+import json
+import logging
+from typing import Iterable, Optional
+
+# Valeurs de l'enum Prisma ChartType
+CHART_TYPES = (
+    'PRICE_EVOLUTION',
+    'VOLUME_ANALYSIS',
+    'TECHNICAL_INDICATORS',
+    'RISK_METRICS',
+    'CORRELATION_MATRIX',
+    'VOLATILITY_SURFACE',
+    'CANDLESTICK',
+    'BOLLINGER_BANDS',
+    'FIBONACCI_RETRACEMENT',
+    'ICHIMOKU_CLOUD'
+)
+
+# Formats d'export (Report.exportFormats) ; le PDF est toujours produit
+EXPORT_FORMATS = ('PDF', 'CSV', 'JSON', 'EXCEL', 'PARQUET')
+
+# Variantes d'écriture acceptées dans exportFormats
+EXPORT_ALIASES = {'XLSX': 'EXCEL', 'XLS': 'EXCEL'}
+
+# Options d'analyse du modèle Report et leurs valeurs par défaut (schema.prisma)
+SECTION_FLAGS = {
+    'riskMetrics': True,
+    'correlationAnalysis': False,
+    'volatilityAnalysis': False,
+    'fundamentalAnalysis': True,
+    'technicalAnalysis': True,
+    'sentimentAnalysis': False
+}
+
+logger = logging.getLogger(__name__)
+
+
+class ReportConfig:
+    """
+    Contenu demandé pour un rapport
+
+    Une liste selectedCharts vide (valeur par défaut du formulaire) signifie « tous les
+    graphiques ». Les analyses activées par défaut (risque, fondamentale, technique) retirent
+    leurs sections quand elles sont désactivées ; corrélation, volatilité et sentiment sont
+    des compléments et ne retirent jamais le contenu de base d'un type de rapport.
+
+    Les formats d'export (CSV, JSON, Excel, Parquet) et l'inclusion de l'historique brut
+    (includeRawData) s'ajoutent au PDF à partir des mêmes données calculées.
+    """
+
+    def __init__(self, selected_charts: Optional[Iterable[str]] = None,
+                 export_formats: Optional[Iterable[str]] = None, include_raw_data: bool = False, **flags):
+        charts = {str(chart).upper() for chart in (selected_charts or [])}
+        unknown = charts - set(CHART_TYPES)
+        if unknown:
+            raise ValueError(f"Types de graphiques inconnus: {sorted(unknown)}")
+        self.selected_charts = charts or set(CHART_TYPES)
+
+        unknown = set(flags) - set(SECTION_FLAGS)
+        if unknown:
+            raise ValueError(f"Options d'analyse inconnues: {sorted(unknown)}")
+        # Sans configuration explicite, toutes les sections sont incluses
+        self.flags = {flag: True for flag in SECTION_FLAGS}
+        self.flags.update({flag: bool(value) for flag, value in flags.items() if value is not None})
+
+        # exportFormats est un String[] libre côté Prisma (contrairement à selectedCharts, enum) :
+        # un format inconnu est ignoré, comme un format dont la dépendance manque, sans bloquer le PDF
+        formats = {EXPORT_ALIASES.get(str(f).upper(), str(f).upper()) for f in (export_formats or [])}
+        unknown = formats - set(EXPORT_FORMATS)
+        if unknown:
+            logger.warning(f"⚠️ Formats d'export inconnus ignorés: {sorted(unknown)}")
+            formats -= unknown
+        self.export_formats = [f for f in EXPORT_FORMATS if f in formats | {'PDF'}]
+        self.include_raw_data = bool(include_raw_data)
+
+    @classmethod
+    def from_dict(cls, values: dict) -> 'ReportConfig':
+        """Construit la configuration depuis un enregistrement Report (clés camelCase Prisma)"""
+        flags = {flag: values.get(flag, default) for flag, default in SECTION_FLAGS.items()}
+        formats = list(values.get('exportFormats') or [])
+        # L'option « export API » donne accès aux données en JSON
+        if values.get('includeApiExport'):
+            formats.append('JSON')
+        return cls(values.get('selectedCharts'), formats, values.get('includeRawData', False), **flags)
+
+    @classmethod
+    def from_argument(cls, argument: str) -> 'ReportConfig':
+        """Configuration passée en ligne de commande : JSON ou chemin vers un fichier JSON"""
+        if os.path.isfile(argument):
+            with open(argument, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        return cls.from_dict(json.loads(argument))
+
+    def to_dict(self) -> dict:
+        selected = [] if self.all_charts else [c for c in CHART_TYPES if c in self.selected_charts]
+        return {'selectedCharts': selected, **self.flags,
+                'exportFormats': self.export_formats, 'includeRawData': self.include_raw_data}
+
+    @property
+    def all_charts(self) -> bool:
+        return self.selected_charts == set(CHART_TYPES)
+
+    def wants_chart(self, *chart_types: str) -> bool:
+        """True si au moins un des types de graphiques est sélectionné"""
+        return any(chart in self.selected_charts for chart in chart_types)
+
+    def wants_section(self, flag: str) -> bool:
+        """True si l'analyse correspondante est activée"""
+        return self.flags[flag]
+
+    @property
+    def data_exports(self) -> list:
+        """Formats d'export demandés en plus du PDF"""
+        return [f for f in self.export_formats if f != 'PDF']
+
+    def __repr__(self):
+        return f"ReportConfig({self.to_dict()})"
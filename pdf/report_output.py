@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Destinations des rapports FinAnalytics
+Un rapport s'écrit dans un fichier (écriture dans un fichier temporaire puis renommage
+atomique), sur la sortie standard ('-'), ou dans un flux binaire déjà ouvert (tampon
+mémoire, pipe, socket) : un PDF à moitié écrit n'est jamais visible sous son nom final
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
+
+# Destination désignant la sortie standard
+STDOUT = '-'
+
+Target = Union[str, os.PathLike, BinaryIO]
+
+
+def _file_mode() -> int:
+    """Droits d'un fichier créé normalement (0666 moins l'umask), lus une fois au chargement du module"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Lu à l'import (encore mono-thread) : os.umask modifie un état global du processus, le lire
+# pendant l'écriture d'un rapport laisserait les autres threads créer des fichiers en umask 0
+FILE_MODE = _file_mode()
+
+
+class CountingWriter:
+    """Flux en écriture seule qui compte les octets transmis au flux sous-jacent"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.size = 0
+
+    def write(self, data):
+        written = self.stream.write(data)
+        written = len(data) if written is None else written
+        self.size += written
+        return written
+
+    def flush(self):
+        self.stream.flush()
+
+
+def describe(target: Target) -> str:
+    """Libellé d'une destination pour les logs"""
+    if isinstance(target, (str, os.PathLike)):
+        return "<stdout>" if target == STDOUT else os.fspath(target)
+    return getattr(target, 'name', None) or f"<{type(target).__name__}>"
+
+
+def is_file_target(target: Target) -> bool:
+    """True si la destination est un chemin de fichier (et non '-' ou un flux)"""
+    return isinstance(target, (str, os.PathLike)) and target != STDOUT
+
+
+@contextmanager
+def _atomic_file(path) -> Iterator[BinaryIO]:
+    """
+    Fichier temporaire du même répertoire, renommé sur le chemin final en cas de succès
+
+    Le renommage (os.replace) est atomique sur un même système de fichiers : un lecteur voit
+    l'ancien rapport ou le nouveau complet, jamais un fichier tronqué.
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.part', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            yield stream
+            stream.flush()
+            # mkstemp crée le fichier en 0600 : droits habituels d'un fichier servi
+            os.fchmod(stream.fileno(), FILE_MODE)
+            os.fsync(stream.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def open_output(target: Target) -> Iterator[CountingWriter]:
+    """
+    Ouvre la destination d'un rapport
+
+    Args:
+        target: Chemin de fichier, '-' pour la sortie standard ou flux binaire ouvert
+
+    Yields:
+        CountingWriter: flux d'écriture ; writer.size donne la taille écrite
+    """
+    if is_file_target(target):
+        with _atomic_file(target) as stream:
+            yield CountingWriter(stream)
+        return
+
+    writer = CountingWriter(sys.stdout.buffer if target == STDOUT else target)
+    yield writer
+    writer.flush()
+
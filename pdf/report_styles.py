@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Registre des styles des rapports FinAnalytics
+Feuille de styles reportlab, styles de paragraphe et de tableau construits une seule fois
+par processus et partagés en lecture seule par tous les générateurs
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+# Couleurs des types de rapport
+BLUE = '#1d4ed8'
+GREEN = '#059669'
+PURPLE = '#7c3aed'
+RED = '#dc2626'
+CYAN = '#0891b2'
+
+GRID_COLOR = colors.HexColor('#e5e7eb')
+
+# Feuille de styles de base (Normal, Title, Heading1...) : getSampleStyleSheet() n'est appelé qu'ici
+SAMPLE_STYLES = getSampleStyleSheet()
+
+
+def _paragraph(name, parent, **attrs):
+    return ParagraphStyle(name, parent=SAMPLE_STYLES[parent], **attrs)
+
+
+class SharedTableStyle(TableStyle):
+    """TableStyle partagé entre rapports : add() est interdit, dériver avec TableStyle(cmds, parent=style)"""
+
+    def add(self, *cmd):
+        raise TypeError("Style de tableau partagé en lecture seule")
+
+
+# Styles de paragraphe communs, indexés par nom
+PARAGRAPH_STYLES = MappingProxyType({style.name: style for style in (
+    # Titres et texte courant
+    _paragraph('CustomTitle', 'Title', fontSize=24, textColor=colors.HexColor(BLUE),
+               alignment=TA_CENTER, spaceAfter=30, fontName='Helvetica-Bold'),
+    _paragraph('SectionTitle', 'Heading1', fontSize=18, textColor=colors.HexColor(BLUE),
+               spaceAfter=20, spaceBefore=30, fontName='Helvetica-Bold', borderWidth=2,
+               borderColor=colors.HexColor(BLUE), borderPadding=10,
+               backColor=colors.HexColor('#f0f9ff')),
+    _paragraph('SubsectionTitle', 'Heading2', fontSize=14, textColor=colors.HexColor('#374151'),
+               spaceAfter=15, spaceBefore=20, fontName='Helvetica-Bold'),
+    _paragraph('DetailedText', 'Normal', fontSize=11, alignment=TA_JUSTIFY, spaceAfter=12,
+               lineHeight=1.3),
+
+    # Page de garde
+    _paragraph('HeaderStyle', 'Normal', fontSize=24, textColor=colors.HexColor(BLUE),
+               alignment=TA_CENTER, spaceAfter=20, fontName='Helvetica-Bold'),
+    _paragraph('SubtitleStyle', 'Normal', fontSize=12, textColor=colors.HexColor('#6b7280'),
+               alignment=TA_CENTER, spaceAfter=60, fontStyle='italic'),
+    _paragraph('CompanyStyle', 'Normal', fontSize=28, textColor=colors.HexColor('#111827'),
+               alignment=TA_CENTER, spaceAfter=10, fontName='Helvetica-Bold'),
+    _paragraph('SymbolStyle', 'Normal', fontSize=18, textColor=colors.HexColor('#374151'),
+               alignment=TA_CENTER, spaceAfter=50, fontName='Helvetica'),
+    _paragraph('TypeLabel', 'Normal', fontSize=14, alignment=TA_CENTER, spaceAfter=8,
+               textColor=colors.HexColor('#374151'), fontName='Helvetica-Bold'),
+    _paragraph('SummaryStyle', 'Normal', fontSize=12, textColor=colors.HexColor('#374151'),
+               alignment=TA_CENTER, spaceAfter=40, fontStyle='italic'),
+    _paragraph('FooterStyle', 'Normal', fontSize=10, textColor=colors.HexColor('#6b7280'),
+               alignment=TA_CENTER, spaceAfter=20),
+    _paragraph('DisclaimerStyle', 'Normal', fontSize=8, textColor=colors.HexColor('#9ca3af'),
+               alignment=TA_JUSTIFY, spaceAfter=20, leftIndent=40, rightIndent=40),
+
+    # Table des matières
+    _paragraph('TOCEntry', 'Normal', fontSize=12, spaceAfter=8, leftIndent=20),
+
+    # Page finale
+    _paragraph('FinalTitle', 'Title', fontSize=24, textColor=colors.HexColor(BLUE),
+               alignment=TA_CENTER, spaceAfter=40, fontName='Helvetica-Bold'),
+    _paragraph('ContactStyle', 'Normal', fontSize=11, spaceAfter=30),
+    _paragraph('DisclaimerFinal', 'Normal', fontSize=9, textColor=colors.HexColor('#6b7280'),
+               alignment=TA_JUSTIFY, leftIndent=20, rightIndent=20, borderWidth=1,
+               borderColor=GRID_COLOR, borderPadding=15, backColor=colors.HexColor('#f9fafb')),
+)})
+
+
+@lru_cache(maxsize=None)
+def analysis_type_style(accent: str) -> ParagraphStyle:
+    """Bandeau du type d'analyse (BASELINE, BENCHMARK) à la couleur du rapport"""
+    return _paragraph('AnalysisType', 'Normal', fontSize=20, textColor=colors.white,
+                      alignment=TA_CENTER, spaceAfter=30, borderWidth=3,
+                      borderColor=colors.HexColor(accent), borderPadding=18,
+                      backColor=colors.HexColor(accent), fontName='Helvetica-Bold')
+
+
+@lru_cache(maxsize=None)
+def request_style(accent: str, tint: str) -> ParagraphStyle:
+    """Encadré de description de la demande"""
+    return _paragraph('RequestSummary', 'Normal', fontSize=11, alignment=TA_CENTER,
+                      spaceAfter=25, borderWidth=2, borderColor=colors.HexColor(accent),
+                      borderPadding=12, backColor=colors.HexColor(tint), leftIndent=10,
+                      rightIndent=10)
+
+
+@lru_cache(maxsize=None)
+def badge_style(accent: str) -> ParagraphStyle:
+    """Badge du type d'analyse (DETAILED, DEEP_ANALYSIS, PRICER)"""
+    return _paragraph('BadgeStyle', 'Normal', fontSize=16, textColor=colors.white,
+                      alignment=TA_CENTER, spaceAfter=30, fontName='Helvetica-Bold',
+                      backColor=colors.HexColor(accent), borderWidth=2,
+                      borderColor=colors.HexColor(accent), borderPadding=15, borderRadius=10)
+
+
+@lru_cache(maxsize=None)
+def toc_title_style(accent: str) -> ParagraphStyle:
+    """Titre de la table des matières"""
+    return _paragraph('TOCTitle', 'Heading1', fontSize=20, textColor=colors.HexColor(accent),
+                      alignment=TA_CENTER, spaceAfter=30, fontName='Helvetica-Bold')
+
+
+# Tableau d'informations clés de la page de garde
+KEY_INFO_TABLE = SharedTableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8fafc')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f9fafb')])
+])
+
+# Table des matières en tableau (numéro, section, page)
+CONTENTS_TABLE = SharedTableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+])
+
+
+@lru_cache(maxsize=None)
+def data_table_style(header: str, stripe: str, font_size: int = 9, align: str = 'CENTER') -> TableStyle:
+    """
+    Tableau de données : en-tête coloré, grille et lignes alternées
+
+    Args:
+        header: Couleur de fond de la ligne d'en-tête
+        stripe: Couleur des lignes paires
+        font_size: Taille du texte
+        align: Alignement horizontal des cellules
+    """
+    return SharedTableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(stripe)])
+    ])
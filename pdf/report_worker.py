@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Worker de génération FinAnalytics
+Service longue durée à l'écoute d'un socket Unix : les modules (pandas, matplotlib,
+reportlab, yfinance...), les styles, les caches mémoire et le pool de rendu des graphiques
+restent chauds d'un rapport à l'autre, au lieu d'un démarrage de python3 par requête
+
+Protocole : une requête JSON par connexion (une ligne), une réponse JSON (une ligne)
+    {"action": "generate", "symbol": "AAPL", "reportType": "BASELINE", "outputPath": "...",
+     "userId": "...", "config": {...}}
+    {"action": "metrics", "symbol": "AAPL", "benchmark": "^GSPC"}
+    {"action": "ping"}
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import socketserver
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from smart_report_generator import SmartReportGenerator
+from report_base import BaseReportGenerator, CHART_WORKERS
+from plotting import load_matplotlib
+from report_config import ReportConfig
+
+logger = logging.getLogger(__name__)
+
+# Socket partagé avec l'API Next.js (FINANALYTICS_WORKER_SOCKET)
+DEFAULT_SOCKET = os.environ.get('FINANALYTICS_WORKER_SOCKET', '/tmp/finanalytics_report_worker.sock')
+
+# Taille maximale d'une requête (configuration comprise)
+MAX_REQUEST_BYTES = 1 << 20
+
+# Modules du serveur forkserver dont sont forkés les processus de rendu. Chaque processus forké
+# réexécute le script principal : ce module y est préchargé sous son nom, avec ses imports
+# (générateurs, pandas...), pour que cette réexécution ne réimporte rien
+CHART_PRELOAD_MODULES = ['report_worker', 'matplotlib.figure', 'matplotlib.backends.backend_agg',
+                         'matplotlib.font_manager', 'chart_renderers', 'image_pipeline']
+
+
+def handle_request(request: dict) -> dict:
+    """Exécute une requête du protocole et renvoie la réponse"""
+    action = request.get('action')
+
+    if action == 'ping':
+        return {'ok': True, 'pid': os.getpid()}
+
+    if action == 'metrics':
+        metrics = SmartReportGenerator.compute_metrics(request['symbol'], request.get('benchmark', '^GSPC'))
+        if metrics is None:
+            return {'ok': False, 'error': "Échec du calcul des métriques"}
+        return {'ok': True, 'metrics': metrics}
+
+    if action == 'generate':
+        config = request.get('config')
+        config = ReportConfig.from_dict(config) if config is not None else None
+        start_time = time.time()
+        success = SmartReportGenerator.generate_report(request['symbol'], request['reportType'].upper(),
+                                                       request['outputPath'], request.get('userId'), config)
+        response = {'ok': success, 'outputPath': request['outputPath'],
+                    'duration': round(time.time() - start_time, 3)}
+        if not success:
+            response['error'] = "Échec de la génération du rapport"
+        return response
+
+    return {'ok': False, 'error': f"Action inconnue: {action}"}
+
+
+class ReportRequestHandler(socketserver.StreamRequestHandler):
+    """Une connexion = une requête JSON suivie d'une réponse JSON"""
+
+    def handle(self):
+        try:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            response = handle_request(json.loads(line))
+        except (KeyError, ValueError) as e:
+            response = {'ok': False, 'error': f"Requête invalide: {e}"}
+        except Exception as e:
+            logger.error(f"❌ Erreur traitement requête: {e}")
+            response = {'ok': False, 'error': str(e)}
+
+        try:
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        except OSError as e:
+            logger.warning(f"⚠️ Client déconnecté avant la réponse: {e}")
+
+
+class ReportWorkerServer(socketserver.UnixStreamServer):
+    """
+    Serveur séquentiel : une génération à la fois dans le processus principal
+
+    La mise en page forke des processus ; un serveur multi-thread risquerait de forker
+    pendant qu'un autre thread détient un verrou. Pour la même raison, le pool de rendu
+    (et ses threads) est arrêté avant la mise en page puis recréé entre deux requêtes.
+    """
+
+    # Requêtes en attente pendant une génération (5 par défaut : au-delà, EAGAIN côté client)
+    request_queue_size = 64
+
+    def process_request(self, request, client_address):
+        super().process_request(request, client_address)
+        # Connexion fermée : le pool de rendu, arrêté avant la mise en page (ou cassé), est recréé
+        # entre deux requêtes, hors du temps de réponse
+        try:
+            ensure_chart_pool()
+        except Exception as e:
+            logger.warning(f"⚠️ Pool de rendu indisponible, rendu local: {e}")
+
+    def server_bind(self):
+        # Socket d'une instance précédente arrêtée sans nettoyage
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, 0o660)
+
+
+def ensure_chart_pool():
+    """
+    Pool de rendu prêt pour le prochain rapport (recréé s'il a été arrêté ou s'il est cassé)
+
+    Ses processus sont forkés par un serveur forkserver qui a préchargé matplotlib et les
+    renderers : le worker lui-même, qui héberge les threads du pool, ne forke jamais pour le rendu.
+    """
+    if CHART_WORKERS <= 1 or 'forkserver' not in multiprocessing.get_all_start_methods():
+        return
+
+    pool = BaseReportGenerator.shared_chart_pool
+    if pool is not None:
+        try:
+            pool.submit(int).result()
+            return
+        except BrokenProcessPool:
+            logger.warning("⚠️ Pool de rendu cassé, redémarrage")
+            pool.shutdown(wait=False)
+            BaseReportGenerator.shared_chart_pool = None
+
+    pool = ProcessPoolExecutor(max_workers=CHART_WORKERS, mp_context=multiprocessing.get_context('forkserver'))
+    # Tâches simultanées : chaque processus du pool est forké maintenant, avant de servir
+    list(pool.map(time.sleep, [0.05] * CHART_WORKERS))
+    BaseReportGenerator.shared_chart_pool = pool
+
+
+def main():
+    """Point d'entrée : python pdf/report_worker.py [--socket CHEMIN]"""
+    parser = argparse.ArgumentParser(description="Worker de génération de rapports FinAnalytics")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Chemin du socket Unix")
+    args = parser.parse_args()
+
+    # Modules chargés une fois pour toutes ; le pool de rendu est forké par le forkserver préchargé
+    SmartReportGenerator.preload()
+    load_matplotlib()
+    multiprocessing.set_forkserver_preload(CHART_PRELOAD_MODULES)
+    ensure_chart_pool()
+    logger.info(f"🔥 Worker prêt (pool de rendu: {CHART_WORKERS} processus)")
+    with ReportWorkerServer(args.socket, ReportRequestHandler) as server:
+        logger.info(f"🚀 Worker à l'écoute sur {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("🛑 Arrêt demandé par l'utilisateur")
+        finally:
+            if BaseReportGenerator.shared_chart_pool is not None:
+                BaseReportGenerator.shared_chart_pool.shutdown(wait=True)
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistiques roulantes multi-fenêtres pour FinAnalytics
+Moyennes et variances pour un ensemble de fenêtres en une seule passe de sommes cumulées
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Tuple
+
+TRADING_DAYS = 252
+
+
+def _cumulative_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """Sommes cumulées (préfixées de 0) des valeurs recentrées, de leurs carrés et des observations valides"""
+    valid = ~np.isnan(values)
+    # Recentrer sur la moyenne limite l'erreur d'annulation de E[x²] - E[x]²
+    shift = float(values[valid].mean()) if valid.any() else 0.0
+    centered = np.where(valid, values - shift, 0.0)
+
+    c1 = np.concatenate(([0.0], np.cumsum(centered)))
+    c2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    cn = np.concatenate(([0], np.cumsum(valid)))
+    return c1, c2, cn, shift
+
+
+def rolling_mean_var(values, windows: Iterable[int], ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule moyennes et variances roulantes pour plusieurs fenêtres en O(n) par fenêtre
+
+    Args:
+        values: Série de valeurs (les NaN invalident les fenêtres qui les contiennent)
+        windows: Tailles de fenêtres
+        ddof: Degrés de liberté (1 = écart-type échantillon, comme pandas)
+
+    Returns:
+        tuple: (moyennes, variances), tableaux de forme (len(windows), len(values))
+    """
+    x = np.asarray(values, dtype=float)
+    windows = [int(w) for w in windows]
+    n = len(x)
+
+    means = np.full((len(windows), n), np.nan)
+    variances = np.full((len(windows), n), np.nan)
+    if n == 0:
+        return means, variances
+
+    c1, c2, cn, shift = _cumulative_sums(x)
+
+    for i, window in enumerate(windows):
+        if window < 1 or window > n or window <= ddof:
+            continue
+
+        s1 = c1[window:] - c1[:-window]
+        s2 = c2[window:] - c2[:-window]
+        count = cn[window:] - cn[:-window]
+
+        var = (s2 - s1 * s1 / window) / (window - ddof)
+        complete = count == window
+
+        means[i, window - 1:] = np.where(complete, s1 / window + shift, np.nan)
+        variances[i, window - 1:] = np.where(complete, np.maximum(var, 0.0), np.nan)
+
+    return means, variances
+
+
+def rolling_volatility(returns: pd.Series, windows: Iterable[int], annualize: bool = True) -> pd.DataFrame:
+    """
+    Volatilités roulantes pour toutes les fenêtres en une passe
+
+    Returns:
+        pd.DataFrame: Une colonne par fenêtre, indexée comme les rendements
+    """
+    windows = list(windows)
+    _, variances = rolling_mean_var(returns.values, windows)
+    vol = np.sqrt(variances)
+    if annualize:
+        vol *= np.sqrt(TRADING_DAYS)
+
+    return pd.DataFrame(vol.T, index=returns.index, columns=windows)
+
+
+def trailing_volatility(returns: pd.Series, windows: Iterable[int], annualize: bool = True) -> Dict[int, float]:
+    """
+    Structure par terme de la volatilité réalisée (dernière valeur de chaque fenêtre)
+
+    Équivalent de returns.tail(w).std() pour chaque fenêtre, sans recalcul par fenêtre.
+    Les fenêtres plus longues que l'historique valent NaN.
+    """
+    windows = list(windows)
+    clean = returns.dropna()
+    _, variances = rolling_mean_var(clean.values, windows)
+
+    factor = np.sqrt(TRADING_DAYS) if annualize else 1.0
+    if variances.shape[1] == 0:
+        return {w: float('nan') for w in windows}
+    return {w: float(np.sqrt(variances[i, -1]) * factor) for i, w in enumerate(windows)}
+
+
+def rolling_regression(asset: pd.Series, benchmarks: pd.DataFrame, windows: Iterable[int],
+                       annualize: bool = True) -> Dict[int, Dict[str, pd.DataFrame]]:
+    """
+    Bêta, corrélation et alpha roulants de l'actif contre tous les benchmarks
+
+    Calculés à partir de produits croisés cumulés (une passe pour toutes les fenêtres
+    et tous les benchmarks) au lieu d'un np.cov par fenêtre. Une fenêtre contenant un
+    NaN pour l'actif ou le benchmark vaut NaN.
+
+    Args:
+        asset: Rendements de l'actif
+        benchmarks: Rendements des benchmarks (une colonne par benchmark), même index
+        windows: Tailles de fenêtres
+        annualize: Alpha annualisé (sinon quotidien)
+
+    Returns:
+        dict: {fenêtre: {'beta', 'correlation', 'alpha'}}, DataFrames indexés comme les rendements
+    """
+    y = asset.reindex(benchmarks.index).values.astype(float)[:, None]
+    x = benchmarks.values.astype(float)
+    n = len(x)
+
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    # Recentrage par colonne pour limiter l'erreur d'annulation
+    x_shift = np.array([x[valid[:, j], j].mean() if valid[:, j].any() else 0.0 for j in range(x.shape[1])])
+    y_shift = np.array([y[valid[:, j], 0].mean() if valid[:, j].any() else 0.0 for j in range(x.shape[1])])
+    xc = np.where(valid, x - x_shift, 0.0)
+    yc = np.where(valid, y - y_shift, 0.0)
+
+    def prefixed(values):
+        return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+    sx, sy = prefixed(xc), prefixed(yc)
+    sxx, syy, sxy = prefixed(xc * xc), prefixed(yc * yc), prefixed(xc * yc)
+    cn = prefixed(valid.astype(float))
+
+    factor = TRADING_DAYS if annualize else 1
+    results = {}
+    for window in (int(w) for w in windows):
+        beta = np.full(x.shape, np.nan)
+        correlation = np.full(x.shape, np.nan)
+        alpha = np.full(x.shape, np.nan)
+
+        if 1 < window <= n:
+            def window_sum(c):
+                return c[window:] - c[:-window]
+
+            mx, my = window_sum(sx) / window, window_sum(sy) / window
+            var_x = window_sum(sxx) / window - mx * mx
+            var_y = window_sum(syy) / window - my * my
+            cov_xy = window_sum(sxy) / window - mx * my
+            complete = window_sum(cn) == window
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                b = np.where(complete & (var_x > 0), cov_xy / var_x, np.nan)
+                r = np.where(complete, cov_xy / np.sqrt(np.maximum(var_x * var_y, 0.0)), np.nan)
+
+            beta[window - 1:] = b
+            correlation[window - 1:] = np.clip(r, -1.0, 1.0)
+            alpha[window - 1:] = ((my + y_shift) - b * (mx + x_shift)) * factor
+
+        results[window] = {
+            'beta': pd.DataFrame(beta, index=benchmarks.index, columns=benchmarks.columns),
+            'correlation': pd.DataFrame(correlation, index=benchmarks.index, columns=benchmarks.columns),
+            'alpha': pd.DataFrame(alpha, index=benchmarks.index, columns=benchmarks.columns)
+        }
+
+    return results
@@ -11,11 +11,54 @@ import sys
 import time
 import json
 import logging
+import signal
 import argparse
 import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
+# Rapports générés simultanément par le daemon (FINANALYTICS_REPORT_WORKERS ou --workers) :
+# un processus de génération pré-forké et une connexion base par worker
+REPORT_WORKERS = int(os.environ.get('FINANALYTICS_REPORT_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Rapport PROCESSING depuis plus longtemps (daemon arrêté ou tué en cours de génération) :
+# de nouveau réservable par n'importe quel worker
+STALE_PROCESSING_MINUTES = int(os.environ.get('FINANALYTICS_STALE_PROCESSING_MINUTES', '30'))
+
+# Colonnes d'un rapport lues par les workers
+REPORT_COLUMNS = """id, "userId", "assetSymbol", title, "reportType",
+                   "selectedCharts"::text[] AS "selectedCharts", "riskMetrics", "correlationAnalysis", "volatilityAnalysis",
+                   "fundamentalAnalysis", "technicalAnalysis", "sentimentAnalysis",
+                   "exportFormats", "includeRawData", "includeApiExport"""
+
+# Modules importés une seule fois par le serveur forkserver : les processus de génération
+# en sont forkés et partagent ces pages en lecture (copy-on-write) au lieu de tout réimporter.
+# matplotlib.font_manager charge le cache des polices, _fontdata les métriques des polices PDF.
+PRELOAD_MODULES = [
+    'numpy', 'pandas', 'matplotlib', 'matplotlib.font_manager', 'matplotlib.figure',
+    'matplotlib.backends.backend_agg', 'reportlab.platypus', 'reportlab.pdfbase._fontdata',
+    'plotting', 'smart_report_generator', 'report_config'
+]
+
+def init_report_process(report_workers: int):
+    """
+    Initialisation des processus de génération du daemon
+
+    Ctrl-C n'arrête que le daemon, qui attend la fin des rapports en cours. Les rapports
+    simultanés se partagent les cœurs : chacun rend ses graphiques et met en page ses sections
+    avec au plus cpu // report_workers processus (1 = dans le processus de génération).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    import report_base
+    import section_layout
+    budget = max(1, (os.cpu_count() or 1) // report_workers)
+    report_base.CHART_WORKERS = min(report_base.CHART_WORKERS, budget)
+    section_layout.LAYOUT_WORKERS = min(section_layout.LAYOUT_WORKERS, budget)
+
 # Configuration automatique de l'environnement
 def setup_environment():
     """Configure automatiquement l'environnement"""
@@ -58,12 +101,24 @@ logger = logging.getLogger(__name__)
 
 class FinAnalyticsSystem:
     
-    def __init__(self):
+    def __init__(self, workers: int = REPORT_WORKERS):
         self.db_url = setup_environment()
         self.running = False
+        self.workers = max(1, workers)
+        self.report_pool = None
+        self.pool_lock = threading.Lock()
+        # Arrêt demandé : les workers terminent leur rapport en cours sans en réserver d'autre
+        self.stop_event = threading.Event()
         logger.info("🚀 FinAnalytics PDF System initialisé")
         logger.info(f"📊 Base de données: {self.db_url}")
     
+    def __getstate__(self):
+        # Copie envoyée aux processus de génération : pool, verrou et événement ne se sérialisent pas
+        state = dict(self.__dict__)
+        for name in ('report_pool', 'pool_lock', 'stop_event'):
+            state.pop(name)
+        return state
+    
     def test_system(self):
         """Test rapide du système"""
         logger.info("🧪 Tests système...")
@@ -153,71 +208,170 @@ class FinAnalyticsSystem:
             logger.error(f"❌ Erreur scraping: {e}")
             return False
     
-    def process_reports(self):
-        """Traite les rapports en attente"""
-        logger.info("🔄 Début du traitement des rapports...")
+    def get_report_pool(self):
+        """
+        Pool de génération créé au premier rapport puis conservé par le daemon
+        
+        Les processus sont forkés par un serveur forkserver qui a préchargé PRELOAD_MODULES :
+        ils démarrent sans import et le daemon (connexions base ouvertes) n'est jamais forké.
+        None si forkserver n'est pas disponible (génération dans le processus principal).
+        """
+        if self.report_pool is not None:
+            return self.report_pool
+        if 'forkserver' not in multiprocessing.get_all_start_methods():
+            return None
         
         try:
-            import psycopg2
-            import psycopg2.extras
-            
-            conn = psycopg2.connect(self.db_url)
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            
-            # Récupérer les rapports PENDING
-            cursor.execute("""
-                SELECT id, "userId", "assetSymbol", title, "reportType"
-                FROM "reports" 
+            from smart_report_generator import SmartReportGenerator
+            
+            context = multiprocessing.get_context('forkserver')
+            generators = [module for module, _ in SmartReportGenerator.GENERATORS.values()]
+            context.set_forkserver_preload(PRELOAD_MODULES + generators)
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                       initializer=init_report_process, initargs=(self.workers,))
+            # Tâches simultanées : tous les processus sont forkés maintenant, avant le premier rapport
+            list(pool.map(time.sleep, [0.05] * self.workers))
+            self.report_pool = pool
+            logger.info(f"🔥 Pool de génération prêt ({self.workers} processus préchargés)")
+        except Exception as e:
+            logger.warning(f"⚠️ Pool de génération indisponible, génération directe: {e}")
+        return self.report_pool
+    
+    def shutdown_report_pool(self):
+        if self.report_pool is not None:
+            self.report_pool.shutdown(wait=True)
+            self.report_pool = None
+    
+    def generate_in_pool(self, report):
+        """Génère le PDF dans un processus du pool (ou directement sans pool)"""
+        with self.pool_lock:
+            pool = self.get_report_pool()
+        if pool is None:
+            return self.generate_real_pdf(report)
+        
+        try:
+            return pool.submit(self.generate_real_pdf, dict(report)).result()
+        except BrokenProcessPool:
+            # Processus de génération mort : le pool est recréé pour les rapports suivants
+            with self.pool_lock:
+                if self.report_pool is pool:
+                    logger.warning("⚠️ Pool de génération cassé, redémarrage")
+                    pool.shutdown(wait=False)
+                    self.report_pool = None
+            raise
+    
+    def claim_report(self, conn, cursor):
+        """
+        Réserve le plus ancien rapport PENDING (PENDING → PROCESSING)
+        
+        FOR UPDATE SKIP LOCKED : deux workers (ou deux daemons) ne réservent jamais le même
+        rapport et aucun n'attend le verrou d'un autre. Un rapport PROCESSING depuis plus de
+        STALE_PROCESSING_MINUTES (génération interrompue) est réservé de nouveau ; seul le
+        dernier worker à l'avoir réservé peut ensuite le terminer.
+        
+        Returns:
+            Ligne du rapport réservé, None si la file est vide
+        """
+        cursor.execute(f"""
+            UPDATE "reports"
+            SET status = 'PROCESSING', "processingStartedAt" = NOW(), "updatedAt" = NOW()
+            WHERE id = (
+                SELECT id FROM "reports"
                 WHERE status = 'PENDING'
+                   OR (status = 'PROCESSING' AND "processingStartedAt" < NOW() - %s * INTERVAL '1 minute')
                 ORDER BY "createdAt" ASC
-                LIMIT 10
-            """)
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {REPORT_COLUMNS}, "processingStartedAt"
+        """, (STALE_PROCESSING_MINUTES,))
+        report = cursor.fetchone()
+        conn.commit()
+        return report
+    
+    def process_report(self, conn, cursor, report):
+        """Génère un rapport réservé puis le passe en COMPLETED ou FAILED (uniquement s'il est toujours réservé par ce worker)"""
+        try:
+            logger.info(f"🔄 Traitement rapport {report['id']} ({report['assetSymbol']})")
             
-            reports = cursor.fetchall()
+            # Générer le PDF réel
+            pdf_path = self.generate_in_pool(report)
             
-            if not reports:
-                logger.info("📋 Aucun rapport en attente")
-                conn.close()
-                return True
+            if not pdf_path:
+                raise Exception("Échec de génération PDF")
             
-            for report in reports:
-                try:
-                    logger.info(f"🔄 Traitement rapport {report['id']} ({report['assetSymbol']})")
-                    
-                    # Marquer comme en cours
-                    cursor.execute("""
-                        UPDATE "reports" 
-                        SET status = 'PROCESSING', "processingStartedAt" = NOW(), "updatedAt" = NOW()
-                        WHERE id = %s
-                    """, (report['id'],))
-                    conn.commit()
-                    
-                    # Générer le PDF réel
-                    pdf_path = self.generate_real_pdf(report)
-                    
-                    if not pdf_path:
-                        raise Exception("Échec de génération PDF")
-                    
-                    cursor.execute("""
-                        UPDATE "reports" 
-                        SET status = 'COMPLETED', "completedAt" = NOW(), "pdfPath" = %s, "updatedAt" = NOW()
-                        WHERE id = %s
-                    """, (pdf_path, report['id']))
-                    conn.commit()
-                    
-                    logger.info(f"✅ Rapport {report['id']} terminé")
-                    
-                except Exception as e:
-                    logger.error(f"❌ Erreur rapport {report['id']}: {e}")
-                    cursor.execute("""
-                        UPDATE "reports" 
-                        SET status = 'FAILED', "failureReason" = %s, "updatedAt" = NOW()
-                        WHERE id = %s
-                    """, (str(e), report['id']))
-                    conn.commit()
+            exports = self.export_files(report, pdf_path)
+            
+            cursor.execute("""
+                UPDATE "reports" 
+                SET status = 'COMPLETED', "completedAt" = NOW(), "pdfPath" = %s,
+                    "csvPath" = %s, "jsonPath" = %s, "excelPath" = %s, "updatedAt" = NOW()
+                WHERE id = %s AND status = 'PROCESSING' AND "processingStartedAt" = %s
+            """, (pdf_path, exports.get('CSV'), exports.get('JSON'), exports.get('EXCEL'), report['id'],
+                  report['processingStartedAt']))
+            conn.commit()
+            
+            logger.info(f"✅ Rapport {report['id']} terminé")
             
+        except Exception as e:
+            logger.error(f"❌ Erreur rapport {report['id']}: {e}")
+            conn.rollback()
+            cursor.execute("""
+                UPDATE "reports" 
+                SET status = 'FAILED', "failureReason" = %s, "updatedAt" = NOW()
+                WHERE id = %s AND status = 'PROCESSING' AND "processingStartedAt" = %s
+            """, (str(e), report['id'], report['processingStartedAt']))
+            conn.commit()
+    
+    def report_worker(self):
+        """
+        Worker de traitement : sa propre connexion base, des rapports réservés un par un
+        jusqu'à vider la file ; la génération elle-même tourne dans le pool de processus
+        
+        Returns:
+            int: Nombre de rapports traités
+        """
+        import psycopg2
+        import psycopg2.extras
+        
+        processed = 0
+        conn = psycopg2.connect(self.db_url)
+        try:
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            while not self.stop_event.is_set():
+                report = self.claim_report(conn, cursor)
+                if report is None:
+                    break
+                self.process_report(conn, cursor, report)
+                processed += 1
+        finally:
             conn.close()
-            logger.info(f"🔄 Traitement terminé: {len(reports)} rapports traités")
+        return processed
+    
+    def process_reports(self):
+        """Traite les rapports en attente avec self.workers workers simultanés"""
+        logger.info("🔄 Début du traitement des rapports...")
+        
+        try:
+            # Sans pool de processus, la génération reste dans ce processus : un seul worker
+            with self.pool_lock:
+                workers = self.workers if self.get_report_pool() is not None else 1
+            
+            self.stop_event.clear()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-worker') as threads:
+                futures = [threads.submit(self.report_worker) for _ in range(workers)]
+                try:
+                    processed = sum(future.result() for future in futures)
+                except KeyboardInterrupt:
+                    # Les processus de génération ignorent SIGINT : les rapports en cours se terminent
+                    # (statut cohérent), aucun autre n'est réservé
+                    self.stop_event.set()
+                    raise
+            
+            if not processed:
+                logger.info("📋 Aucun rapport en attente")
+            else:
+                logger.info(f"🔄 Traitement terminé: {processed} rapports traités ({workers} workers)")
             return True
             
         except Exception as e:
@@ -251,6 +405,8 @@ class FinAnalyticsSystem:
             except Exception as e:
                 logger.error(f"❌ Erreur daemon: {e}")
                 time.sleep(60)  # Attendre avant de retry
+        
+        self.shutdown_report_pool()
     
     def generate_real_pdf(self, report):
         """Génère un PDF selon le type de rapport demandé avec le Smart Generator"""
@@ -274,7 +430,9 @@ class FinAnalyticsSystem:
                 'PRICER': 'PRICER'
             }
             
-            pdf_filename = f"{type_prefix.get(report_type, 'REPORT')}_{symbol}_{timestamp}.pdf"
+            # Identifiant du rapport dans le nom : deux workers peuvent générer le même type
+            # pour le même symbole dans la même seconde
+            pdf_filename = f"{type_prefix.get(report_type, 'REPORT')}_{symbol}_{timestamp}_{report['id']}.pdf"
             
             # Créer dans le dossier public pour que l'API puisse le servir
             public_reports_dir = Path("../public/reports")
@@ -282,10 +440,13 @@ class FinAnalyticsSystem:
             
             pdf_path = public_reports_dir / pdf_filename
             
-            # Utiliser le nouveau SmartReportGenerator
-            from smart_report_generator import generate_smart_report
+            # Utiliser le nouveau SmartReportGenerator avec la configuration du rapport
+            from smart_report_generator import SmartReportGenerator
+            from report_config import ReportConfig
             
-            success = generate_smart_report(symbol, report_type, str(pdf_path))
+            config = ReportConfig.from_dict(dict(report))
+            success = SmartReportGenerator.generate_report(symbol, report_type, str(pdf_path),
+                                                           report.get('userId'), config)
             
             if not success:
                 raise Exception(f"Échec de la génération SMART {report_type}")
@@ -311,6 +472,19 @@ class FinAnalyticsSystem:
             except:
                 return None
 
+    def export_files(self, report, pdf_filename):
+        """Fichiers d'export écrits à côté du PDF (même nom, extension du format)"""
+        try:
+            from exporters import export_paths
+            from report_config import ReportConfig
+            
+            formats = ReportConfig.from_dict(dict(report)).data_exports
+            paths = export_paths(str(Path("../public/reports") / pdf_filename), formats)
+            return {fmt: os.path.basename(path) for fmt, path in paths.items() if os.path.exists(path)}
+        except Exception as e:
+            logger.error(f"❌ Erreur lecture des exports: {e}")
+            return {}
+
     def generate_fallback_pdf(self, report):
         """Générateur PDF de secours (ancien système)"""
         try:
@@ -352,7 +526,7 @@ class FinAnalyticsSystem:
             
             # Générer le PDF
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            pdf_filename = f"rapport_fallback_{symbol}_{timestamp}.pdf"
+            pdf_filename = f"rapport_fallback_{symbol}_{timestamp}_{report['id']}.pdf"
             
             # Créer dans le dossier public pour que l'API puisse le servir
             public_reports_dir = Path("../public/reports")
@@ -525,10 +699,12 @@ def main():
     parser = argparse.ArgumentParser(description='FinAnalytics PDF System')
     parser.add_argument('action', choices=['test', 'scrape', 'process', 'daemon', 'status'], 
                        help='Action à exécuter')
+    parser.add_argument('--workers', type=int, default=REPORT_WORKERS,
+                       help='Rapports générés simultanément (process, daemon)')
     
     args = parser.parse_args()
     
-    system = FinAnalyticsSystem()
+    system = FinAnalyticsSystem(args.workers)
     
     if args.action == 'test':
         success = system.test_system()
@@ -540,6 +716,7 @@ def main():
     
     elif args.action == 'process':
         success = system.process_reports()
+        system.shutdown_report_pool()
         sys.exit(0 if success else 1)
     
     elif args.action == 'daemon':
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de scénarios et de stress tests FinAnalytics
+Chocs historiques et hypothétiques appliqués via les bêtas factoriels, en un seul produit matriciel
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+# Facteurs exprimés en variation absolue (points de rendement) plutôt qu'en rendement
+LEVEL_FACTORS = {'^TNX'}
+
+FACTOR_LABELS = {
+    '^GSPC': 'S&P 500',
+    '^DJI': 'Dow Jones',
+    '^IXIC': 'NASDAQ',
+    '^RUT': 'Russell 2000',
+    '^VIX': 'VIX',
+    '^TNX': 'Taux 10 ans US'
+}
+
+# Chocs historiques approximatifs (creux de marché), rendements en fraction, ^TNX en points de %
+HISTORICAL_SCENARIOS = {
+    'Krach dot-com (2000-2002)': {
+        '^GSPC': -0.49, '^DJI': -0.38, '^IXIC': -0.78, '^RUT': -0.46, '^VIX': 0.45, '^TNX': -1.9
+    },
+    'Crise financière (sept.-nov. 2008)': {
+        '^GSPC': -0.41, '^DJI': -0.36, '^IXIC': -0.43, '^RUT': -0.46, '^VIX': 2.60, '^TNX': -1.3
+    },
+    'Krach août 2011': {
+        '^GSPC': -0.17, '^DJI': -0.15, '^IXIC': -0.16, '^RUT': -0.23, '^VIX': 1.65, '^TNX': -0.6
+    },
+    'Taper tantrum (2013)': {
+        '^GSPC': -0.06, '^DJI': -0.05, '^IXIC': -0.05, '^RUT': -0.07, '^VIX': 0.60, '^TNX': 0.9
+    },
+    'Covid-19 (févr.-mars 2020)': {
+        '^GSPC': -0.34, '^DJI': -0.37, '^IXIC': -0.30, '^RUT': -0.41, '^VIX': 4.70, '^TNX': -0.8
+    },
+    'Choc de taux (2022)': {
+        '^GSPC': -0.25, '^DJI': -0.21, '^IXIC': -0.35, '^RUT': -0.27, '^VIX': 0.90, '^TNX': 2.5
+    }
+}
+
+HYPOTHETICAL_SCENARIOS = {
+    'Marché -10%': {'^GSPC': -0.10, '^DJI': -0.10, '^IXIC': -0.10, '^RUT': -0.10, '^VIX': 0.50},
+    'Marché -20%': {'^GSPC': -0.20, '^DJI': -0.20, '^IXIC': -0.20, '^RUT': -0.20, '^VIX': 1.00},
+    'Marché +10%': {'^GSPC': 0.10, '^DJI': 0.10, '^IXIC': 0.10, '^RUT': 0.10, '^VIX': -0.25},
+    'Taux +100 pb': {'^TNX': 1.0},
+    'Taux -100 pb': {'^TNX': -1.0},
+    'Pic de volatilité (VIX x2)': {'^VIX': 1.0},
+    'Rotation hors technologie': {'^IXIC': -0.15, '^GSPC': -0.05, '^DJI': -0.02, '^RUT': -0.05},
+    'Stress small caps': {'^RUT': -0.20, '^GSPC': -0.08, '^DJI': -0.07, '^IXIC': -0.09}
+}
+
+# Facteur actions large : les autres indices actions sont régressés en écart à celui-ci
+BROAD_MARKET = '^GSPC'
+EQUITY_STYLE_FACTORS = ('^DJI', '^IXIC', '^RUT')
+
+# Les indices actions sont corrélés à plus de 0,9 : en MCO jointe, leurs bêtas individuels changent
+# de signe et de taille d'un échantillon à l'autre. Les écarts de style (indice - S&P 500) reçoivent
+# un a priori gaussien centré sur 0 d'écart-type STYLE_PRIOR_STD, soit une pénalité ridge égale à
+# la variance résiduelle de l'actif divisée par STYLE_PRIOR_STD² : l'exposition commune est portée
+# par le marché large, un bêta de style ne subsiste que s'il est nettement présent dans les données.
+STYLE_PRIOR_STD = 0.2
+
+# Régularisation numérique de tous les facteurs (conditionnement de la matrice de Gram)
+RIDGE_PENALTY = 1e-6
+
+
+def factor_returns(market_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Rendements quotidiens des facteurs (variation absolue pour les taux)"""
+    columns = {}
+    for symbol, hist in market_data.items():
+        if hist is None or hist.empty or 'Close' not in hist:
+            continue
+        close = hist['Close']
+        columns[symbol] = close.diff() if symbol in LEVEL_FACTORS else close.pct_change()
+    return pd.DataFrame(columns)
+
+
+def _style_transform(factors) -> np.ndarray:
+    """
+    Passage facteurs -> (marché large, écarts de style, autres facteurs) : z = x @ T
+
+    Les bêtas estimés sur z se ramènent aux facteurs d'origine par β = T @ b : le changement
+    de variables ne modifie pas l'ajustement, il permet de pénaliser les seuls écarts de style.
+    """
+    factors = list(factors)
+    transform = np.eye(len(factors))
+    if BROAD_MARKET in factors:
+        market = factors.index(BROAD_MARKET)
+        for j, factor in enumerate(factors):
+            if factor in EQUITY_STYLE_FACTORS:
+                transform[market, j] = -1.0
+    return transform
+
+
+def estimate_betas(asset_returns: pd.DataFrame, factors: pd.DataFrame, min_observations: int = 60) -> pd.DataFrame:
+    """
+    Bêtas multi-factoriels par régression ridge : marché large, VIX et taux sans a priori,
+    écarts de style ramenés vers 0 (voir STYLE_PRIOR_STD)
+
+    Args:
+        asset_returns: Une colonne par actif
+        factors: Une colonne par facteur
+
+    Returns:
+        pd.DataFrame: Bêtas (facteurs × actifs), plus les lignes 'alpha' et 'r2'
+    """
+    aligned = pd.concat([asset_returns, factors], axis=1, join='inner').dropna()
+    if len(aligned) < min_observations:
+        raise ValueError(f"Historique commun insuffisant pour estimer les bêtas ({len(aligned)} obs.)")
+
+    y = aligned[asset_returns.columns].values
+    x = aligned[factors.columns].values
+    transform = _style_transform(factors.columns)
+    z = x @ transform
+
+    # Recentrage : l'intercept (alpha) est retiré avant la régression
+    x_mean, y_mean = x.mean(axis=0), y.mean(axis=0)
+    zc, yc = z - z.mean(axis=0), y - y_mean
+
+    gram = zc.T @ zc
+    moments = zc.T @ yc
+    numeric = RIDGE_PENALTY * np.trace(gram) / len(gram)
+    style = [j for j, factor in enumerate(factors.columns)
+             if factor in EQUITY_STYLE_FACTORS and BROAD_MARKET in factors.columns]
+    if not style:
+        betas = np.linalg.solve(gram + numeric * np.eye(len(gram)), moments)
+    else:
+        # Variance résiduelle de chaque actif hors facteurs de style : échelle de l'a priori
+        base = [j for j in range(len(gram)) if j not in style]
+        base_betas = np.linalg.lstsq(zc[:, base], yc, rcond=None)[0]
+        residual_var = ((yc - zc[:, base] @ base_betas) ** 2).sum(axis=0) / max(len(yc) - len(base) - 1, 1)
+
+        betas = np.empty((len(gram), yc.shape[1]))
+        for a in range(yc.shape[1]):
+            penalty = np.full(len(gram), numeric)
+            penalty[style] += residual_var[a] / STYLE_PRIOR_STD ** 2
+            betas[:, a] = np.linalg.solve(gram + np.diag(penalty), moments[:, a])
+    betas = transform @ betas
+
+    residuals = yc - (x - x_mean) @ betas
+    r2 = 1 - (residuals ** 2).sum(axis=0) / (yc ** 2).sum(axis=0)
+    alpha = y_mean - x_mean @ betas
+
+    result = pd.DataFrame(betas, index=factors.columns, columns=asset_returns.columns)
+    result.loc['alpha'] = alpha
+    result.loc['r2'] = r2
+    return result
+
+
+def scenario_matrix(scenarios: Dict[str, Dict[str, float]], factors: Iterable[str]) -> pd.DataFrame:
+    """Matrice des chocs (scénarios × facteurs), facteurs absents à 0"""
+    factors = list(factors)
+    return pd.DataFrame(
+        [[shocks.get(factor, 0.0) for factor in factors] for shocks in scenarios.values()],
+        index=list(scenarios.keys()),
+        columns=factors
+    )
+
+
+def evaluate_scenarios(betas: pd.DataFrame, scenarios: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+    """
+    Impact de tous les scénarios sur tous les actifs en un seul produit matriciel
+
+    Returns:
+        pd.DataFrame: Rendement estimé (scénarios × actifs), borné à -100%
+    """
+    if scenarios is None:
+        scenarios = {**HISTORICAL_SCENARIOS, **HYPOTHETICAL_SCENARIOS}
+
+    factor_betas = betas.drop(index=['alpha', 'r2'], errors='ignore')
+    shocks = scenario_matrix(scenarios, factor_betas.index)
+
+    impacts = shocks.values @ factor_betas.values
+    return pd.DataFrame(np.maximum(impacts, -1.0), index=shocks.index, columns=factor_betas.columns)
+
+
+def simulate_price_paths(returns: pd.Series, current_price: float, horizon_days: int = 252, n_paths: int = 5000,
+                         percentiles: Iterable[float] = (5, 25, 50, 75, 95), seed: int = 42) -> pd.DataFrame:
+    """
+    Monte Carlo par bootstrap des rendements logarithmiques historiques
+
+    Returns:
+        pd.DataFrame: Percentiles des prix simulés (jours × percentiles), jour 0 = prix actuel
+    """
+    log_returns = np.log1p(returns.dropna().values)
+    rng = np.random.default_rng(seed)
+
+    draws = log_returns[rng.integers(0, len(log_returns), (n_paths, horizon_days))]
+    paths = current_price * np.exp(np.cumsum(draws, axis=1))
+
+    percentiles = list(percentiles)
+    bands = np.percentile(paths, percentiles, axis=0).T
+    bands = np.vstack([np.full(len(percentiles), current_price), bands])
+    return pd.DataFrame(bands, index=np.arange(horizon_days + 1), columns=percentiles)
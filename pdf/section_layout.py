@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mise en page par sections des rapports FinAnalytics
+Le story est découpé aux sauts de page en sections indépendantes, mises en page en parallèle
+dans des processus forkés puis concaténées ; la table des matières et la numérotation
+des pages sont calculées sur le document assemblé
+"""
+
+import io
+import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, PageBreak, SimpleDocTemplate
+
+from vector_charts import VECTOR_AVAILABLE
+
+if VECTOR_AVAILABLE:
+    from pdfrw import PdfReader, PdfWriter, PageMerge
+
+logger = logging.getLogger(__name__)
+
+# Processus de mise en page par rapport (1 = sections mises en page dans le processus principal)
+LAYOUT_WORKERS = min(4, os.cpu_count() or 1)
+
+# En dessous, le coût du fork dépasse le gain du parallélisme
+MIN_PARALLEL_SECTIONS = 4
+
+# Mises en page de la table des matières avant d'abandonner la convergence (longueur de la table)
+MAX_CONTENTS_PASSES = 3
+
+# Sections du story en cours d'assemblage, héritées par les processus forkés
+_SECTIONS = None
+
+
+class ContentsPlaceholder(Flowable):
+    """
+    Emplacement de la table des matières dans le story
+
+    build(entries) renvoie les flowables de la table pour une liste de (titre, page) ;
+    la table est mise en page en dernier, une fois les numéros de page connus.
+    """
+
+    def __init__(self, build: Callable[[List[Tuple[str, int]]], List[Flowable]]):
+        super().__init__()
+        self.build = build
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+class SectionDocTemplate(SimpleDocTemplate):
+    """Document relevant la page de chaque titre de section (attributs toc_title / toc_titles)"""
+
+    def __init__(self, filename, geometry, **kwargs):
+        pagesize, left, right, top, bottom = geometry
+        super().__init__(filename, pagesize=pagesize, leftMargin=left, rightMargin=right,
+                         topMargin=top, bottomMargin=bottom, **kwargs)
+        self.toc_entries = []
+
+    def afterFlowable(self, flowable):
+        title = getattr(flowable, 'toc_title', None)
+        titles = [title] if title else getattr(flowable, 'toc_titles', ())
+        self.toc_entries.extend((title, self.page) for title in titles)
+
+
+def page_geometry(doc) -> tuple:
+    """Format et marges d'un document (identiques pour toutes les sections et fragments)"""
+    return (tuple(doc.pagesize), doc.leftMargin, doc.rightMargin, doc.topMargin, doc.bottomMargin)
+
+
+def split_sections(story: List[Flowable]) -> List[List[Flowable]]:
+    """Découpe le story aux sauts de page ; les sections vides (sauts consécutifs) sont ignorées"""
+    sections, current = [], []
+    for flowable in story:
+        if isinstance(flowable, PageBreak):
+            if current:
+                sections.append(current)
+            current = []
+        else:
+            current.append(flowable)
+    if current:
+        sections.append(current)
+    return sections
+
+
+def _fresh(story: List[Flowable]) -> List[Flowable]:
+    """
+    Copie du story prête pour une nouvelle mise en page
+
+    reportlab marque les flowables reportés à la page suivante (_postponed) et refuse de les
+    reporter une seconde fois : une mise en page répétée doit repartir d'un état vierge.
+    """
+    for flowable in story:
+        flowable.__dict__.pop('_postponed', None)
+    return list(story)
+
+
+def layout_section(story: List[Flowable], geometry: tuple) -> Tuple[bytes, list, int]:
+    """
+    Met en page une section seule
+
+    Returns:
+        tuple: (PDF, [(titre, page dans la section)], nombre de pages)
+    """
+    buffer = io.BytesIO()
+    doc = SectionDocTemplate(buffer, geometry)
+    doc.build(_fresh(story))
+    return buffer.getvalue(), doc.toc_entries, doc.page
+
+
+def _layout_job(index: int):
+    """Tâche d'un processus forké : les lots sont lus dans la mémoire héritée"""
+    stories, geometry = _SECTIONS
+    return layout_section(stories[index], geometry)
+
+
+def draw_page_number(canvas, number: int, total: int, label: str, pagesize):
+    """Pied de page : libellé du rapport et numéro de page"""
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(colors.HexColor('#9ca3af'))
+    canvas.drawCentredString(pagesize[0] / 2, 8, f"{label} — Page {number} / {total}")
+    canvas.restoreState()
+
+
+def _partition(count: int, contents: Optional[int], workers: int) -> List[List[int]]:
+    """
+    Regroupe les sections consécutives en lots de mise en page
+
+    La table des matières forme un lot à part ; les autres sections sont réparties en au plus
+    `workers` lots contigus (un document par lot limite le coût fixe de chaque mise en page).
+    """
+    if contents is None:
+        runs = [list(range(count))]
+    else:
+        runs = [list(range(contents)), None, list(range(contents + 1, count))]
+    others = count - (contents is not None)
+
+    groups = []
+    for run in runs:
+        if run is None:
+            groups.append([contents])
+            continue
+        if not run:
+            continue
+        parts = max(1, min(len(run), round(workers * len(run) / others)))
+        bounds = [round(k * len(run) / parts) for k in range(parts + 1)]
+        groups.extend(run[start:end] for start, end in zip(bounds, bounds[1:]))
+    return groups
+
+
+def _join(sections: List[List[Flowable]], group: List[int]) -> List[Flowable]:
+    """Story d'un lot : ses sections séparées par des sauts de page"""
+    story = []
+    for index in group:
+        if story:
+            story.append(PageBreak())
+        story.extend(sections[index])
+    return story
+
+
+def _layout_groups(stories, geometry, indices, workers) -> dict:
+    """Met en page les lots demandés, dans des processus forkés si plusieurs lots"""
+    global _SECTIONS
+    if workers <= 1 or len(indices) <= 1:
+        return {i: layout_section(stories[i], geometry) for i in indices}
+
+    _SECTIONS = (stories, geometry)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(indices)),
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            return dict(zip(indices, pool.map(_layout_job, indices)))
+    except Exception as e:
+        logger.warning(f"Mise en page parallèle indisponible, mise en page séquentielle: {e}")
+        return {i: layout_section(stories[i], geometry) for i in indices}
+    finally:
+        _SECTIONS = None
+
+
+def _expand_contents(section: List[Flowable], entries) -> List[Flowable]:
+    """Remplace l'emplacement de la table des matières par la table construite"""
+    expanded = []
+    for flowable in section:
+        if isinstance(flowable, ContentsPlaceholder):
+            expanded.extend(flowable.build(entries))
+        else:
+            expanded.append(flowable)
+    return expanded
+
+
+def assemble(story: List[Flowable], geometry: tuple, output, label: str,
+             numbered_from: int = 2, workers: Optional[int] = None):
+    """
+    Met en page le story section par section puis assemble le PDF final
+
+    Args:
+        story: Story complet (graphiques résolus), sections séparées par des PageBreak
+        geometry: Format et marges (page_geometry)
+        output: Chemin ou flux binaire de sortie (écrit séquentiellement, sans repositionnement)
+        label: Libellé du pied de page
+        numbered_from: Première page numérotée (la page de garde ne l'est pas)
+        workers: Processus de mise en page (LAYOUT_WORKERS par défaut, lu à l'appel)
+    """
+    if workers is None:
+        workers = LAYOUT_WORKERS
+    if not VECTOR_AVAILABLE:
+        build_single(story, geometry, output, label, numbered_from)
+        return
+
+    sections = split_sections(story)
+    contents = next((i for i, section in enumerate(sections)
+                     if any(isinstance(f, ContentsPlaceholder) for f in section)), None)
+
+    if len(sections) < MIN_PARALLEL_SECTIONS or 'fork' not in multiprocessing.get_all_start_methods():
+        workers = 1
+    groups = _partition(len(sections), contents, workers)
+    stories = [_join(sections, group) for group in groups]
+    toc = next((i for i, group in enumerate(groups) if group == [contents]), None)
+
+    layouts = _layout_groups(stories, geometry, [i for i in range(len(groups)) if i != toc], workers)
+
+    if toc is not None:
+        # La table est mise en page en dernier : sa longueur décale les pages qui la suivent
+        toc_pages = 1
+        for _ in range(MAX_CONTENTS_PASSES):
+            entries = _global_entries(layouts, len(groups), toc, toc_pages)
+            layouts[toc] = layout_section(_expand_contents(stories[toc], entries), geometry)
+            if layouts[toc][2] == toc_pages:
+                break
+            toc_pages = layouts[toc][2]
+
+    writer = PdfWriter()
+    for i in range(len(groups)):
+        writer.addpages(PdfReader(fdata=layouts[i][0]).pages)
+
+    _stamp_page_numbers(writer.pagearray, geometry[0], label, numbered_from)
+    writer.write(output)
+
+
+def _global_entries(layouts, count, toc, toc_pages) -> list:
+    """Titres de section et leur page dans le document assemblé"""
+    entries, offset = [], 0
+    for i in range(count):
+        if i == toc:
+            offset += toc_pages
+            continue
+        _, group_entries, pages = layouts[i]
+        entries.extend((title, offset + page) for title, page in group_entries)
+        offset += pages
+    return entries
+
+
+def _stamp_page_numbers(pages, pagesize, label, numbered_from):
+    """Superpose les numéros de page sur les pages assemblées"""
+    total = len(pages)
+    if total < numbered_from:
+        return
+
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, pagesize=pagesize)
+    for number in range(numbered_from, total + 1):
+        draw_page_number(canvas, number, total, label, pagesize)
+        canvas.showPage()
+    canvas.save()
+
+    overlays = PdfReader(fdata=buffer.getvalue()).pages
+    for page, overlay in zip(pages[numbered_from - 1:], overlays):
+        PageMerge(page).add(overlay).render()
+
+
+def build_single(story: List[Flowable], geometry: tuple, output, label: str, numbered_from: int = 2):
+    """
+    Mise en page en un seul document (sans pdfrw pour concaténer)
+
+    La table des matières est reconstruite jusqu'à ce que les numéros de page se stabilisent ;
+    chaque passe est mise en page en mémoire et seule la dernière est écrite (sortie non
+    repositionnable : pipe, sortie standard).
+    """
+    entries, total = [], 0
+    for _ in range(MAX_CONTENTS_PASSES + 1):
+        def on_page(canvas, doc, total=total):
+            if doc.page >= numbered_from:
+                draw_page_number(canvas, doc.page, total, label, geometry[0])
+
+        buffer = io.BytesIO()
+        doc = SectionDocTemplate(buffer, geometry)
+        doc.build(_fresh(_expand_contents(story, entries)), onFirstPage=on_page, onLaterPages=on_page)
+        if doc.toc_entries == entries and doc.page == total:
+            break
+        entries, total = doc.toc_entries, doc.page
+
+    if hasattr(output, 'write'):
+        output.write(buffer.getvalue())
+    else:
+        with open(output, 'wb') as stream:
+            stream.write(buffer.getvalue())
@@ -3,24 +3,35 @@
 
 """
 Smart Report Generator - Router vers les générateurs spécialisés
+Les générateurs (reportlab, matplotlib, yfinance...) ne sont importés qu'au premier
+rapport de leur type : les métriques JSON et l'aide en ligne de commande démarrent sans eux
 """
 
+import io
 import os
 import sys
+import json
 import logging
 import time
+import importlib
+import subprocess
 from datetime import datetime
 
-# Import des générateurs spécialisés
-from baseline_generator import BaselineReportGenerator
-from benchmark_generator import BenchmarkReportGenerator
-from detailed_generator import DetailedReportGenerator
-from deep_analysis_generator import DeepAnalysisReportGenerator
-from pricer_generator import PricerReportGenerator
+from report_config import ReportConfig
+from report_output import STDOUT, describe, is_file_target
+from exporters import (ReportDataset, export_dataset, export_paths, price_metrics,
+                       relative_metrics, valuation_metrics)
+from market_data import market_data
 
 # Import du système de logs
 from report_logger import log_generation_start, log_generation_success, log_generation_error
 
+# Budget de démarrage à froid d'un rapport (import du routeur puis du générateur), vérifié par --import-time
+IMPORT_BUDGET_SECONDS = 1.5
+
+# Modules réservés au premier téléchargement (market_data) : jamais chargés par l'import d'un générateur
+LAZY_MODULES = ('yfinance',)
+
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -28,25 +39,63 @@ logger = logging.getLogger(__name__)
 class SmartReportGenerator:
     """Router intelligent vers les générateurs spécialisés"""
     
-    # Mapping des types de rapports vers les générateurs
+    # Mapping des types de rapports vers les générateurs (module, classe), importés au premier usage
     GENERATORS = {
-        'BASELINE': BaselineReportGenerator,
-        'BENCHMARK': BenchmarkReportGenerator,
-        'DETAILED': DetailedReportGenerator,
-        'DEEP_ANALYSIS': DeepAnalysisReportGenerator,
-        'PRICER': PricerReportGenerator
+        'BASELINE': ('baseline_generator', 'BaselineReportGenerator'),
+        'BENCHMARK': ('benchmark_generator', 'BenchmarkReportGenerator'),
+        'DETAILED': ('detailed_generator', 'DetailedReportGenerator'),
+        'DEEP_ANALYSIS': ('deep_analysis_generator', 'DeepAnalysisReportGenerator'),
+        'PRICER': ('pricer_generator', 'PricerReportGenerator')
     }
     
     @staticmethod
-    def generate_report(symbol: str, report_type: str, output_path: str, user_id: str = None) -> bool:
+    def get_generator(report_type: str):
+        """Classe du générateur d'un type de rapport (module importé au premier appel)"""
+        module_name, class_name = SmartReportGenerator.GENERATORS[report_type]
+        return getattr(importlib.import_module(module_name), class_name)
+    
+    @staticmethod
+    def measure_import_times(report_types=None) -> dict:
+        """
+        Temps d'import à froid de chaque type de rapport, mesuré dans un interpréteur neuf
+        
+        Returns:
+            dict: {type: (secondes d'import du routeur, secondes d'import du générateur,
+                          modules de LAZY_MODULES chargés par ces imports)}
+        """
+        script = ("import sys, time; start = time.perf_counter(); "
+                  "from smart_report_generator import SmartReportGenerator, LAZY_MODULES; "
+                  "router = time.perf_counter(); "
+                  "SmartReportGenerator.get_generator(sys.argv[1]); "
+                  "print(router - start, time.perf_counter() - router, "
+                  "','.join(m for m in LAZY_MODULES if m in sys.modules) or '-')")
+        here = os.path.dirname(os.path.abspath(__file__))
+        timings = {}
+        for report_type in report_types or SmartReportGenerator.GENERATORS:
+            result = subprocess.run([sys.executable, '-c', script, report_type], cwd=here,
+                                    capture_output=True, text=True, check=True)
+            router, generator, loaded = result.stdout.split()[-3:]
+            timings[report_type] = (float(router), float(generator), [] if loaded == '-' else loaded.split(','))
+        return timings
+    
+    @staticmethod
+    def preload(report_types=None):
+        """Importe les générateurs à l'avance (processus longue durée : worker, daemon)"""
+        for report_type in report_types or SmartReportGenerator.GENERATORS:
+            SmartReportGenerator.get_generator(report_type)
+    
+    @staticmethod
+    def generate_report(symbol: str, report_type: str, output_path, user_id: str = None,
+                        config: ReportConfig = None) -> bool:
         """
         Génère un rapport en utilisant le générateur spécialisé approprié
         
         Args:
             symbol: Symbole boursier
             report_type: Type de rapport (BASELINE, BENCHMARK, DETAILED, DEEP_ANALYSIS, PRICER)
-            output_path: Chemin de sortie du PDF
+            output_path: Chemin de sortie du PDF, '-' pour la sortie standard ou flux binaire ouvert
             user_id: ID utilisateur (optionnel)
+            config: Graphiques et sections demandés (optionnel, tout par défaut)
             
         Returns:
             bool: True si succès, False sinon
@@ -58,8 +107,10 @@ class SmartReportGenerator:
         
         try:
             logger.info(f"🚀 Génération rapport {report_type} pour {symbol}")
-            logger.info(f"📁 Chemin de sortie: {output_path}")
+            logger.info(f"📁 Chemin de sortie: {describe(output_path)}")
             logger.info(f"📂 Répertoire de travail: {os.getcwd()}")
+            if config is not None:
+                logger.info(f"🧩 Configuration: {config.to_dict()}")
             
             # Validation du type de rapport
             if report_type not in SmartReportGenerator.GENERATORS:
@@ -77,18 +128,18 @@ class SmartReportGenerator:
                 return False
             
             # Validation du chemin de sortie
-            output_dir = os.path.dirname(output_path)
+            output_dir = os.path.dirname(output_path) if is_file_target(output_path) else None
             if output_dir and not os.path.exists(output_dir):
                 logger.info(f"📁 Création du répertoire: {output_dir}")
                 os.makedirs(output_dir, exist_ok=True)
             
             # Récupération du générateur approprié
-            logger.info(f"🏭 Utilisation du générateur: {SmartReportGenerator.GENERATORS[report_type].__name__}")
-            generator_class = SmartReportGenerator.GENERATORS[report_type]
+            generator_class = SmartReportGenerator.get_generator(report_type)
+            logger.info(f"🏭 Utilisation du générateur: {generator_class.__name__}")
             
             # Création et exécution du générateur
             logger.info(f"🔨 Création de l'instance du générateur...")
-            generator = generator_class(symbol, output_path)
+            generator = generator_class(symbol, output_path, config)
             
             logger.info(f"⚙️ Lancement de la génération...")
             success = generator.generate_report()
@@ -96,14 +147,15 @@ class SmartReportGenerator:
             duration = time.time() - start_time
             
             if success:
-                # Vérification que le fichier a bien été créé
-                if os.path.exists(output_path):
-                    file_size = os.path.getsize(output_path)
-                    logger.info(f"✅ Rapport {report_type} généré avec succès: {output_path} ({file_size} bytes)")
-                    log_generation_success(symbol, report_type, output_path, file_size, duration, user_id)
+                # Vérification que le PDF a bien été écrit
+                if generator.output_size and (not is_file_target(output_path) or os.path.exists(output_path)):
+                    file_size = generator.output_size
+                    logger.info(f"✅ Rapport {report_type} généré avec succès: {describe(output_path)} ({file_size} bytes)")
+                    log_generation_success(symbol, report_type, describe(output_path), file_size, duration, user_id)
+                    SmartReportGenerator.export_data(generator, report_type, output_path)
                 else:
                     error_msg = "Le fichier PDF n'a pas été créé"
-                    logger.error(f"❌ {error_msg}: {output_path}")
+                    logger.error(f"❌ {error_msg}: {describe(output_path)}")
                     log_generation_error(symbol, report_type, error_msg, duration, user_id)
                     return False
             else:
@@ -128,6 +180,69 @@ class SmartReportGenerator:
             log_generation_error(symbol, report_type, error_msg, time.time() - start_time, user_id)
             return False
     
+    @staticmethod
+    def export_data(generator, report_type: str, output_path) -> dict:
+        """
+        Exporte les données du rapport dans les formats demandés, à côté du PDF
+        
+        Returns:
+            dict: Chemins écrits par format (vide si aucun export demandé)
+        """
+        formats = generator.config.data_exports
+        if not formats:
+            return {}
+        if not is_file_target(output_path):
+            logger.warning(f"⚠️ Exports {formats} ignorés: sortie PDF sans chemin de fichier")
+            return {}
+        
+        dataset = ReportDataset.from_generator(generator, report_type, generator.config.include_raw_data)
+        return export_dataset(dataset, export_paths(output_path, formats))
+    
+    @staticmethod
+    def compute_metrics(symbol: str, benchmark: str = '^GSPC'):
+        """
+        Métriques d'un symbole sans rapport PDF (ni graphiques ni mise en page)
+        
+        Rendements, volatilité, perte maximale, bêta/corrélation face au benchmark et ratios de
+        valorisation, calculés sur le cache quotidien des données de marché : seul le premier
+        appel de la journée télécharge les données.
+        
+        Returns:
+            dict: Même structure que l'export JSON d'un rapport (sans tableaux), None en cas d'échec
+        """
+        symbol = symbol.upper()
+        try:
+            info = market_data.info(symbol)
+            history = market_data.history(symbol, "2y")
+            if history.empty:
+                logger.error(f"❌ Aucun historique pour {symbol}")
+                return None
+            
+            metrics = {**price_metrics(history), **valuation_metrics(info)}
+            if benchmark:
+                metrics.update(relative_metrics(history, market_data.history(benchmark, "2y")))
+            
+            payload = ReportDataset(symbol, 'METRICS', info, metrics, {}).summary()
+            payload['benchmark'] = benchmark
+            return payload
+        except Exception as e:
+            logger.error(f"❌ Erreur calcul des métriques {symbol}: {e}")
+            return None
+    
+    @staticmethod
+    def render_report(symbol: str, report_type: str, user_id: str = None,
+                      config: ReportConfig = None):
+        """
+        Génère un rapport en mémoire, sans fichier intermédiaire
+        
+        Returns:
+            bytes: Contenu du PDF, None en cas d'échec
+        """
+        buffer = io.BytesIO()
+        if SmartReportGenerator.generate_report(symbol, report_type, buffer, user_id, config):
+            return buffer.getvalue()
+        return None
+    
     @staticmethod
     def get_available_types():
         """Retourne la liste des types de rapports disponibles"""
@@ -147,24 +262,82 @@ class SmartReportGenerator:
 
 def main():
     """Point d'entrée principal pour l'exécution en ligne de commande"""
-    if len(sys.argv) < 4 or len(sys.argv) > 5:
-        print("Usage: python smart_report_generator.py <SYMBOL> <TYPE> <OUTPUT_PATH> [USER_ID]")
+    args = sys.argv[1:]
+    
+    # Mesure des imports à froid : --import-time [--budget SECONDES]
+    if '--import-time' in args:
+        budget = IMPORT_BUDGET_SECONDS
+        if '--budget' in args:
+            budget = float(args[args.index('--budget') + 1])
+        
+        failed = False
+        for report_type, (router, generator, loaded) in SmartReportGenerator.measure_import_times().items():
+            total = router + generator
+            status = "✅" if total <= budget and not loaded else "❌"
+            failed |= total > budget or bool(loaded)
+            eager = f" (importé trop tôt: {', '.join(loaded)})" if loaded else ""
+            print(f"{status} {report_type:<14} routeur {router:.2f} s + générateur {generator:.2f} s = {total:.2f} s{eager}")
+        print(f"Budget: {budget:.2f} s par rapport, sans {', '.join(LAZY_MODULES)}")
+        sys.exit(1 if failed else 0)
+    
+    # Métriques seules en JSON sur la sortie standard : <SYMBOL> --metrics [--benchmark SYMBOLE]
+    if '--metrics' in args:
+        args.remove('--metrics')
+        benchmark = '^GSPC'
+        if '--benchmark' in args:
+            index = args.index('--benchmark')
+            benchmark = args[index + 1] if index + 1 < len(args) else None
+            del args[index:index + 2]
+        if len(args) != 1:
+            print("Usage: python smart_report_generator.py <SYMBOL> --metrics [--benchmark SYMBOLE]", file=sys.stderr)
+            sys.exit(1)
+        
+        payload = SmartReportGenerator.compute_metrics(args[0], benchmark)
+        if payload is None:
+            print("❌ Échec du calcul des métriques", file=sys.stderr)
+            sys.exit(1)
+        json.dump(payload, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        sys.exit(0)
+    
+    # Configuration optionnelle : --config '<json>' ou --config fichier.json
+    config = None
+    if '--config' in args:
+        index = args.index('--config')
+        if index + 1 >= len(args):
+            print("❌ --config attend un JSON ou un chemin de fichier")
+            sys.exit(1)
+        try:
+            config = ReportConfig.from_argument(args[index + 1])
+        except (ValueError, OSError) as e:
+            print(f"❌ Configuration invalide: {e}")
+            sys.exit(1)
+        del args[index:index + 2]
+    
+    if len(args) < 3 or len(args) > 4:
+        print("Usage: python smart_report_generator.py <SYMBOL> <TYPE> <OUTPUT_PATH|-> [USER_ID] [--config JSON|FICHIER]")
+        print("OUTPUT_PATH '-' écrit le PDF sur la sortie standard")
+        print("       python smart_report_generator.py <SYMBOL> --metrics [--benchmark SYMBOLE]")
+        print("       python smart_report_generator.py --import-time [--budget SECONDES]")
         print(f"Types disponibles: {SmartReportGenerator.get_available_types()}")
         sys.exit(1)
     
-    symbol = sys.argv[1]
-    report_type = sys.argv[2].upper()
-    output_path = sys.argv[3]
-    user_id = sys.argv[4] if len(sys.argv) > 4 else None
+    symbol = args[0]
+    report_type = args[1].upper()
+    output_path = args[2]
+    user_id = args[3] if len(args) > 3 else None
+    
+    # Le PDF occupe la sortie standard : les messages passent sur la sortie d'erreur
+    messages = sys.stderr if output_path == STDOUT else sys.stdout
     
     # Génération du rapport
-    success = SmartReportGenerator.generate_report(symbol, report_type, output_path, user_id)
+    success = SmartReportGenerator.generate_report(symbol, report_type, output_path, user_id, config)
     
     if success:
-        print(f"✅ Rapport généré avec succès: {output_path}")
+        print(f"✅ Rapport généré avec succès: {describe(output_path)}", file=messages)
         sys.exit(0)
     else:
-        print(f"❌ Échec de la génération du rapport")
+        print(f"❌ Échec de la génération du rapport", file=messages)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du sous-échantillonnage LTTB : extrémités, extrema et budget de points conservés
+"""
+
+import numpy as np
+
+from downsampling import lttb_indices
+
+N_POINTS = 5_000
+THRESHOLD = 300
+
+
+def random_walk(seed: int = 0) -> np.ndarray:
+    return np.cumsum(np.random.default_rng(seed).normal(0, 1, N_POINTS)) + 100
+
+
+def test_keeps_budget_and_order():
+    indices = lttb_indices(random_walk(), THRESHOLD)
+    assert len(indices) == THRESHOLD
+    assert (np.diff(indices) > 0).all()
+
+
+def test_keeps_endpoints():
+    for seed in range(5):
+        indices = lttb_indices(random_walk(seed), THRESHOLD)
+        assert indices[0] == 0 and indices[-1] == N_POINTS - 1
+
+
+def test_keeps_global_extrema():
+    for seed in range(5):
+        y = random_walk(seed)
+        indices = set(lttb_indices(y, THRESHOLD))
+        assert int(np.argmax(y)) in indices
+        assert int(np.argmin(y)) in indices
+
+
+def test_keeps_isolated_spike():
+    y = np.zeros(N_POINTS)
+    y[1234] = 50.0
+    assert 1234 in lttb_indices(y, THRESHOLD)
+
+
+def test_keeps_both_extrema_in_one_bucket():
+    y = np.zeros(N_POINTS)
+    y[2000], y[2001] = 50.0, -50.0
+    indices = lttb_indices(y, THRESHOLD)
+    assert {2000, 2001} <= set(indices)
+    assert len(indices) == THRESHOLD + 1 and (np.diff(indices) > 0).all()
+
+
+def test_short_series_unchanged():
+    assert list(lttb_indices(np.arange(10.0), 50)) == list(range(10))
+    assert list(lttb_indices(np.arange(10.0), 2)) == list(range(10))
+
+
+def test_uses_irregular_abscissae():
+    x = np.cumsum(np.random.default_rng(0).uniform(0.1, 5.0, N_POINTS))
+    indices = lttb_indices(random_walk(), THRESHOLD, x=x)
+    assert len(indices) == THRESHOLD and indices[0] == 0 and indices[-1] == N_POINTS - 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de l'optimiseur de portefeuille : poids long-only pleinement investis
+"""
+
+import numpy as np
+
+from portfolio_optimizer import (mean_variance_weights, min_variance_weights, project_simplex,
+                                 risk_contributions, risk_parity_weights)
+
+
+def random_covariance(n_assets: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, (500, n_assets)) @ rng.normal(0, 1, (n_assets, n_assets))
+    return np.cov(returns, rowvar=False)
+
+
+def assert_on_simplex(weights: np.ndarray):
+    assert np.isclose(weights.sum(), 1.0)
+    assert (weights >= 0).all()
+
+
+def test_project_simplex_on_random_vectors():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        assert_on_simplex(project_simplex(rng.normal(0, 3, rng.integers(2, 30))))
+
+
+def test_project_simplex_keeps_points_of_the_simplex():
+    point = np.array([0.2, 0.5, 0.3])
+    assert np.allclose(project_simplex(point), point)
+    # Translation uniforme : même projection
+    assert np.allclose(project_simplex(point + 5), point)
+
+
+def test_min_variance_weights_on_simplex():
+    for seed in range(5):
+        assert_on_simplex(min_variance_weights(random_covariance(12, seed)))
+
+
+def test_min_variance_matches_closed_form_when_interior():
+    cov = np.diag([0.04, 0.01, 0.02])
+    expected = (1 / np.diag(cov)) / (1 / np.diag(cov)).sum()
+    assert np.allclose(min_variance_weights(cov), expected, atol=1e-6)
+
+
+def test_min_variance_beats_equal_weights():
+    cov = random_covariance(12)
+    weights = min_variance_weights(cov)
+    equal = np.full(12, 1 / 12)
+    assert weights @ cov @ weights <= equal @ cov @ equal
+
+
+def test_mean_variance_weights_on_simplex():
+    cov = random_covariance(8)
+    mean = np.linspace(-0.05, 0.15, 8)
+    weights = mean_variance_weights(mean, cov, risk_aversion=5.0)
+    assert_on_simplex(weights)
+    # Aversion au risque quasi nulle : tout sur le meilleur rendement
+    assert np.argmax(mean_variance_weights(mean, cov, risk_aversion=1e-6)) == 7
+
+
+def test_risk_parity_equalizes_contributions():
+    cov = random_covariance(6)
+    weights = risk_parity_weights(cov)
+    assert_on_simplex(weights)
+    contributions = risk_contributions(weights, cov)
+    assert np.allclose(contributions['percent'], 1 / 6, atol=1e-4)
+    assert np.isclose(contributions['contribution'].sum(), contributions['volatility'])
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
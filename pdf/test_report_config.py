@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la configuration de rapport : graphiques validés strictement, formats d'export tolérants
+"""
+
+from report_config import CHART_TYPES, ReportConfig
+
+
+def raises_value_error(values: dict) -> bool:
+    try:
+        ReportConfig.from_dict(values)
+    except ValueError:
+        return True
+    return False
+
+
+def test_defaults_include_everything():
+    config = ReportConfig.from_dict({})
+    assert config.all_charts
+    assert config.export_formats == ['PDF']
+    assert config.wants_section('riskMetrics') and not config.wants_section('sentimentAnalysis')
+
+
+def test_unknown_chart_rejected():
+    assert raises_value_error({'selectedCharts': ['PRICE_EVOLUTION', 'PIE_CHART']})
+
+
+def test_selected_charts_case_insensitive():
+    config = ReportConfig.from_dict({'selectedCharts': ['candlestick']})
+    assert config.wants_chart('CANDLESTICK') and not config.wants_chart('PRICE_EVOLUTION')
+
+
+def test_unknown_export_formats_dropped():
+    config = ReportConfig.from_dict({'exportFormats': ['csv', 'DOCX', 'xlsx', 'PDF', '']})
+    assert config.export_formats == ['PDF', 'CSV', 'EXCEL']
+    assert config.data_exports == ['CSV', 'EXCEL']
+
+
+def test_api_export_adds_json():
+    config = ReportConfig.from_dict({'exportFormats': ['PDF'], 'includeApiExport': True})
+    assert config.data_exports == ['JSON']
+
+
+def test_round_trip():
+    values = {'selectedCharts': list(CHART_TYPES[:3]), 'riskMetrics': False, 'exportFormats': ['JSON'],
+              'includeRawData': True}
+    config = ReportConfig.from_dict(values)
+    assert ReportConfig.from_dict(config.to_dict()).to_dict() == config.to_dict()
+    assert not config.wants_section('riskMetrics') and config.include_raw_data
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des destinations de rapport : écriture atomique, aucun fichier partiel en cas d'erreur
+"""
+
+import io
+import os
+import stat
+import tempfile
+
+from report_output import FILE_MODE, open_output
+
+
+class WriteFailure(Exception):
+    pass
+
+
+def test_writes_file_and_counts_bytes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'reports', 'report.pdf')
+        with open_output(path) as output:
+            output.write(b'%PDF-1.4 contenu')
+        assert output.size == 16
+        with open(path, 'rb') as f:
+            assert f.read() == b'%PDF-1.4 contenu'
+        assert stat.S_IMODE(os.stat(path).st_mode) == FILE_MODE
+        assert os.listdir(os.path.dirname(path)) == ['report.pdf']
+
+
+def test_error_leaves_no_partial_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.pdf')
+        try:
+            with open_output(path) as output:
+                output.write(b'%PDF-1.4 debut')
+                raise WriteFailure()
+        except WriteFailure:
+            pass
+        assert os.listdir(directory) == []
+
+
+def test_error_keeps_previous_report():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.pdf')
+        with open_output(path) as output:
+            output.write(b'ancien')
+        try:
+            with open_output(path) as output:
+                output.write(b'nouveau incomplet')
+                raise WriteFailure()
+        except WriteFailure:
+            pass
+        with open(path, 'rb') as f:
+            assert f.read() == b'ancien'
+        assert os.listdir(directory) == ['report.pdf']
+
+
+def test_writes_to_open_stream():
+    buffer = io.BytesIO()
+    with open_output(buffer) as output:
+        output.write(b'abc')
+    assert buffer.getvalue() == b'abc' and output.size == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests du moteur de risque : VaR et ES sur une loi normale connue
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from risk_engine import RiskEngine, build_returns_frame
+
+SIGMA = 0.01
+N_OBS = 200_000
+
+
+def normal_returns(seed: int = 0, n_obs: int = N_OBS) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'NORMAL': rng.normal(0, SIGMA, n_obs)})
+
+
+def normal_var_es(confidence: float, sigma: float = SIGMA):
+    """VaR et ES exactes (pertes positives) d'une loi normale centrée"""
+    normal = NormalDist()
+    z = normal.inv_cdf(confidence)
+    return sigma * z, sigma * normal.pdf(z) / (1 - confidence)
+
+
+def test_historical_matches_normal():
+    engine = RiskEngine(normal_returns())
+    for confidence in (0.95, 0.99):
+        var, es = engine.historical(confidence)
+        expected_var, expected_es = normal_var_es(confidence)
+        assert np.isclose(var[0], expected_var, rtol=0.02)
+        assert np.isclose(es[0], expected_es, rtol=0.02)
+        assert es[0] > var[0]
+
+
+def test_cornish_fisher_reduces_to_normal():
+    engine = RiskEngine(normal_returns())
+    for confidence in (0.95, 0.99):
+        var, es = engine.cornish_fisher(confidence)
+        expected_var, expected_es = normal_var_es(confidence)
+        assert np.isclose(var[0], expected_var, rtol=0.02)
+        assert np.isclose(es[0], expected_es, rtol=0.02)
+
+
+def test_cornish_fisher_scales_with_square_root_of_horizon():
+    engine = RiskEngine(normal_returns())
+    var_1, _ = engine.cornish_fisher(0.99, 1)
+    var_10, _ = engine.cornish_fisher(0.99, 10)
+    assert np.isclose(var_10[0], var_1[0] * np.sqrt(10), rtol=0.03)
+
+
+def test_fhs_matches_normal_under_constant_volatility():
+    engine = RiskEngine(normal_returns(n_obs=20_000))
+    var, es = engine.filtered_historical(0.99)
+    expected_var, expected_es = normal_var_es(0.99)
+    assert np.isclose(var[0], expected_var, rtol=0.1)
+    # Résidus divisés par une volatilité estimée : queue un peu plus épaisse que la normale
+    assert expected_es < es[0] < 1.2 * expected_es
+
+    # À 10 jours : proche de la loi normale à 10 jours, un peu au-dessus (chaque choc simulé
+    # met à jour la variance EWMA des jours suivants)
+    var_10, _ = engine.filtered_historical(0.99, 10, n_paths=20_000)
+    normal_10 = -np.expm1(-expected_var * np.sqrt(10))
+    assert 0.95 * normal_10 < var_10[0] < 1.25 * normal_10
+
+
+def test_fhs_follows_current_volatility():
+    rng = np.random.default_rng(1)
+    calm = rng.normal(0, SIGMA, 5_000)
+    stressed = np.concatenate([calm, rng.normal(0, 3 * SIGMA, 100)])
+    var_calm, _ = RiskEngine(pd.DataFrame({'A': calm})).filtered_historical(0.99)
+    var_stressed, _ = RiskEngine(pd.DataFrame({'A': stressed})).filtered_historical(0.99)
+    hist_stressed, _ = RiskEngine(pd.DataFrame({'A': stressed})).historical(0.99)
+    # La VaR filtrée suit le régime courant, la VaR historique reste dominée par le passé calme
+    assert var_stressed[0] > 2 * var_calm[0]
+    assert var_stressed[0] > 1.5 * hist_stressed[0]
+
+
+def test_bootstrap_interval_contains_true_var():
+    engine = RiskEngine(normal_returns(n_obs=5_000), confidence_levels=(0.95,))
+    interval = engine.bootstrap_confidence_intervals(n_bootstrap=200)[0.95].loc['NORMAL']
+    assert interval['lower'] < normal_var_es(0.95)[0] < interval['upper']
+
+
+def test_summary_covers_every_combination():
+    summary = RiskEngine(normal_returns(n_obs=2_000)).summary()
+    assert len(summary) == 3 * 2 * 3
+    assert (summary['es'] >= summary['var']).all()
+
+
+def test_build_returns_frame_aligns_series():
+    dates = pd.date_range('2025-01-01', periods=4)
+    frame = build_returns_frame({'A': pd.Series([100.0, 110.0, 99.0, 99.0], index=dates),
+                                 'B': pd.Series([50.0, 55.0], index=dates[:2])})
+    assert list(frame.index) == list(dates[1:])
+    assert np.allclose(frame['A'], [0.1, -0.1, 0.0])
+    assert np.isclose(frame['B'].iloc[0], 0.1) and frame['B'].iloc[1:].isna().all()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests des statistiques roulantes : mêmes valeurs que pandas rolling, NaN compris
+"""
+
+import numpy as np
+import pandas as pd
+
+from rolling_stats import (TRADING_DAYS, rolling_mean_var, rolling_regression, rolling_volatility,
+                           trailing_volatility)
+
+WINDOWS = (5, 21, 63)
+
+
+def make_returns(seed: int = 0, n_obs: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0005, 0.01, n_obs)
+    frame = pd.DataFrame({
+        'ASSET': 1.3 * market + rng.normal(0, 0.005, n_obs),
+        'MARKET': market,
+        'OTHER': rng.normal(0, 0.02, n_obs)
+    }, index=pd.date_range('2024-01-01', periods=n_obs, freq='B'))
+    # Prix élevés : le recentrage doit éviter l'annulation de E[x²] - E[x]²
+    frame['LEVEL'] = 1e4 + frame['ASSET'].cumsum()
+    return frame
+
+
+def test_mean_var_match_pandas():
+    values = make_returns()['LEVEL']
+    values.iloc[[40, 41, 150]] = np.nan
+    means, variances = rolling_mean_var(values.values, WINDOWS)
+    for i, window in enumerate(WINDOWS):
+        rolling = values.rolling(window)
+        assert np.allclose(means[i], rolling.mean(), equal_nan=True)
+        assert np.allclose(variances[i], rolling.var(), rtol=1e-6, atol=1e-12, equal_nan=True)
+
+
+def test_windows_longer_than_series_are_nan():
+    means, variances = rolling_mean_var(np.arange(10.0), (3, 20))
+    assert np.isnan(means[1]).all() and np.isnan(variances[1]).all()
+    assert not np.isnan(variances[0, 2:]).any()
+
+
+def test_rolling_volatility_matches_pandas():
+    returns = make_returns()['ASSET']
+    vol = rolling_volatility(returns, WINDOWS)
+    for window in WINDOWS:
+        expected = returns.rolling(window).std() * np.sqrt(TRADING_DAYS)
+        assert np.allclose(vol[window], expected, equal_nan=True)
+
+
+def test_trailing_volatility_matches_tail_std():
+    returns = make_returns()['ASSET']
+    trailing = trailing_volatility(returns, (21, 252, 1000))
+    for window in (21, 252):
+        assert np.isclose(trailing[window], returns.tail(window).std() * np.sqrt(TRADING_DAYS))
+    assert np.isnan(trailing[1000])
+
+
+def test_rolling_regression_matches_pandas():
+    frame = make_returns()
+    frame.loc[frame.index[100], 'MARKET'] = np.nan
+    benchmarks = frame[['MARKET', 'OTHER']]
+    results = rolling_regression(frame['ASSET'], benchmarks, WINDOWS)
+
+    for window in WINDOWS:
+        for benchmark in benchmarks:
+            x, y = benchmarks[benchmark], frame['ASSET']
+            expected_beta = y.rolling(window).cov(x) / x.rolling(window).var()
+            expected_corr = y.rolling(window).corr(x)
+            assert np.allclose(results[window]['beta'][benchmark], expected_beta, equal_nan=True)
+            assert np.allclose(results[window]['correlation'][benchmark], expected_corr, equal_nan=True)
+
+            expected_alpha = (y.rolling(window).mean() - expected_beta * x.rolling(window).mean()) * TRADING_DAYS
+            assert np.allclose(results[window]['alpha'][benchmark], expected_alpha, equal_nan=True)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Intégration vectorielle des graphiques FinAnalytics
+Les graphiques matplotlib rendus en PDF sont insérés tels quels comme form XObjects
+(pas de rastérisation à 300 dpi ni de décodage PNG par reportlab)
+"""
+
+from reportlab.platypus import Flowable
+
+try:
+    from pdfrw import PdfReader
+    from pdfrw.buildxobj import pagexobj
+    from pdfrw.toreportlab import makerl
+    VECTOR_AVAILABLE = True
+except ImportError:
+    VECTOR_AVAILABLE = False
+
+
+def load_form(source, forms=None):
+    """
+    Form XObject de la première page d'un PDF (octets ou chemin)
+
+    forms: formulaires déjà chargés du document ; un graphique identique y renvoie le même
+    objet, que pdfrw n'écrit alors qu'une fois. Propre au document : rien ne survit au rapport.
+    """
+    if forms is not None and source in forms:
+        return forms[source]
+    reader = PdfReader(fdata=source) if isinstance(source, bytes) else PdfReader(source)
+    xobj = pagexobj(reader.pages[0])
+    if forms is not None:
+        forms[source] = xobj
+    return xobj
+
+
+class VectorChart(Flowable):
+    """Flowable affichant la première page d'un PDF de graphique (chemin ou octets), mise à l'échelle dans la boîte"""
+
+    def __init__(self, source, width, height, forms=None):
+        super().__init__()
+        self.xobj = load_form(source, forms)
+
+        x0, y0, x1, y1 = (float(v) for v in self.xobj.BBox)
+        self.chart_width = x1 - x0
+        self.chart_height = y1 - y0
+
+        # Proportions conservées (un tracé vectoriel étiré déformerait le texte)
+        self.scale = min(width / self.chart_width, height / self.chart_height)
+        self.width = self.chart_width * self.scale
+        self.height = self.chart_height * self.scale
+        self.hAlign = 'CENTER'
+
+    def wrap(self, available_width, available_height):
+        return self.width, self.height
+
+    def draw(self):
+        name = makerl(self.canv, self.xobj)
+        self.canv.saveState()
+        self.canv.scale(self.scale, self.scale)
+        self.canv.doForm(name)
+        self.canv.restoreState()
@@ -0,0 +1,104 @@
+// ===================================================================
+// 🐍 WORKER PYTHON - Client du service de génération (pdf/report_worker.py)
+// ===================================================================
+
+import net from "net";
+
+// Socket Unix du worker (même variable que côté Python)
+export const REPORT_WORKER_SOCKET =
+  process.env.FINANALYTICS_WORKER_SOCKET || "/tmp/finanalytics_report_worker.sock";
+
+// Délai de connexion au worker avant de basculer sur spawn
+export const REPORT_WORKER_CONNECT_TIMEOUT_MS =
+  Number(process.env.FINANALYTICS_WORKER_CONNECT_TIMEOUT_MS) || 5 * 1000;
+
+// Délai maximal d'attente de la réponse une fois la requête envoyée (file d'attente du worker
+// séquentiel comprise) : au-delà, échec du rapport, jamais de seconde génération
+export const REPORT_WORKER_TIMEOUT_MS =
+  Number(process.env.FINANALYTICS_WORKER_TIMEOUT_MS) || 30 * 60 * 1000;
+
+export interface ReportWorkerJob {
+  symbol: string;
+  reportType: string;
+  outputPath: string;
+  userId?: string;
+  config?: Record<string, unknown>;
+}
+
+export interface ReportWorkerResponse {
+  ok: boolean;
+  outputPath?: string;
+  duration?: number;
+  error?: string;
+}
+
+/**
+ * Worker injoignable (socket inexistant, refusé, saturé ou délai de connexion dépassé) :
+ * la requête n'a pas été envoyée, l'appelant bascule sur spawn('python3')
+ */
+export class ReportWorkerUnavailableError extends Error {
+  constructor(cause: string) {
+    super(`Worker de génération indisponible: ${cause}`);
+    this.name = "ReportWorkerUnavailableError";
+  }
+}
+
+/**
+ * Envoie une requête JSON au worker et attend sa réponse (une ligne JSON)
+ */
+function requestWorker<T>(request: Record<string, unknown>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    const socket = net.createConnection(REPORT_WORKER_SOCKET);
+    let connected = false;
+    let buffer = "";
+
+    socket.setEncoding("utf8");
+    socket.setTimeout(REPORT_WORKER_CONNECT_TIMEOUT_MS);
+
+    socket.on("connect", () => {
+      connected = true;
+      socket.setTimeout(REPORT_WORKER_TIMEOUT_MS);
+      socket.write(JSON.stringify(request) + "\n");
+    });
+
+    socket.on("timeout", () => {
+      socket.destroy(connected
+        ? new Error(`Aucune réponse du worker après ${REPORT_WORKER_TIMEOUT_MS} ms`)
+        : new ReportWorkerUnavailableError(`connexion impossible en ${REPORT_WORKER_CONNECT_TIMEOUT_MS} ms`));
+    });
+
+    socket.on("data", (chunk: string) => {
+      buffer += chunk;
+    });
+
+    socket.on("end", () => {
+      if (!buffer) {
+        reject(new Error("Connexion au worker fermée sans réponse"));
+        return;
+      }
+      try {
+        resolve(JSON.parse(buffer) as T);
+      } catch {
+        reject(new Error(`Réponse invalide du worker: ${buffer.slice(0, 200)}`));
+      }
+    });
+
+    socket.on("error", (error: NodeJS.ErrnoException) => {
+      // Avant la connexion (ENOENT, ECONNREFUSED, EAGAIN) : requête jamais reçue, spawn possible.
+      // Après : le worker a peut-être commencé le rapport, une seconde génération courrait sur le
+      // même fichier et le même statut
+      if (error instanceof ReportWorkerUnavailableError || connected) {
+        reject(error);
+      } else {
+        reject(new ReportWorkerUnavailableError(error.code || error.message));
+      }
+    });
+  });
+}
+
+/**
+ * Génère un rapport via le worker chaud (modules et caches déjà chargés)
+ */
+export function generateWithWorker(job: ReportWorkerJob): Promise<ReportWorkerResponse> {
+  return requestWorker<ReportWorkerResponse>({ action: "generate", ...job });
+}